@@ -0,0 +1,256 @@
+# Click Analytics
+# This module counts clicks on short links without slowing the redirects down!
+
+# Step 1: Import the Tools We Need
+# What is this? A fast queue, a background thread and the SQLite database
+# Think of it like: "Drop a note in a box at the door; someone sorts the box every second"
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, deque
+from urllib.parse import urlsplit
+# Explanation:
+# - deque = A list that's fast to add to and take from at both ends
+# - threading = The background thread that empties the buffer
+# - Counter = Adds up the clicks of one batch before writing them
+# - urlsplit = Gets the website name out of a referrer URL
+# - atexit = Writes the last clicks when the app stops
+
+BUFFER_SIZE = 65536
+FLUSH_INTERVAL = 1.0
+BUCKET_SECONDS = 3600
+# Explanation:
+# - BUFFER_SIZE = The most clicks waiting to be written (the ring buffer)
+# - FLUSH_INTERVAL = How often (in seconds) the buffer is written to SQLite
+# - BUCKET_SECONDS = Clicks are counted per hour
+
+# How it works:
+#   clicks = ClickAnalytics('urls.sqlite3')
+#   clicks.record('1IVE1D', referrer)     # in the redirect: just an append
+#   clicks.stats('1IVE1D')               # {'clicks': 42, 'hourly': [...], ...}
+#
+# Why? Writing every click to SQLite inside the redirect would make every
+# redirect wait for the disk. Instead a redirect only adds a tuple to an
+# in-memory buffer. Once a second a background thread takes everything out,
+# adds it up per code, hour and referrer, and writes it in ONE transaction.
+
+
+# Step 2: Create the Analytics Recorder
+# What is this? The ring buffer, the background thread and the rollup tables
+class ClickAnalytics:
+    """
+    Buffered click counts per short code, hour and referrer
+
+    Args:
+    - path: Location of the SQLite database file
+    - buffer_size: Maximum number of clicks waiting to be written
+    - flush_interval: Seconds between writes
+    """
+
+    def __init__(self, path, buffer_size=BUFFER_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.flush_errors = 0
+        self._buffer = deque(maxlen=buffer_size)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        # Explanation:
+        # - _buffer = The ring buffer: when it's full, the oldest click is dropped
+        #   (so a stuck database can never use up all the memory)
+        # - dropped = How many clicks were dropped that way
+        # - flush_errors = How many background writes failed
+        # - _lock = Only one thread writes a batch at a time
+        # - _wake = Lets stop() wake the thread up early
+
+        conn = self._connect()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS clicks_hourly ('
+            'code TEXT NOT NULL, hour INTEGER NOT NULL, clicks INTEGER NOT NULL, '
+            'PRIMARY KEY (code, hour)) WITHOUT ROWID'
+        )
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS clicks_referrers ('
+            'code TEXT NOT NULL, referrer TEXT NOT NULL, clicks INTEGER NOT NULL, '
+            'PRIMARY KEY (code, referrer)) WITHOUT ROWID'
+        )
+        # Explanation:
+        # - clicks_hourly = One row per code per hour: the rollup
+        # - clicks_referrers = One row per code per referring website
+        # - PRIMARY KEY (code, ...) = All rows of a code are stored together,
+        #   so /api/stats/<code> reads them with one index range scan
+        # - Total clicks = The sum of a code's hourly rows
+
+        atexit.register(self.stop)
+        os.register_at_fork(after_in_child=self._after_fork)
+        # Explanation:
+        # - stop() writes what's left in the buffer when Python exits
+        # - After a fork (gunicorn workers), the child starts its own thread
+
+    def _connect(self):
+        """Return this thread's connection, reconnecting after a fork"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _after_fork(self):
+        self._thread = None
+        self._lock = threading.Lock()
+        self._buffer.clear()
+        # Explanation:
+        # - The parent's thread doesn't exist in the child
+        # - The parent's clicks are the parent's job to write
+
+    # Step 3: Record a Click (the Hot Path)
+    def record(self, code, referrer=None):
+        """Add one click to the buffer (called for every redirect)"""
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        self._buffer.append((code, referrer, time.time()))
+        if self._thread is None:
+            self._start()
+        # Explanation:
+        # - deque.append() = Thread-safe, and fast: no lock, no database
+        # - The background thread starts on the first click
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='click-analytics',
+                                                daemon=True)
+                self._thread.start()
+        # Explanation:
+        # - daemon=True = Doesn't keep Python running when the app stops
+
+    def _run(self):
+        while not self._wake.wait(self.flush_interval):
+            try:
+                self.flush()
+            except sqlite3.Error:
+                self.flush_errors += 1
+        # Explanation:
+        # - wait(1.0) = Sleep 1 second (or until stop() wakes us up)
+        # - A failed write (database locked?) is counted in flush_errors,
+        #   and its clicks are tried again next time
+
+    # Step 4: Write a Batch (the Background Thread)
+    def flush(self):
+        """Move every buffered click into the rollup tables, return how many"""
+        with self._lock:
+            batch = []
+            while self._buffer:
+                batch.append(self._buffer.popleft())
+            if not batch:
+                return 0
+            # Explanation:
+            # - popleft() = Takes the oldest click out (thread-safe)
+            # - Redirects keep appending while we take clicks out
+
+            hourly = Counter()
+            referrers = Counter()
+            for code, referrer, clicked in batch:
+                hourly[code, int(clicked // BUCKET_SECONDS) * BUCKET_SECONDS] += 1
+                referrers[code, referrer_host(referrer)] += 1
+            # Explanation:
+            # - 1,000 clicks on one link in one hour → ONE row update, not 1,000
+            # - clicked // 3600 * 3600 = The start of the hour (Unix time)
+
+            conn = self._connect()
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                conn.executemany(
+                    'INSERT INTO clicks_hourly (code, hour, clicks) VALUES (?, ?, ?) '
+                    'ON CONFLICT (code, hour) DO UPDATE SET clicks = clicks + excluded.clicks',
+                    [(code, hour, clicks) for (code, hour), clicks in hourly.items()]
+                )
+                conn.executemany(
+                    'INSERT INTO clicks_referrers (code, referrer, clicks) VALUES (?, ?, ?) '
+                    'ON CONFLICT (code, referrer) DO UPDATE SET clicks = clicks + excluded.clicks',
+                    [(code, host, clicks) for (code, host), clicks in referrers.items()]
+                )
+                conn.execute('COMMIT')
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute('ROLLBACK')
+                self._requeue(batch)
+                raise
+            return len(batch)
+            # Explanation:
+            # - ON CONFLICT ... DO UPDATE = Add to the row if it exists ("upsert")
+            # - executemany() = Many rows with one statement
+            # - BEGIN ... COMMIT = The whole batch is ONE transaction (one disk sync)
+            # - Failed? Put the clicks back in front of the buffer for next time
+
+    def _requeue(self, batch):
+        """Put a failed batch back in front of the buffer, as far as it fits"""
+        buffer = self._buffer
+        for position in range(len(batch) - 1, -1, -1):
+            if len(buffer) == buffer.maxlen:
+                self.dropped += position + 1
+                return
+            buffer.appendleft(batch[position])
+        # Explanation:
+        # - Newest first, so the batch ends up in its old order
+        # - A full deque would push clicks out of the OTHER end - the newest
+        #   ones - without a word, so we stop when it's full
+        # - The oldest clicks that don't fit are counted in dropped, just
+        #   like record() drops the oldest click
+
+    def stop(self):
+        """Stop the background thread and write the last clicks"""
+        self._wake.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=5)
+        self.flush()
+        self._wake.clear()
+        self._thread = None
+
+    # Step 5: Read the Rollups
+    def stats(self, code, hours=48, top_referrers=10):
+        """Return total clicks, clicks per hour and top referrers for a code"""
+        conn = self._connect()
+        total = conn.execute(
+            'SELECT COALESCE(SUM(clicks), 0) FROM clicks_hourly WHERE code = ?', (code,)
+        ).fetchone()[0]
+        since = int(time.time() // BUCKET_SECONDS - hours + 1) * BUCKET_SECONDS
+        hourly = conn.execute(
+            'SELECT hour, clicks FROM clicks_hourly WHERE code = ? AND hour >= ? ORDER BY hour',
+            (code, since)
+        ).fetchall()
+        referrers = conn.execute(
+            'SELECT referrer, clicks FROM clicks_referrers WHERE code = ? '
+            'ORDER BY clicks DESC, referrer LIMIT ?', (code, top_referrers)
+        ).fetchall()
+        return {
+            'clicks': total,
+            'hourly': [{'hour': time.strftime('%Y-%m-%dT%H:00:00Z', time.gmtime(hour)),
+                        'clicks': clicks} for hour, clicks in hourly],
+            'referrers': [{'referrer': host, 'clicks': clicks} for host, clicks in referrers],
+        }
+        # Explanation:
+        # - Only the rollup rows are read, never one row per click
+        # - hourly = The last `hours` hours that had clicks (oldest first)
+        # - Clicks from the last second may still be in the buffer
+
+
+def referrer_host(referrer):
+    """'https://news.example.com/story?id=1' → 'news.example.com'"""
+    if not referrer:
+        return '(direct)'
+    try:
+        host = urlsplit(referrer).hostname
+    except ValueError:
+        host = None
+    return host[:255] if host else '(unknown)'
+    # Explanation:
+    # - We keep only the website name: fewer rows, and no private URLs
+    # - (direct) = No Referer header (typed in, from an app, from email...)
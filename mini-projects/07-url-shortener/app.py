@@ -1,12 +1,17 @@
 # URL Shortener App (Simple)
-# This app shortens long URLs using session storage!
+# This app shortens long URLs and saves them in a shared SQLite store!
 
-# Step 1: Import Flask and string/random modules
-# What is this? We're importing Flask and modules for generating short codes
-# Think of it like: "Get Flask tools and random string generator"
-from flask import Flask, render_template, request, redirect, url_for, session, flash
-import string
-import random
+# Step 1: Import Flask and the URL store
+# What is this? We're importing Flask and our server-side URL store
+# Think of it like: "Get Flask tools and a shared address book"
+from flask import (Flask, render_template, request, redirect, url_for, session, flash, jsonify,
+                   Response, stream_with_context)
+import json
+import os
+from itertools import islice
+from url_store import UrlStore, is_valid_code, normalize_url
+from resolver import RedirectResolver
+from analytics import ClickAnalytics
 # Explanation:
 # - Flask = The main Flask class
 # - render_template = Function to display HTML templates
@@ -15,9 +20,17 @@ import random
 # - url_for = Function to generate URLs
 # - session = Object for storing data between requests
 # - flash = Function to show messages to users
-# - string = Module with string constants (letters, digits)
-# - random = Module for generating random values
-# - We'll use these to create short codes!
+# - os = Module for building file paths
+# - UrlStore = Saves short links in SQLite (see url_store.py)
+# - is_valid_code = Checks a code only uses letters and digits
+# - RedirectResolver = Answers short links before Flask runs (see resolver.py)
+# - ClickAnalytics = Counts clicks in the background (see analytics.py)
+# - jsonify = Function to create JSON responses (for /api/stats)
+# - Response, stream_with_context = Send a response a piece at a time
+#   (for /api/shorten/bulk)
+# - json = Read and write one JSON value per line (NDJSON)
+# - islice = Take the next N items from a (possibly endless) stream
+# - normalize_url = Writes a URL the standard way (see url_store.py)
 
 # Step 2: Create the Flask Application
 # What is this? We're creating our web application
@@ -38,67 +51,73 @@ app.secret_key = 'your-secret-key-change-this-in-production'
 # - In production, use a random, secure key
 # - This is like a password that protects your session data
 
-# Step 4: Initialize URLs Dictionary in Session
-# What is this? Helper function to set up URLs storage
-# Think of it like: "Make sure we have a place to store URLs"
-def init_urls():
-    """
-    Initialize URLs dictionary in session if it doesn't exist
-    This ensures we always have a URLs dictionary to work with
-    """
-    if 'urls' not in session:
-        # Explanation:
-        # - 'urls' not in session = Check if 'urls' key doesn't exist
-        # - session = Dictionary-like object for storing data
-        # - If URLs dictionary doesn't exist, create it
-        
-        session['urls'] = {}
-        # Explanation:
-        # - session['urls'] = Create 'urls' key in session
-        # - {} = Empty dictionary to store URL mappings
-        # - This dictionary will hold: {short_code: long_url}
-        # - Example: {'abc123': 'https://www.example.com/very/long/url'}
+# Step 4: Create the URL Store
+# What is this? Where every short link is saved (on the server, not in a cookie)
+# Think of it like: "One address book the whole website shares"
+app.config['URL_DATABASE'] = None
+app.config['URL_CACHE_SIZE'] = 10000
+app.config['RECENT_LINKS'] = 20
+app.config['HOT_CACHE_SIZE'] = 4096
+app.config['CLICK_FLUSH_INTERVAL'] = 1.0
+app.config['BULK_BATCH_SIZE'] = 500
+app.config['BULK_MAX_URLS'] = 100000
+app.config.from_prefixed_env()
+# Explanation:
+# - 'URL_DATABASE' = Location of the SQLite file
+# - None = Use instance/urls.sqlite3 (Flask's instance folder)
+# - 'URL_CACHE_SIZE' = How many links each worker keeps in memory (LRU)
+# - 'RECENT_LINKS' = How many of your own links the home page lists
+# - 'HOT_CACHE_SIZE' = How many ready-made redirects the resolver keeps
+# - 'CLICK_FLUSH_INTERVAL' = Seconds between writing buffered clicks to SQLite
+# - 'BULK_BATCH_SIZE' = URLs saved per transaction by /api/shorten/bulk
+# - 'BULK_MAX_URLS' = Most URLs one /api/shorten/bulk request may send
+# - from_prefixed_env() = FLASK_URL_DATABASE=... overrides 'URL_DATABASE'
+
+store = UrlStore(app.config['URL_DATABASE'] or os.path.join(app.instance_path, 'urls.sqlite3'),
+                 cache_size=app.config['URL_CACHE_SIZE'])
+# Explanation:
+# - store = Our UrlStore (see url_store.py): SQLite + an LRU in front
+# - Every user sees every link, and links survive a restart
+# - The session cookie stays tiny: it only remembers YOUR recent codes
 
-# Step 5: Generate Short Code Function
-# What is this? Function to create a random short code
-# Think of it like: "Create a random short string to represent the URL"
-def generate_short_code(length=6):
+clicks = ClickAnalytics(store.path, flush_interval=app.config['CLICK_FLUSH_INTERVAL'])
+# Explanation:
+# - clicks = Counts clicks per link, per hour and per referring website
+# - Same SQLite file as the links, in its own tables
+# - A click is only added to an in-memory buffer; a background thread
+#   writes the buffer to SQLite once a second
+
+# Step 5: Answer Short Links Before Flask
+# What is this? The fast path for the route people use most: /<short_code>
+# Think of it like: "A receptionist at the door who knows where everyone sits"
+app.wsgi_app = RedirectResolver(app.wsgi_app, store, hot_size=app.config['HOT_CACHE_SIZE'],
+                                clicks=clicks)
+# Explanation:
+# - app.wsgi_app = The function that handles every request
+# - We wrap it: a known code is redirected right away, from a cache of
+#   hot codes (then the store), without loading the session at all
+# - Each redirect is counted with clicks.record() (just an append)
+# - Everything else still goes to Flask (see redirect_to_url() below)
+# - Run python benchmark.py to see how many redirects per second this gives
+
+# Step 6: Remember Your Recent Links
+# What is this? Helper function to list your links on the home page
+# Think of it like: "A short list of the links you made (not the links themselves)"
+def remember_code(short_code):
     """
-    Generate a random short code for URL shortening
-    
-    Parameters:
-    - length: Length of the short code (default: 6 characters)
-    
-    Returns:
-    - Random string of letters and digits
+    Add a short code to this user's list of recent links
+    Only the newest RECENT_LINKS codes are kept, so the cookie stays small
     """
-    # Step 6: Define Characters to Use
-    # What is this? Characters we'll use to create the short code
-    characters = string.ascii_letters + string.digits
-    # Explanation:
-    # - string.ascii_letters = All letters (a-z, A-Z)
-    # - string.digits = All digits (0-9)
-    # - + = Concatenation (combines them)
-    # - characters = String containing all letters and digits
-    # - Example: "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
-    
-    # Step 7: Generate Random Code
-    # What is this? Creating a random string of specified length
-    short_code = ''.join(random.choice(characters) for _ in range(length))
+    codes = session.get('codes', [])
+    codes = (codes + [short_code])[-app.config['RECENT_LINKS']:]
+    session['codes'] = codes
     # Explanation:
-    # - random.choice(characters) = Picks random character from characters string
-    # - for _ in range(length) = Repeats 'length' times (e.g., 6 times)
-    # - _ = Variable name (we don't use it, just need the loop)
-    # - ''.join() = Joins all characters into one string
-    # - short_code = Random string like "aB3xY9"
-    # - Example: If length=6, might generate "kL9mN2"
-    
-    return short_code
-    # Explanation:
-    # - Returns the generated short code
-    # - This will be used as the key in our URLs dictionary
+    # - session['codes'] = A list like ['1IVE1D', '3rRi3g']
+    # - [-20:] = Keep only the last 20 codes
+    # - Before, the session held EVERY long URL, and the cookie grew past
+    #   4 KB (sent with every request!) after a few dozen links
 
-# Step 8: Create Home Route (GET)
+# Step 7: Create Home Route (GET)
 # What is this? The main page that shows the URL shortener form
 # Think of it like: "When someone visits the home page, show the form"
 @app.route('/', methods=['GET'])
@@ -113,24 +132,24 @@ def index():
     This function runs when someone visits the home page
     It shows the URL shortener form and list of shortened URLs
     """
-    # Step 9: Initialize URLs
-    # What is this? Make sure URLs dictionary exists
-    init_urls()
+    # Step 8: Get Your Recent Codes from Session
+    # What is this? The codes of the links you made (newest first)
+    codes = reversed(session.get('codes', []))
     # Explanation:
-    # - Calls our helper function
-    # - Ensures session['urls'] exists
-    # - If it doesn't exist, creates empty dictionary
+    # - session.get('codes', []) = Your recent codes, or an empty list
+    # - reversed() = Newest link at the top of the table
     
-    # Step 10: Get URLs from Session
-    # What is this? Getting all URL mappings from session storage
-    urls = session.get('urls', {})
+    # Step 9: Look Up Each Long URL in the Store
+    # What is this? Building the {short_code: long_url} dictionary to display
+    urls = {code: store.get(code) for code in codes}
+    urls = {code: long_url for code, long_url in urls.items() if long_url}
     # Explanation:
-    # - session.get('urls', {}) = Get 'urls' from session
-    # - If 'urls' doesn't exist, return empty dictionary {}
+    # - store.get(code) = The long URL (from the LRU, or from SQLite)
     # - urls = Dictionary containing {short_code: long_url}
-    # - Example: {'abc123': 'https://example.com', 'xyz789': 'https://google.com'}
+    # - Example: {'1IVE1D': 'https://example.com', '3rRi3g': 'https://google.com'}
+    # - A code that isn't in the store (a deleted database?) is skipped
     
-    # Step 11: Render Template with URLs
+    # Step 10: Render Template with URLs
     # What is this? Showing the HTML page with URLs
     return render_template('index.html', urls=urls)
     # Explanation:
@@ -141,7 +160,7 @@ def index():
     # - The second urls = The actual URLs dictionary from Python
     # - In the template, we can use urls to display them
 
-# Step 12: Create Shorten Route (POST)
+# Step 11: Create Shorten Route (POST)
 # What is this? Handles form submission to shorten a URL
 # Think of it like: "When user submits form to shorten URL, do this"
 @app.route('/shorten', methods=['POST'])
@@ -156,13 +175,7 @@ def shorten_url():
     This function runs when a URL is submitted to be shortened
     It generates a short code and stores the mapping
     """
-    # Step 13: Initialize URLs
-    # What is this? Make sure URLs dictionary exists
-    init_urls()
-    # Explanation:
-    # - Ensures session['urls'] exists before we use it
-    
-    # Step 14: Get Long URL from Form
+    # Step 12: Get Long URL from Form
     # What is this? Getting the long URL the user entered
     long_url = request.form.get('url', '').strip()
     # Explanation:
@@ -172,7 +185,7 @@ def shorten_url():
     # - long_url = Variable to hold the original URL
     # - Example: User enters "  https://example.com  " → becomes "https://example.com"
     
-    # Step 15: Validate URL
+    # Step 13: Validate URL
     # What is this? Checking if user actually entered a URL
     if not long_url:
         # Explanation:
@@ -193,76 +206,39 @@ def shorten_url():
         # - url_for('index') = Generates URL for 'index' route (home page)
         # - User is sent back to home page to try again
     
-    # Step 16: Add Protocol if Missing
-    # What is this? Making sure URL has http:// or https://
-    # Think of it like: "If URL doesn't start with http, add it"
-    if not long_url.startswith(('http://', 'https://')):
-        # Explanation:
-        # - long_url.startswith() = Checks if URL starts with something
-        # - ('http://', 'https://') = Tuple of prefixes to check
-        # - If URL doesn't start with http:// or https://, add it
-        # - This ensures the URL is valid and clickable
-        
-        long_url = 'http://' + long_url
-        # Explanation:
-        # - Adds 'http://' to the beginning of the URL
-        # - Example: "example.com" → "http://example.com"
-        # - This makes the URL valid and accessible
-    
-    # Step 17: Generate Short Code
-    # What is this? Creating a unique short code for this URL
-    short_code = generate_short_code()
-    # Explanation:
-    # - Calls our generate_short_code() function
-    # - Creates a random 6-character code
-    # - short_code = Random string like "aB3xY9"
-    # - This will be used as the key in our URLs dictionary
-    
-    # Step 18: Check for Duplicates (Simple Check)
-    # What is this? Making sure short code is unique
-    # Think of it like: "If this code already exists, generate a new one"
-    urls = session.get('urls', {})
-    # Explanation:
-    # - Gets current URLs dictionary from session
-    
-    while short_code in urls:
-        # Explanation:
-        # - while = Loop that continues while condition is true
-        # - short_code in urls = Checks if short_code already exists as a key
-        # - If it exists, generate a new one
-        # - This prevents collisions (two URLs with same short code)
-        
-        short_code = generate_short_code()
-        # Explanation:
-        # - Generates a new short code
-        # - Loop continues until we get a unique code
-    
-    # Step 19: Store URL Mapping
-    # What is this? Saving the short code and long URL in session
-    urls[short_code] = long_url
+    # Step 14: Write the URL the Standard Way
+    # What is this? Adding http:// if it's missing, and checking it's a web address
+    # Think of it like: "Writing every address on the envelope the same way"
+    try:
+        long_url = normalize_url(long_url)
+    except ValueError as error:
+        flash(f'Invalid URL: {error}', 'error')
+        return redirect(url_for('index'))
     # Explanation:
-    # - urls = Dictionary from session
-    # - [short_code] = Key (the short code)
-    # - long_url = Value (the original URL)
-    # - This creates the mapping: short_code → long_url
-    # - Example: urls['aB3xY9'] = 'https://example.com'
+    # - normalize_url() = The same check the bulk API uses (see url_store.py)
+    # - Example: "Example.com" → "http://example.com/"
+    # - So a link made here is found again by POST /api/shorten/bulk,
+    #   instead of getting a second code
+    # - 'javascript:...' or a 3,000-character URL raises ValueError,
+    #   and the user sees why
     
-    # Step 20: Save to Session
-    # What is this? Making sure session changes are saved
-    session['urls'] = urls
+    # Step 15: Save the URL and Get Its Short Code
+    # What is this? Storing the URL on the server, shared by everyone
+    short_code = store.add(long_url)
     # Explanation:
-    # - Updates session with modified URLs dictionary
-    # - session['urls'] = The URLs dictionary in session
-    # - urls = Our modified dictionary
-    # - This saves the changes
+    # - store.add() = Saves the URL in SQLite and returns a new short code
+    # - The code comes from a counter (1, 2, 3...) written in base62,
+    #   so it is always unique: no "generate, check, try again" loop
+    # - short_code = A 6-character code like "1IVE1D"
     
-    session.modified = True
+    # Step 16: Remember It for This User
+    # What is this? Adding the code to your list of recent links
+    remember_code(short_code)
     # Explanation:
-    # - Forces Flask to save the session
-    # - Important for persistence
-    # - Ensures changes are saved
+    # - Only the code goes in the session cookie, not the long URL
+    # - Anyone can open the short link, not just you
     
-    # Step 21: Show Success Message
+    # Step 17: Show Success Message
     # What is this? Telling user the URL was shortened successfully
     flash(f'URL shortened successfully! Short code: {short_code}', 'success')
     # Explanation:
@@ -272,7 +248,7 @@ def shorten_url():
     # - 'success' = Message category (for styling)
     # - Example: "URL shortened successfully! Short code: aB3xY9"
     
-    # Step 22: Redirect to Home Page
+    # Step 18: Redirect to Home Page
     # What is this? Sending user back to home page
     return redirect(url_for('index'))
     # Explanation:
@@ -281,7 +257,7 @@ def shorten_url():
     # - After shortening, user is sent back to home page
     # - Home page will now show the new shortened URL
 
-# Step 23: Create Redirect Route
+# Step 19: Create Redirect Route
 # What is this? Handles clicking on short URL and redirects to original
 # Think of it like: "When someone visits /abc123, redirect to the original URL"
 @app.route('/<short_code>')
@@ -296,35 +272,28 @@ def redirect_to_url(short_code):
     """
     This function runs when someone visits a short URL
     It looks up the original URL and redirects to it
+    (Known codes are usually answered by RedirectResolver before Flask
+    runs, so this mostly shows the "not found" message)
     """
-    # Step 24: Initialize URLs
-    # What is this? Make sure URLs dictionary exists
-    init_urls()
-    # Explanation:
-    # - Ensures session['urls'] exists
-    
-    # Step 25: Get URLs from Session
-    # What is this? Getting all URL mappings
-    urls = session.get('urls', {})
+    # Step 20: Look Up Original URL
+    # What is this? Finding the original URL for this short code
+    original_url = store.get(short_code) if is_valid_code(short_code) else None
     # Explanation:
-    # - Gets URLs dictionary from session
-    # - urls = Dictionary containing {short_code: long_url}
+    # - is_valid_code() = Only letters and digits (skips /favicon.ico etc.)
+    # - store.get() = Checks the in-memory LRU first, then SQLite
+    # - Works for EVERY user, not just the one who made the link
+    # - original_url = The long URL, or None if the code doesn't exist
     
-    # Step 26: Look Up Original URL
-    # What is this? Finding the original URL for this short code
-    if short_code in urls:
+    if original_url:
         # Explanation:
-        # - if short_code in urls = Checks if short_code exists as a key
         # - Only proceed if short code exists
         
-        original_url = urls[short_code]
+        clicks.record(short_code, request.referrer)
         # Explanation:
-        # - urls[short_code] = Gets the value (original URL) for this key
-        # - original_url = The long URL that was shortened
-        # - Example: If short_code = 'abc123' and urls['abc123'] = 'https://example.com'
-        # - Then original_url = 'https://example.com'
+        # - Counts the click (added to the buffer, written later)
+        # - request.referrer = The page the link was clicked on (if any)
         
-        # Step 27: Redirect to Original URL
+        # Step 21: Redirect to Original URL
         # What is this? Sending user to the original URL
         return redirect(original_url)
         # Explanation:
@@ -349,6 +318,149 @@ def redirect_to_url(short_code):
         # - Redirects to home page
         # - User sees error message
 
+# Step 22: Create Click Stats API Route
+# What is this? A JSON API with the clicks of one short link
+# Think of it like: "How many people clicked my link, when, and from where?"
+@app.route('/api/stats/<short_code>')
+# Explanation:
+# - Example: /api/stats/1IVE1D?hours=24
+# - hours = How many hours of the hourly counts to return (default 48)
+
+def link_stats(short_code):
+    """
+    This function returns the click statistics of a short link as JSON
+    """
+    # Step 23: Check the Code Exists
+    original_url = store.get(short_code) if is_valid_code(short_code) else None
+    if original_url is None:
+        return jsonify({'error': 'Short code not found'}), 404
+    # Explanation:
+    # - 404 = Not Found (as JSON, because this is an API)
+
+    # Step 24: Read the Rollups
+    hours = max(1, min(request.args.get('hours', 48, type=int), 24 * 31))
+    result = clicks.stats(short_code, hours=hours)
+    result.update(code=short_code, url=original_url)
+    return jsonify(result)
+    # Explanation:
+    # - hours is kept between 1 hour and 31 days
+    # - clicks.stats() reads the hourly and referrer tables (not every click)
+    # - {"code": "1IVE1D", "url": "...", "clicks": 42,
+    #    "hourly": [{"hour": "2026-10-17T09:00:00Z", "clicks": 40}, ...],
+    #    "referrers": [{"referrer": "news.example.com", "clicks": 30}, ...]}
+    # - Clicks from the last second may still be in the buffer
+
+# Step 25: Read the URLs of a Bulk Request
+# What is this? Helper function that accepts a JSON list OR one URL per line
+# Think of it like: "Take the whole stack of forms, or one form at a time"
+def read_bulk_urls():
+    """
+    Return the URLs sent to /api/shorten/bulk, or None if the body is unusable
+    - JSON: ["https://a.com", ...] or {"urls": [...]}
+    - NDJSON: one "https://a.com" or {"url": "https://a.com"} per line
+    """
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        return (read_ndjson_line(line) for line in request.stream if line.strip())
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get('urls')
+    return data if isinstance(data, list) else None
+    # Explanation:
+    # - NDJSON = "Newline-delimited JSON": one JSON value on each line
+    # - request.stream = The body as it arrives: NDJSON lines are read one
+    #   by one, so 50,000 URLs are never all in memory at once
+    # - A JSON list has to be read whole (that's how JSON works)
+
+
+def read_ndjson_line(line):
+    """Return the URL on one NDJSON line (or whatever was there instead)"""
+    try:
+        item = json.loads(line)
+    except ValueError:
+        return None
+    return item.get('url') if isinstance(item, dict) else item
+    # Explanation:
+    # - A broken line isn't fatal: it becomes None, reported as an error
+
+
+# Step 26: Shorten One Batch at a Time
+# What is this? A generator: it saves 500 URLs, sends their lines, then the next 500
+def shorten_stream(urls, base_url):
+    """Yield one NDJSON result line for every URL, in the order they were sent"""
+    urls = iter(urls)
+    index = 0
+    limit = app.config['BULK_MAX_URLS']
+    while index < limit:
+        batch = list(islice(urls, min(app.config['BULK_BATCH_SIZE'], limit - index)))
+        if not batch:
+            return
+        checked = []
+        for item in batch:
+            if not isinstance(item, str):
+                checked.append((None, 'Expected a URL string'))
+                continue
+            try:
+                checked.append((normalize_url(item), None))
+            except ValueError as error:
+                checked.append((None, f'Invalid URL: {error}'))
+        saved = iter(store.add_many([url for url, error in checked if error is None]))
+        lines = []
+        for url, error in checked:
+            if error is None:
+                code, created = next(saved)
+                result = {'index': index, 'url': url, 'code': code,
+                          'short_url': base_url + code, 'created': created}
+            else:
+                result = {'index': index, 'error': error}
+            lines.append(json.dumps(result) + '\n')
+            index += 1
+        yield ''.join(lines)
+    if next(urls, None) is not None:
+        yield json.dumps({'error': f'Stopped after {limit} URLs (BULK_MAX_URLS)'}) + '\n'
+    # Explanation:
+    # - normalize_url() = 'Example.com' and 'http://example.com/' are the same
+    #   link, so they get the same code
+    # - store.add_many() = ONE transaction per batch: the URLs we already
+    #   have get their old code, the new ones one block of numbers
+    # - index = Position in the request (so errors are easy to match up)
+    # - yield = Send this batch's lines now, while the next batch is saved
+    # - Not a string (a number, null, a broken line)? An error line, not a crash
+
+# Step 27: Create Bulk Shorten API Route
+# What is this? Shortens thousands of URLs in one request
+# Think of it like: "Hand in a whole stack of forms instead of one at a time"
+@app.route('/api/shorten/bulk', methods=['POST'])
+# Explanation:
+# - Example: curl -H 'Content-Type: application/x-ndjson' --data-binary @urls.ndjson \
+#            http://127.0.0.1:5000/api/shorten/bulk
+# - Answers with NDJSON: one line per URL, in the same order
+
+def shorten_bulk():
+    """
+    This function shortens every URL in the request body and streams the results
+    """
+    urls = read_bulk_urls()
+    if urls is None:
+        return jsonify({'error': 'Send a JSON list of URLs, {"urls": [...]}, '
+                                 'or NDJSON (Content-Type: application/x-ndjson)'}), 400
+    if isinstance(urls, list) and len(urls) > app.config['BULK_MAX_URLS']:
+        return jsonify({'error': f"At most {app.config['BULK_MAX_URLS']} URLs per request"}), 413
+    # Explanation:
+    # - 400 = Bad Request (we couldn't find a list of URLs)
+    # - 413 = Content Too Large (split the list into several requests)
+
+    return Response(stream_with_context(shorten_stream(urls, request.host_url)),
+                    mimetype='application/x-ndjson')
+    # Explanation:
+    # - Response(generator) = Flask sends each batch's lines as soon as
+    #   they're ready, instead of building one huge answer first
+    # - stream_with_context() = Keeps `request` usable inside the generator
+    #   (NDJSON lines are still being read while results go out)
+    # - request.host_url = 'http://127.0.0.1:5000/' (+ code = the short URL)
+    # - Each line: {"index": 0, "url": "https://example.com/", "code": "1IVE1D",
+    #              "short_url": "http://127.0.0.1:5000/1IVE1D", "created": true}
+    # - The codes aren't added to your session (API clients have no cookies)
+
 # Step 28: Run the Application
 # What is this? This starts the web server
 # Think of it like: "Turn on the website so people can visit it"
@@ -0,0 +1,208 @@
+# URL Shortener Benchmark
+# This script measures how many redirects per second one CPU core can do!
+
+# Step 1: Import the Tools We Need
+# What is this? Python tools for timing, temporary files and fake requests
+# Think of it like: "Get a stopwatch and click the same short links over and over"
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from werkzeug.test import EnvironBuilder
+# Explanation:
+# - argparse = Reads command-line options (like --requests 100000)
+# - tempfile = A temporary folder for the benchmark's own SQLite file
+# - random = Made-up codes, like a scanner trying random /<short_code> paths
+# - EnvironBuilder = Builds a fake request (the "environ" a web server passes in)
+
+# How to use:
+#   python benchmark.py                      # 1000 links, 50,000 redirects
+#   python benchmark.py --links 50 --requests 200000
+#   python benchmark.py --json results.json
+#
+# Everything runs in ONE thread, so the numbers are "redirects per second
+# per core". There is no network: we call the WSGI app directly, so we only
+# measure the work our code (and Flask) does for each redirect.
+
+
+# Step 2: Load the App with a Temporary Database
+def load_app(directory):
+    """Import app.py with its SQLite file in `directory`"""
+    os.environ['FLASK_URL_DATABASE'] = os.path.join(directory, 'urls.sqlite3')
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import app
+    return app
+    # Explanation:
+    # - FLASK_URL_DATABASE = Read by app.config.from_prefixed_env()
+    # - So the benchmark never touches your real instance/urls.sqlite3
+
+
+# Step 3: Build the Requests
+def make_environs(flask_app, codes, cookie=None):
+    """Return one WSGI environ per short code"""
+    headers = {'Cookie': f"{flask_app.config['SESSION_COOKIE_NAME']}={cookie}"} if cookie else {}
+    return [EnvironBuilder(path=f'/{code}', headers=headers).get_environ() for code in codes]
+
+
+def session_cookie(flask_app, links):
+    """Return a signed session cookie holding `links` URL mappings (like before)"""
+    serializer = flask_app.session_interface.get_signing_serializer(flask_app)
+    urls = {f'{number:06d}': f'https://example.com/article/{number}' for number in range(links)}
+    return serializer.dumps({'urls': urls})
+    # Explanation:
+    # - Before the SQLite store, every link lived in the session cookie
+    # - Flask reads (and checks the signature of) that cookie on EVERY request
+
+
+# Step 4: Send Requests and Time Them
+def run(wsgi_app, environs, requests):
+    """Send `requests` requests round-robin, return (seconds, Location headers seen)"""
+    seen = {}
+
+    def start_response(status, headers, exc_info=None):
+        seen[status] = dict(headers).get('Location')
+
+    count = len(environs)
+    started = time.perf_counter()
+    for number in range(requests):
+        body = wsgi_app(dict(environs[number % count]), start_response)
+        for _ in body:
+            pass
+        if hasattr(body, 'close'):
+            body.close()
+    return time.perf_counter() - started, seen
+    # Explanation:
+    # - dict(environ) = A fresh copy per request, like a real web server
+    # - We read the whole body and close it, like a real web server
+    # - seen = Status → last Location header (checked below)
+
+
+# Step 5: Time Lookups of Codes That Don't Exist
+def time_unknown_codes(store, lookups, seed=42):
+    """Return [(name, seconds)] for looking up random codes that aren't in the store"""
+    rng = random.Random(seed)
+    codes = [''.join(rng.choices('0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ', k=6))
+             for _ in range(lookups)]
+    conn = store._connect()
+    timings = []
+    for name, lookup in [
+        ('SQLite index lookup', lambda code: conn.execute(
+            'SELECT url FROM urls WHERE code = ?', (code,)).fetchone()),
+        ('Bloom filter first', store.get),
+    ]:
+        started = time.perf_counter()
+        found = sum(lookup(code) is not None for code in codes)
+        timings.append((name, time.perf_counter() - started, found))
+    return timings
+    # Explanation:
+    # - Scanners try random paths; almost none of them are real codes
+    # - Without the filter, every one of them is a database lookup
+    # - With it, the answer "doesn't exist" comes from memory
+
+
+# Step 6: Time Shortening Many URLs
+def time_bulk_shorten(store, count, batch_size=500):
+    """Return [(name, seconds)] for saving `count` new URLs one by one and in batches"""
+    timings = []
+    started = time.perf_counter()
+    for number in range(count):
+        store.add(f'https://example.com/one-by-one/{number}')
+    timings.append(('store.add(), one at a time', time.perf_counter() - started))
+    started = time.perf_counter()
+    for start in range(0, count, batch_size):
+        store.add_many([f'https://example.com/batched/{number}'
+                        for number in range(start, min(start + batch_size, count))])
+    timings.append((f'store.add_many(), {batch_size} per batch', time.perf_counter() - started))
+    return timings
+    # Explanation:
+    # - add() = One transaction (and one disk sync) per URL
+    # - add_many() = One transaction per 500 URLs, which is what
+    #   /api/shorten/bulk does
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark short-link redirects')
+    parser.add_argument('--links', type=int, default=1000, help='different short links clicked')
+    parser.add_argument('--requests', type=int, default=50000)
+    parser.add_argument('--cookie-links', type=int, default=50,
+                        help='links in the old-style session cookie')
+    parser.add_argument('--bulk', type=int, default=10000, help='URLs saved by the bulk test')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = load_app(directory)
+        codes = [app.store.add(f'https://example.com/article/{n}') for n in range(args.links)]
+        flask_only = app.app.wsgi_app.app
+        no_hot_cache = app.RedirectResolver(flask_only, app.store, hot_size=0, clicks=app.clicks)
+        resolver = app.app.wsgi_app
+        environs = make_environs(app.app, codes)
+        cookie_environs = make_environs(app.app, codes, session_cookie(app.app, args.cookie_links))
+        # Explanation:
+        # - flask_only = The Flask app without the resolver in front
+        # - no_hot_cache = The resolver, but every click asks the store
+        # - resolver = What app.py really runs (hot-code cache first)
+        # - Every row also records the click (see analytics.py)
+
+        methods = [
+            (f'Flask route + {args.cookie_links}-link cookie', flask_only, cookie_environs),
+            ('Flask route', flask_only, environs),
+            ('resolver, store lookup', no_hot_cache, environs),
+            ('resolver, hot cache', resolver, environs),
+        ]
+        # Explanation:
+        # - The first row is like the old app: the session cookie holds
+        #   every link, and Flask decodes it for every redirect
+        # - All rows redirect to the same URLs (checked below)
+
+        header = f"{'method':<32} {'seconds':>9} {'redirects/s':>12} {'µs each':>9} {'speedup':>8}"
+        print(f'{args.requests} redirects over {args.links} links, one thread (one core)')
+        print(header)
+        print('-' * len(header))
+        results = []
+        baseline = last_location = None
+        for name, wsgi_app, method_environs in methods:
+            run(wsgi_app, method_environs, min(args.requests, 2 * len(codes)))
+            seconds, seen = run(wsgi_app, method_environs, args.requests)
+            if len(seen) != 1 or not next(iter(seen)).startswith('302'):
+                raise SystemExit(f'{name} answered {list(seen)}, expected only 302 redirects')
+            last_location = last_location or next(iter(seen.values()))
+            if next(iter(seen.values())) != last_location:
+                raise SystemExit(f'{name} redirected to {seen}, expected {last_location}')
+            baseline = baseline or seconds
+            rate = args.requests / seconds
+            results.append({'method': name, 'seconds': seconds, 'redirects_per_second': rate,
+                            'speedup': baseline / seconds})
+            print(f'{name:<32} {seconds:>9.3f} {rate:>12,.0f} {1e6 / rate:>9.1f} '
+                  f'{baseline / seconds:>7.1f}x')
+        # Explanation:
+        # - The first (shorter) run warms up the caches, then we time
+        # - redirects/s = Requests one core can answer per second
+        # - speedup = How many times faster than the first row
+
+        print(f'\n{args.requests} lookups of unknown codes (like a scanner)')
+        for name, seconds, found in time_unknown_codes(app.store, args.requests):
+            results.append({'method': f'unknown codes, {name}', 'seconds': seconds,
+                            'lookups_per_second': args.requests / seconds, 'found': found})
+            print(f'{name:<32} {seconds:>9.3f} {args.requests / seconds:>12,.0f} '
+                  f'{seconds / args.requests * 1e6:>9.1f}')
+
+        print(f'\n{args.bulk} new URLs saved')
+        for name, seconds in time_bulk_shorten(app.store, args.bulk):
+            results.append({'method': name, 'seconds': seconds,
+                            'urls_per_second': args.bulk / seconds})
+            print(f'{name:<32} {seconds:>9.3f} {args.bulk / seconds:>12,.0f} '
+                  f'{seconds / args.bulk * 1e6:>9.1f}')
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'settings': vars(args), 'results': results}, f, indent=2)
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+# Bloom Filter
+# This module answers "is this short code in the store?" without asking the store!
+
+# Step 1: Import the Tools We Need
+# What is this? Math for sizing the filter, and a lock
+# Think of it like: "A guest list that's tiny, fast, and never forgets a name"
+import math
+import threading
+# Explanation:
+# - math = Logarithms to work out how big the filter must be
+# - threading = A lock so two threads don't add at the same time
+
+# What is a Bloom filter?
+# - A row of bits (all 0 at the start) and k "positions" per code
+# - add(code): set the code's k bits to 1
+# - code in filter: are ALL its k bits 1?
+#   - No  → the code was DEFINITELY never added (no store lookup needed!)
+#   - Yes → it PROBABLY was (the store has the final word)
+# - "Probably" is wrong only error_rate of the time (0.1% by default)
+# - 1,000,000 codes take only ~1.8 MB
+#
+# Scalable = When a filter is full, a bigger one is added behind it, so we
+# never have to know in advance how many links there will be.
+
+
+# Step 2: Create One Fixed-Size Filter
+class BloomFilter:
+    """
+    Fixed-capacity Bloom filter
+
+    Args:
+    - capacity: How many keys it holds before error_rate is exceeded
+    - error_rate: Chance that a key never added is reported as present
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self.bits = bytearray((self.size + 7) // 8)
+        # Explanation:
+        # - size = Number of bits: m = -n × ln(p) / ln(2)²
+        # - hashes = Bits set per key: k = m / n × ln(2)
+        # - For 0.1%: about 14 bits and 10 positions per key
+
+    def _positions(self, h1, h2):
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hashes)]
+        # Explanation:
+        # - Two hashes give all k positions: h1, h1 + h2, h1 + 2×h2...
+        #   (as good as k separate hash functions, and much cheaper)
+
+    def add(self, h1, h2):
+        bits = self.bits
+        for position in self._positions(h1, h2):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+        # Explanation:
+        # - position >> 3 = Which byte, position & 7 = which bit in that byte
+
+
+# Step 3: Create the Scalable Filter
+# What is this? A list of Bloom filters that grows as keys are added
+class ScalableBloomFilter:
+    """
+    Bloom filter that grows with the number of keys
+
+    Args:
+    - initial_capacity: Keys the first filter holds
+    - error_rate: Chance of a false "present" for the first filter
+    - growth: Each new filter holds this many times more keys
+    - tightening: Each new filter's error_rate is multiplied by this
+    """
+
+    def __init__(self, initial_capacity=10000, error_rate=0.001, growth=2, tightening=0.5):
+        self.growth = growth
+        self.tightening = tightening
+        self.filters = [BloomFilter(initial_capacity, error_rate)]
+        self._lock = threading.Lock()
+        # Explanation:
+        # - Error rates p, p/2, p/4... add up to at most 2p (0.2%) in total
+        # - Capacities n, 2n, 4n... so a million keys need only ~7 filters
+
+    @staticmethod
+    def _hash(key):
+        digest = hash(key) & 0xFFFFFFFFFFFFFFFF
+        return digest >> 32, (digest & 0xFFFFFFFF) | 1
+        # Explanation:
+        # - hash() = Python's own (very fast) 64-bit string hash, split into
+        #   two 32-bit numbers (h1, h2)
+        # - hash() changes every time Python starts, which is fine: the filter
+        #   only lives in memory and is rebuilt at startup (never saved)
+        # - | 1 = h2 is never 0 (which would give k copies of one position)
+
+    def add(self, key):
+        """Add a key"""
+        h1, h2 = self._hash(key)
+        with self._lock:
+            current = self.filters[-1]
+            if current.count >= current.capacity:
+                current = BloomFilter(current.capacity * self.growth,
+                                      current.error_rate * self.tightening)
+                self.filters.append(current)
+            current.add(h1, h2)
+        # Explanation:
+        # - New keys always go into the newest filter
+        # - Full? Add a bigger, stricter filter behind it
+
+    def __contains__(self, key):
+        h1, h2 = self._hash(key)
+        for bloom in self.filters:
+            bits, size = bloom.bits, bloom.size
+            for i in range(bloom.hashes):
+                position = (h1 + i * h2) % size
+                if not bits[position >> 3] & (1 << (position & 7)):
+                    break
+            else:
+                return True
+        return False
+        # Explanation:
+        # - A key could be in any of the filters, so we check them all
+        # - break = The first 0 bit means "not in this filter"; about half the
+        #   bits are 0, so that's usually after 1 or 2 checks
+        # - for ... else = Runs only if no bit was 0: all k bits set, "probably"
+        # - The check is written out here (not a method per filter) because
+        #   this runs for every unknown code, and calls are slow in Python
+        # - No lock: reading while another thread adds is safe here
+
+    def __len__(self):
+        return sum(bloom.count for bloom in self.filters)
+
+    @property
+    def nbytes(self):
+        """Memory used by the bits of all the filters"""
+        return sum(len(bloom.bits) for bloom in self.filters)
@@ -0,0 +1,130 @@
+# Redirect Resolver
+# This module answers short links BEFORE Flask even looks at the request!
+
+# Step 1: Import the Tools We Need
+# What is this? A lock, a URL helper and the code checker from url_store.py
+# Think of it like: "A receptionist who answers the most common question right at the door"
+import threading
+
+from werkzeug.urls import iri_to_uri
+
+from url_store import is_valid_code
+# Explanation:
+# - threading = A lock so two threads don't evict from the cache at once
+# - iri_to_uri = Makes a URL safe for an HTTP header ("café" → "caf%C3%A9")
+# - is_valid_code = Only letters and digits can be a short code
+
+# How it works:
+#   app.wsgi_app = RedirectResolver(app.wsgi_app, store)
+#
+# Every request passes through the resolver first:
+# - GET /1IVE1D and the code is known → answer "302 Found" right here
+# - Anything else (/, /shorten, unknown codes) → handed to Flask as usual
+#
+# Why? For a redirect, Flask would create a request context, open (and
+# verify the signature of) the session cookie, match the URL, call the view
+# and build a Response object. None of that is needed to send one header!
+
+
+# Step 2: Create the Hot-Code Cache
+# What is this? A small dictionary of ready-made redirect headers
+# Think of it like: "Sticky notes for the links people ask for all the time"
+class HotCache:
+    """
+    Bounded code → response headers cache with lock-free reads
+
+    Args:
+    - max_entries: Maximum number of codes kept
+    """
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+        # Explanation:
+        # - _entries = code → [('Location', url), ('Content-Length', '0')]
+        # - The headers are built once, then reused for every click
+
+    def get(self, code):
+        """Return the cached headers for code, or None"""
+        return self._entries.get(code)
+        # Explanation:
+        # - A plain dict lookup: no lock, no reordering, nothing new created
+        # - (Unlike an LRU, a hit doesn't move anything around)
+
+    def set(self, code, headers):
+        """Remember headers for code, evicting the oldest code if full"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if code not in self._entries and len(self._entries) >= self.max_entries:
+                del self._entries[next(iter(self._entries))]
+            self._entries[code] = headers
+        # Explanation:
+        # - next(iter(...)) = The oldest code we added (dicts keep order)
+        # - A hot code that gets evicted comes straight back on its next click
+        # - max_entries=0 turns the cache off (benchmark.py uses this)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Step 3: Create the Resolver
+# What is this? WSGI middleware: a function that sits in front of the Flask app
+class RedirectResolver:
+    """
+    Answers GET /<short_code> for known codes without running Flask
+
+    Args:
+    - app: The WSGI app to call for every other request (app.wsgi_app)
+    - store: The UrlStore to look codes up in
+    - hot_size: How many codes the hot-code cache keeps
+    - clicks: A ClickAnalytics to record each redirect in (None = don't count)
+    """
+
+    def __init__(self, app, store, hot_size=4096, clicks=None):
+        self.app = app
+        self.store = store
+        self.hot = HotCache(hot_size)
+        self.clicks = clicks
+
+    def __call__(self, environ, start_response):
+        if environ['REQUEST_METHOD'] in ('GET', 'HEAD'):
+            headers = self.resolve(environ.get('PATH_INFO', ''))
+            if headers is not None:
+                if self.clicks is not None and environ['REQUEST_METHOD'] == 'GET':
+                    self.clicks.record(environ['PATH_INFO'][1:], environ.get('HTTP_REFERER'))
+                start_response('302 Found', headers)
+                return []
+        return self.app(environ, start_response)
+        # Explanation:
+        # - environ = The request as a dictionary (method, path, headers...)
+        # - clicks.record() = Only adds the click to a buffer (see analytics.py)
+        # - HEAD requests (link previews, checkers) aren't counted as clicks
+        # - start_response() = Sends the status line and headers
+        # - [] = An empty body (the browser only needs the Location header)
+        # - No session, no request context, no Response object
+
+    def resolve(self, path):
+        """Return the redirect headers for '/<short_code>', or None"""
+        code = path[1:]
+        headers = self.hot.get(code)
+        if headers is not None:
+            return headers
+        # Explanation:
+        # - path = '/1IVE1D' → code = '1IVE1D'
+        # - Hot code? Return the headers we built before (the fast path!)
+
+        if not path.startswith('/') or not is_valid_code(code):
+            return None
+        url = self.store.get(code)
+        if url is None:
+            return None
+        headers = [('Location', iri_to_uri(url)), ('Content-Length', '0')]
+        self.hot.set(code, headers)
+        return headers
+        # Explanation:
+        # - '/', '/shorten' and '/static/style.css' aren't valid codes
+        # - store.get() = The store's LRU cache, then SQLite
+        # - Unknown code? Flask shows the "not found" message as before
+        # - Links never change, so cached headers never go stale
@@ -0,0 +1,497 @@
+# URL Store
+# This module keeps every short link in one SQLite file, shared by all users!
+
+# Step 1: Import the Tools We Need
+# What is this? Python's built-in database, plus tools for threads and codes
+# Think of it like: "A filing cabinet everyone can use, with a desk drawer in front"
+import hashlib
+import mmap
+import os
+import re
+import sqlite3
+import string
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit, urlunsplit
+
+from bloom import ScalableBloomFilter
+# Explanation:
+# - sqlite3 = Built-in SQLite database (just a file, no server needed)
+# - hashlib = Turns a long URL into a short number (to find it again fast)
+# - mmap = A file that several processes can read and write like memory
+# - re = Regular expressions (to spot a 'scheme:' at the start of a URL)
+# - string = Letters and digits for the short codes
+# - threading = Locks and one database connection per thread
+# - OrderedDict = Dictionary that remembers order (perfect for LRU!)
+# - urlsplit/urlunsplit = Take a URL apart and put it back together
+# - ScalableBloomFilter = Knows which codes DON'T exist (see bloom.py)
+
+ALPHABET = string.digits + string.ascii_letters
+CODE_LENGTH = 6
+CODE_SPACE = len(ALPHABET) ** CODE_LENGTH
+_SCRAMBLE = 1580030173
+MAX_URL_LENGTH = 2048
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+_SCHEME = re.compile(r'[a-zA-Z][a-zA-Z0-9+.-]*:(?!\d+(?:[/?#]|$))')
+# Explanation:
+# - ALPHABET = The 62 characters a code can use (0-9, a-z, A-Z)
+# - CODE_SPACE = How many 6-character codes exist (62^6 = 56,800,235,584)
+# - _SCRAMBLE = A number that shuffles the codes (see code_for() below)
+# - MAX_URL_LENGTH = Longer URLs are refused (browsers struggle past 2,000)
+# - _SCHEME = 'letters:' at the start ('https:', 'mailto:', 'javascript:'),
+#   but not 'example.com:8080/' (a colon followed by a port number)
+
+
+# Step 2: Turn Numbers into Codes (Base62)
+# What is this? Writing a number with 62 "digits" instead of 10
+# Think of it like: "125 in base 10 is 1-2-5; in base 62 it's 2-1"
+def encode_base62(number, length=0):
+    """Return number written in base62, padded with '0' to `length`"""
+    digits = []
+    while number:
+        number, remainder = divmod(number, len(ALPHABET))
+        digits.append(ALPHABET[remainder])
+    return ''.join(reversed(digits)).rjust(length, ALPHABET[0]) or ALPHABET[0]
+    # Explanation:
+    # - divmod(number, 62) = (number // 62, number % 62)
+    # - The remainder is the last "digit", then we repeat with the rest
+    # - Example: 125 → '21' (2 × 62 + 1)
+
+
+def code_for(number):
+    """Return the short code for a sequence number (every number gets a different code)"""
+    if number < CODE_SPACE:
+        return encode_base62(number * _SCRAMBLE % CODE_SPACE, CODE_LENGTH)
+    return encode_base62(number)
+    # Explanation:
+    # - Links 1, 2, 3 would get codes '000001', '000002', '000003', and
+    #   anyone could guess the next one
+    # - number × _SCRAMBLE % CODE_SPACE jumps around the code space
+    #   (1 → '1IVE1D', 2 → '3rRi3g'...) but never gives two numbers the same
+    #   code, because _SCRAMBLE shares no factor with 62^6
+    # - No random codes means no "is this code taken? try again" loop!
+
+
+def is_valid_code(code):
+    """Return True if code could be one of our short codes"""
+    return 0 < len(code) <= 11 and all(char in ALPHABET for char in code)
+    # Explanation:
+    # - /favicon.ico, /wp-admin.php... can't be codes: no database lookup
+    # - 11 characters is enough for any 64-bit number
+
+
+def normalize_url(url):
+    """
+    Return url written the standard way, or raise ValueError
+    'Example.COM' and 'http://example.com:80/' both give 'http://example.com/'
+    """
+    url = url.strip()
+    if not _SCHEME.match(url):
+        url = 'http://' + url
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        raise ValueError('not a web address')
+    if len(url) > MAX_URL_LENGTH:
+        raise ValueError(f'longer than {MAX_URL_LENGTH} characters')
+    try:
+        port = parts.port
+    except ValueError:
+        raise ValueError('bad port number') from None
+    netloc = f'[{parts.hostname}]' if ':' in parts.hostname else parts.hostname
+    if port not in (None, DEFAULT_PORTS[scheme]):
+        netloc += f':{port}'
+    if '@' in parts.netloc:
+        netloc = parts.netloc.rpartition('@')[0] + '@' + netloc
+    return urlunsplit((scheme, netloc, parts.path or '/', parts.query, parts.fragment))
+    # Explanation:
+    # - No 'scheme:' at the start? Add 'http://' (people often leave it out)
+    # - Any other scheme is refused right away: only 'http://' and 'https://'
+    #   links (no 'mailto:', 'javascript:' or 'ftp://')
+    # - hostname = The website name in lowercase (hosts don't care about case)
+    # - :80 for http and :443 for https are the default, so they're dropped
+    # - An empty path becomes '/' ('https://a.com' = 'https://a.com/')
+    # - The path, query and #fragment are kept exactly (they can be case-sensitive)
+    # - parts.port raises ValueError for a bad port like ':abc' or ':99999'
+
+
+def url_hash(url):
+    """Return a 64-bit number for a long URL (the same URL always gives the same number)"""
+    return int.from_bytes(hashlib.sha256(url.encode()).digest()[:8], 'big', signed=True)
+    # Explanation:
+    # - SQLite indexes a number much more compactly than a 2,000-character URL
+    # - signed=True = Fits in SQLite's INTEGER (-2^63 ... 2^63 - 1)
+    # - Two URLs *could* share a number, so we still compare the URLs themselves
+
+
+# Step 3: Create the In-Memory LRU Cache
+# What is this? Remembers recently used links so we can skip the database
+# Think of it like: "A desk drawer that only holds the folders you use most"
+class LRUCache:
+    """
+    Bounded least-recently-used cache of code → long URL
+
+    Args:
+    - max_entries: Maximum number of links kept in memory
+    """
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Explanation:
+        # - _entries = code → long URL, least recently used first
+        # - _lock = Keeps threads from changing the OrderedDict together
+
+    def get(self, code):
+        """Return the long URL for code, or None"""
+        with self._lock:
+            url = self._entries.get(code)
+            if url is not None:
+                self._entries.move_to_end(code)
+            return url
+        # Explanation:
+        # - move_to_end() = Marks the code as "most recently used"
+
+    def set(self, code, url):
+        """Remember a link, forgetting the least recently used one if full"""
+        with self._lock:
+            self._entries[code] = url
+            self._entries.move_to_end(code)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        # Explanation:
+        # - popitem(last=False) = Removes the least recently used link
+        # - It's still in SQLite, so it can come back later
+
+    def clear(self):
+        """Forget every link"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Step 4: Create the Change Marker
+# What is this? 8 bytes, shared by every worker, saying "the newest link is #N"
+# Think of it like: "A counter on the office wall that everyone can glance at"
+class ChangeMarker:
+    """
+    The number of the last link saved by any worker, in a small shared file
+
+    Args:
+    - path: Location of the marker file (next to the database)
+    """
+
+    def __init__(self, path):
+        with open(path, 'ab') as f:
+            if f.tell() < 8:
+                f.write(bytes(8 - f.tell()))
+        self._file = open(path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), 8)
+        # Explanation:
+        # - 'ab' = Creates the file if it's missing, never erases it
+        # - mmap = The 8 bytes are shared memory: a worker that writes them
+        #   changes what every other worker reads (even after a fork)
+
+    def read(self):
+        """Return the number last written by any worker"""
+        return int.from_bytes(self._map[:8], 'little')
+        # Explanation:
+        # - No system call and no database: just reading memory
+
+    def write(self, number):
+        """Say that link `number` was just saved (call after COMMIT)"""
+        self._map[:8] = number.to_bytes(8, 'little')
+
+
+# Step 5: Create the URL Store (SQLite + LRU + Bloom filter)
+# What is this? Saves links in SQLite and looks them up through the LRU
+# Think of it like: "The filing cabinet (SQLite) with the desk drawer (LRU) in front"
+class UrlStore:
+    """
+    Short links saved in a SQLite file, shared by every user and worker
+
+    Args:
+    - path: Location of the SQLite database file
+    - cache_size: How many links the in-memory LRU cache keeps
+    """
+
+    def __init__(self, path, cache_size=10000):
+        self.path = path
+        self.cache = LRUCache(cache_size)
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS urls ('
+            'id INTEGER PRIMARY KEY, code TEXT NOT NULL, '
+            'url TEXT NOT NULL, created REAL NOT NULL, url_hash INTEGER)'
+        )
+        conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS urls_by_code ON urls (code)')
+        self._add_url_hashes(conn)
+        conn.execute('CREATE INDEX IF NOT EXISTS urls_by_hash ON urls (url_hash)')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS sequence ('
+            'name TEXT PRIMARY KEY, value INTEGER NOT NULL)'
+        )
+        conn.execute("INSERT OR IGNORE INTO sequence (name, value) VALUES ('urls', 0)")
+        # Explanation:
+        # - urls = One row per link: its number, code and long URL
+        # - UNIQUE INDEX on code = Finding a code is one index lookup, and
+        #   SQLite refuses to store the same code twice
+        # - INDEX on url_hash = Finding a long URL we already have is one
+        #   index lookup too (add_many() uses it to reuse codes)
+        # - sequence = The last number we handed out (starts at 0)
+
+        self.codes = None
+        self.marker = ChangeMarker(path + '-marker')
+        last = conn.execute("SELECT value FROM sequence WHERE name = 'urls'").fetchone()[0]
+        if self.marker.read() > last:
+            self.marker.write(last)
+        self._seen_marker = None
+        self._synced_id = 0
+        self._sync_lock = threading.Lock()
+        self.rebuild_filter()
+        # Explanation:
+        # - codes = A Bloom filter of every code in the store
+        # - marker = Changes whenever any worker saves a link
+        # - _seen_marker = The marker value when the filter was last synced
+        # - A marker ahead of the sequence = The database file was replaced,
+        #   so the marker starts again from the newest real link
+        # - _synced_id = The highest link number loaded into the filter
+
+    def _connect(self):
+        """Return this thread's connection, reconnecting after a fork"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+        # Explanation:
+        # - SQLite connections can't be shared between threads
+        # - gunicorn forks workers, and a connection must not cross a fork
+        # - isolation_level=None = Autocommit (we start transactions ourselves)
+        # - journal_mode=WAL = Readers never block the writer
+
+    def _add_url_hashes(self, conn):
+        """Add the url_hash column to a database made before it existed"""
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            columns = [row[1] for row in conn.execute('PRAGMA table_info(urls)')]
+            if 'url_hash' not in columns:
+                conn.execute('ALTER TABLE urls ADD COLUMN url_hash INTEGER')
+                rows = conn.execute('SELECT id, url FROM urls').fetchall()
+                conn.executemany('UPDATE urls SET url_hash = ? WHERE id = ?',
+                                 [(url_hash(url), number) for number, url in rows])
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        # Explanation:
+        # - PRAGMA table_info = The columns of the table
+        # - ALTER TABLE = Adds the column; then every old link gets its hash
+        # - Inside BEGIN IMMEDIATE, so two workers starting at once don't
+        #   both try to add the column
+
+    def _allocate(self, conn, count=1):
+        """Reserve `count` sequence numbers, return the first one"""
+        conn.execute("UPDATE sequence SET value = value + ? WHERE name = 'urls'", (count,))
+        last = conn.execute("SELECT value FROM sequence WHERE name = 'urls'").fetchone()[0]
+        return last - count + 1
+        # Explanation:
+        # - Must run inside a write transaction (BEGIN IMMEDIATE), so two
+        #   workers can never get the same numbers
+        # - Insert the links in that SAME transaction: then links always
+        #   appear in number order (_sync_filter() relies on this)
+
+    def add(self, url):
+        """Save a long URL and return its new short code"""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            number = self._allocate(conn)
+            code = code_for(number)
+            conn.execute(
+                'INSERT INTO urls (id, code, url, created, url_hash) VALUES (?, ?, ?, ?, ?)',
+                (number, code, url, time.time(), url_hash(url))
+            )
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        self._saved(number, [code])
+        self.cache.set(code, url)
+        return code
+        # Explanation:
+        # - BEGIN IMMEDIATE = Lock the database for writing until COMMIT
+        # - The number and the link are saved together, or not at all
+        # - _saved() = Tell the Bloom filter and the other workers
+        # - The new link goes into the LRU (it's likely to be clicked soon)
+
+    def add_many(self, urls):
+        """
+        Save a batch of long URLs in ONE transaction
+        Returns [(code, created)] in the same order; a URL that is already
+        saved gets its old code back (created=False)
+        """
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            codes = self._find_urls(conn, urls)
+            new = list(dict.fromkeys(url for url in urls if url not in codes))
+            first = self._allocate(conn, len(new)) if new else 0
+            now = time.time()
+            rows = [(first + offset, code_for(first + offset), url, now, url_hash(url))
+                    for offset, url in enumerate(new)]
+            conn.executemany(
+                'INSERT INTO urls (id, code, url, created, url_hash) VALUES (?, ?, ?, ?, ?)', rows
+            )
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        if rows:
+            self._saved(first, [code for _, code, _, _, _ in rows])
+        created = {url: code for _, code, url, _, _ in rows}
+        codes.update(created)
+        seen = set()
+        results = []
+        for url in urls:
+            results.append((codes[url], url in created and url not in seen))
+            seen.add(url)
+        return results
+        # Explanation:
+        # - _find_urls() = The URLs we already have, and their codes
+        # - dict.fromkeys() = The new URLs without repeats (order kept)
+        # - _allocate(conn, len(new)) = One counter update for the whole batch:
+        #   the batch gets the numbers first, first + 1, first + 2...
+        # - executemany() = All the inserts with one statement, one disk sync
+        # - The same URL twice in a batch → one link; only the first one
+        #   is reported as created
+        # - New links don't go into the LRU: a campaign of 50,000 links
+        #   would push out the links people are clicking right now
+
+    def _find_urls(self, conn, urls):
+        """Return {url: code} for the URLs that are already saved"""
+        hashes = list({url_hash(url) for url in urls})
+        found = {}
+        wanted = set(urls)
+        for start in range(0, len(hashes), 500):
+            chunk = hashes[start:start + 500]
+            rows = conn.execute(
+                f"SELECT url, code FROM urls WHERE url_hash IN ({', '.join('?' * len(chunk))}) "
+                'ORDER BY id DESC', chunk
+            )
+            found.update((url, code) for url, code in rows if url in wanted)
+        return found
+        # Explanation:
+        # - url_hash IN (?, ?, ...) = One index lookup per URL, in one query
+        # - 500 at a time = SQLite limits how many ? a query may have
+        # - url in wanted = Two different URLs with the same hash don't match
+        # - ORDER BY id DESC = Saved twice (by the form)? The oldest code wins,
+        #   because it's the last one put in the dictionary
+
+    def _saved(self, first, codes):
+        """Announce links first, first + 1, ... (just committed) to the filter and other workers"""
+        last = first + len(codes) - 1
+        self.marker.write(last)
+        with self._sync_lock:
+            for code in codes:
+                self.codes.add(code)
+            if first == self._synced_id + 1:
+                self._synced_id = last
+        # Explanation:
+        # - marker.write() AFTER the commit: other workers that see the new
+        #   marker will find the links in the database
+        # - The new codes go into our Bloom filter (now they "might exist")
+        # - Right after the last synced number? Then the next sync can
+        #   start after them (no need to read our own links back)
+
+    def get(self, code):
+        """Return the long URL for a short code, or None"""
+        url = self.cache.get(code)
+        if url is not None:
+            return url
+        if not self.might_exist(code):
+            return None
+        row = self._connect().execute(
+            'SELECT url FROM urls WHERE code = ?', (code,)
+        ).fetchone()
+        if row is None:
+            return None
+        self.cache.set(code, row[0])
+        return row[0]
+        # Explanation:
+        # - LRU hit = No database at all (just a dictionary lookup)
+        # - Bloom filter says no = No database lookup either (scanners
+        #   trying random codes never reach SQLite)
+        # - Otherwise = One lookup in the code index, then remember it
+
+    # Step 6: Keep the Bloom Filter in Sync
+    # What is this? Making sure the filter knows every code in the store
+    # Think of it like: "Update the guest list before turning anyone away"
+    def might_exist(self, code):
+        """
+        Return False if code is definitely not in the store (so it's free to use)
+
+        True means "probably": only the store can say for sure.
+        """
+        if code in self.codes:
+            return True
+        marker = self.marker.read()
+        if marker == self._seen_marker:
+            return False
+        self._sync_filter(marker)
+        return code in self.codes
+        # Explanation:
+        # - Other workers add links too, and their codes aren't in OUR filter
+        # - Marker unchanged? Nobody saved a link since our last sync, so the
+        #   filter is up to date and "no" really means no
+        # - Changed? Load the new codes from SQLite, then check again
+
+    def _sync_filter(self, marker):
+        """Add the codes of links saved since the last sync to the filter"""
+        with self._sync_lock:
+            rows = self._connect().execute(
+                'SELECT id, code FROM urls WHERE id > ? ORDER BY id', (self._synced_id,)
+            ).fetchall()
+            for number, code in rows:
+                self.codes.add(code)
+            if rows:
+                self._synced_id = rows[-1][0]
+            self._seen_marker = marker
+        # Explanation:
+        # - marker was read BEFORE this query, so every link it announced is
+        #   in the rows (a link saved during the query just means one more sync)
+        # - id > _synced_id = Uses the primary key: usually finds 0 or a few rows
+        # - Links appear in number order (see _allocate()), so nothing is skipped
+
+    def rebuild_filter(self):
+        """Build the Bloom filter from every code in the store (at startup)"""
+        conn = self._connect()
+        marker = self.marker.read()
+        total = conn.execute('SELECT COUNT(*) FROM urls').fetchone()[0]
+        codes = ScalableBloomFilter(initial_capacity=max(2 * total, 10000))
+        last = 0
+        for number, code in conn.execute('SELECT id, code FROM urls ORDER BY id'):
+            codes.add(code)
+            last = number
+        with self._sync_lock:
+            self.codes = codes
+            self._synced_id = last
+            self._seen_marker = marker
+        # Explanation:
+        # - Room for twice the current links before the filter has to grow
+        # - The rows are read one at a time (not all into a list)
+        # - Links added while we read are picked up by the next sync
+
+    def count(self):
+        """Return how many links are saved"""
+        return self._connect().execute('SELECT COUNT(*) FROM urls').fetchone()[0]
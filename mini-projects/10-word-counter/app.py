@@ -4,12 +4,17 @@
 # Step 1: Import Flask
 # What is this? We're importing Flask
 # Think of it like: "Get Flask tools"
-from flask import Flask, render_template, request
+from flask import Flask, jsonify, render_template, request
+from text_stats import analyze_stream, analyze_text
+from keywords import MAX_TOP, analyze_keywords, analyze_keywords_stream
 # Explanation:
 # - Flask = The main Flask class
 # - render_template = Function to display HTML templates
 # - request = Object that contains form data
 # - We'll use request to get the text from the form
+# - analyze_text, analyze_stream = Count everything in one pass (text_stats.py)
+# - jsonify = Function to create JSON responses (for the /api/analyze route)
+# - analyze_keywords = Top words, bigrams and trigrams (keywords.py)
 
 # Step 2: Create the Flask Application
 # What is this? We're creating our web application
@@ -185,6 +190,10 @@ def count_paragraphs(text):
     # - if paragraphs else 1 = If no paragraphs, return 1
     # - At least one paragraph exists if text is not empty
 
+# Note: The count_*() functions above are the simple way to do it: each one
+# reads the whole text. The /count route uses text_stats.py instead, which
+# gets every number in a single pass and also works on huge uploaded files.
+
 # Step 7: Create Home Route (GET)
 # What is this? The main page that shows the word counter form
 # Think of it like: "When someone visits the home page, show the form"
@@ -224,75 +233,50 @@ def count():
     This function runs when the form is submitted
     It counts words, characters, sentences, and paragraphs
     """
-    # Step 9: Get Text from Form
-    # What is this? Getting the text the user entered
+    # Step 9: Get Text from Form (or an Uploaded File)
+    # What is this? Getting the text the user entered or uploaded
+    upload = request.files.get('file')
     text = request.form.get('text', '').strip()
     # Explanation:
+    # - request.files.get('file') = The uploaded .txt file (if any)
     # - request.form.get('text', '') = Gets value of textarea named 'text'
     # - If 'text' doesn't exist, returns empty string ''
     # - .strip() = Removes whitespace from beginning and end
     # - text = Variable to hold the user's text
     # - Example: User enters "Hello world" → text = "Hello world"
     
-    # Step 10: Initialize Statistics Dictionary
-    # What is this? Creating dictionary to store all counts
-    stats = {}
-    # Explanation:
-    # - stats = Empty dictionary
-    # - We'll store all statistics here
-    # - Will contain: words, characters, sentences, paragraphs
-    
-    # Step 11: Count Words
-    # What is this? Counting words in the text
-    if text:
-        # Explanation:
-        # - if text = If text is not empty
-        # - Only count if user entered something
-        
-        stats['words'] = count_words(text)
+    # Step 10: Count Everything in One Pass
+    # What is this? Getting all the statistics at once
+    if upload and upload.filename:
+        stats = analyze_stream(upload.stream)
+        stats['filename'] = upload.filename
+        stats['text'] = ''
         # Explanation:
-        # - Calls our count_words() function
-        # - stats['words'] = Stores word count in dictionary
-        # - Example: "Hello world" → stats['words'] = 2
-        
-        stats['characters_with_spaces'] = count_characters(text, include_spaces=True)
-        # Explanation:
-        # - Calls count_characters() with include_spaces=True
-        # - stats['characters_with_spaces'] = Character count including spaces
-        # - Example: "Hello world" → 11 characters (includes space)
-        
-        stats['characters_without_spaces'] = count_characters(text, include_spaces=False)
-        # Explanation:
-        # - Calls count_characters() with include_spaces=False
-        # - stats['characters_without_spaces'] = Character count excluding spaces
-        # - Example: "Hello world" → 10 characters (no space)
-        
-        stats['sentences'] = count_sentences(text)
-        # Explanation:
-        # - Calls our count_sentences() function
-        # - stats['sentences'] = Number of sentences
-        # - Example: "Hello. World!" → 2 sentences
-        
-        stats['paragraphs'] = count_paragraphs(text)
-        # Explanation:
-        # - Calls our count_paragraphs() function
-        # - stats['paragraphs'] = Number of paragraphs
-        # - Example: "Para 1\n\nPara 2" → 2 paragraphs
-        
+        # - upload.stream = The file, read 1 MB at a time
+        # - Big uploads are kept in a temporary file by Flask, not in memory
+        # - A 500 MB file works, and memory use stays about the same
+        # - We don't send the file's text back to the page
+    elif text:
+        stats = analyze_text(text)
         stats['text'] = text
         # Explanation:
+        # - analyze_text() = Counts words, characters, sentences and
+        #   paragraphs together, looking at each character once
         # - Stores original text in stats
         # - So we can display it in the template
         # - Keeps the text after form submission
     else:
-        # Explanation:
-        # - else = If text is empty
-        
         stats = None
         # Explanation:
         # - stats = None (no statistics)
         # - Will show message to enter text
     
+    # Step 11: Empty File?
+    if stats and not stats['words']:
+        stats = None
+        # Explanation:
+        # - A file with only whitespace has nothing to count
+    
     # Step 12: Render Template with Statistics
     # What is this? Showing the results to the user
     return render_template('index.html', stats=stats)
@@ -304,7 +288,62 @@ def count():
     # - The second stats = The actual statistics dictionary from Python
     # - In the template, we can use stats to display results
 
-# Step 13: Run the Application
+# Step 13: Create Keyword Analysis API Route
+# What is this? A JSON API with the most common words, bigrams and trigrams
+# Think of it like: "Which words and phrases does this text use most?"
+@app.route('/api/analyze', methods=['POST'])
+# Explanation:
+# - Send JSON: {"text": "...", "top": 10, "stopwords": true}
+# - Or a form with 'text', or an uploaded 'file' (like the /count form)
+# - top and stopwords can also be in the URL: /api/analyze?top=20&stopwords=0
+
+def api_analyze():
+    """
+    This function returns the top-N words, bigrams and trigrams as JSON
+    """
+    # Step 14: Read the Options
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        data = {}
+    options = {**request.args, **request.form, **data}
+    top = options.get('top', 10)
+    stopwords = str(options.get('stopwords', True)).lower() not in ('0', 'false', 'no')
+    # Explanation:
+    # - get_json(silent=True) = The JSON body, or None if it isn't JSON
+    # - Not a JSON object (like a list)? Ignore it
+    # - options = URL values, then form values, then JSON values (last one wins)
+    # - stopwords = Skip "the", "and", ... (on unless it's 0/false/no)
+
+    try:
+        top = int(top)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'top must be a number'}), 400
+    top = max(1, min(top, MAX_TOP))
+    # Explanation:
+    # - top = How many terms per table, between 1 and MAX_TOP (100)
+
+    # Step 15: Analyze the Text (or the Uploaded File)
+    upload = request.files.get('file')
+    text = data.get('text') if data else request.form.get('text')
+    if upload and upload.filename:
+        result = analyze_keywords_stream(upload.stream, top=top, stopwords=stopwords)
+        result['filename'] = upload.filename
+    elif isinstance(text, str) and text.strip():
+        result = analyze_keywords(text, top=top, stopwords=stopwords)
+    else:
+        return jsonify({'error': 'Text is required'}), 400
+    # Explanation:
+    # - A big text is split into ~1 MB chunks, counted in several
+    #   processes at once, and the counts are added together
+    # - No text? 400 = Bad Request
+
+    return jsonify(result)
+    # Explanation:
+    # - {"total_words": ..., "unique_words": ...,
+    #    "words": [{"term": "flask", "count": 12}, ...],
+    #    "bigrams": [...], "trigrams": [...]}
+
+# Step 16: Run the Application
 # What is this? This starts the web server
 # Think of it like: "Turn on the website so people can visit it"
 if __name__ == '__main__':
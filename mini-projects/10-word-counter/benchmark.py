@@ -0,0 +1,162 @@
+# Word Counter Benchmark
+# This script measures how fast each way of counting text is!
+
+# Step 1: Import the Tools We Need
+# What is this? We're importing Python tools for timing and fake text
+# Think of it like: "Get a stopwatch and a very long book"
+import argparse
+import io
+import json
+import random
+import time
+import app
+import text_stats
+# Explanation:
+# - argparse = Reads command-line options (like --sizes 1KB 1MB)
+# - io.BytesIO = Pretends a bytes object is an uploaded file
+# - random = Makes up text (always the same text for the same --seed)
+# - app = The original count_*() functions
+# - text_stats = The single-pass analyzer (with and without NumPy)
+
+# How to use:
+#   python benchmark.py                       # 1 KB, 1 MB and 100 MB
+#   python benchmark.py --sizes 1KB 10MB
+#   python benchmark.py --json results.json
+#
+# The NumPy row needs NumPy installed: pip install numpy
+
+SIZES = {'KB': 1024, 'MB': 1024 * 1024, 'GB': 1024 * 1024 * 1024}
+WORDS = ('the quick brown fox jumps over lazy dog café naïve résumé data '
+         'science flask python counts every word sentence and paragraph').split()
+
+
+# Step 2: Make Up Some Text
+# What is this? Realistic-looking text of (about) the size we want
+def sample_text(size, seed=42):
+    """Return about `size` bytes of UTF-8 text with sentences and paragraphs"""
+    rng = random.Random(seed)
+    sentences = []
+    for _ in range(200):
+        words = rng.choices(WORDS, k=rng.randint(4, 16))
+        sentences.append(' '.join(words).capitalize() + rng.choice('..!?'))
+    paragraphs = [' '.join(rng.choices(sentences, k=rng.randint(2, 6))) for _ in range(50)]
+    block = '\n\n'.join(paragraphs) + '\n\n'
+    data = block.encode() * (size // len(block.encode()) + 1)
+    return data[:size].decode(errors='ignore')
+    # Explanation:
+    # - 200 random sentences → 50 random paragraphs → repeated to the size
+    # - errors='ignore' = Don't keep half an "é" at the cut
+
+
+def parse_size(text):
+    """'1MB' → 1048576"""
+    for unit, factor in SIZES.items():
+        if text.upper().endswith(unit):
+            return int(float(text[:-len(unit)]) * factor)
+    return int(text)
+
+
+# Step 3: The Ways of Counting We Compare
+def count_functions(text, data):
+    """The original app: four separate count_*() functions"""
+    text = text.strip()
+    return {
+        'words': app.count_words(text),
+        'characters_with_spaces': app.count_characters(text, include_spaces=True),
+        'characters_without_spaces': app.count_characters(text, include_spaces=False),
+        'sentences': app.count_sentences(text),
+        'paragraphs': app.count_paragraphs(text),
+    }
+
+
+def single_pass_text(text, data):
+    """TextAnalyzer.feed(): one pass over the text, plain Python"""
+    return text_stats.analyze_text(text)
+
+
+def single_pass_bytes_python(data_text, data):
+    """analyze_stream() with NumPy switched off (decode, then feed())"""
+    numpy, text_stats.np = text_stats.np, None
+    try:
+        return text_stats.analyze_stream(io.BytesIO(data))
+    finally:
+        text_stats.np = numpy
+
+
+def single_pass_bytes_numpy(text, data):
+    """analyze_stream() with NumPy: counts the UTF-8 bytes directly"""
+    return text_stats.analyze_stream(io.BytesIO(data))
+
+
+METHODS = {
+    'count_*() functions': count_functions,
+    'single pass (text)': single_pass_text,
+    'single pass (bytes, python)': single_pass_bytes_python,
+    'single pass (bytes, numpy)': single_pass_bytes_numpy,
+}
+# Explanation:
+# - Every method gets the same text (as str and as UTF-8 bytes)
+# - They must all return the same numbers (checked below)
+
+
+# Step 4: Time One Method
+def best_time(method, text, data, min_seconds=0.5, max_repeats=1000):
+    """Return (fastest run in seconds, result)"""
+    best = float('inf')
+    started = time.perf_counter()
+    for _ in range(max_repeats):
+        begin = time.perf_counter()
+        result = method(text, data)
+        best = min(best, time.perf_counter() - begin)
+        if time.perf_counter() - started >= min_seconds:
+            break
+    return best, result
+    # Explanation:
+    # - Small inputs run many times (a single run is too short to time)
+    # - The fastest run is the least disturbed by other programs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the word counter')
+    parser.add_argument('--sizes', nargs='+', default=['1KB', '1MB', '100MB'])
+    parser.add_argument('--methods', nargs='+', choices=list(METHODS), default=list(METHODS))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args(argv)
+
+    methods = list(args.methods)
+    if text_stats.np is None and 'single pass (bytes, numpy)' in methods:
+        print('NumPy is not installed (pip install numpy); skipping that method')
+        methods.remove('single pass (bytes, numpy)')
+
+    header = f"{'size':>7} {'method':<28} {'seconds':>10} {'MB/s':>9} {'speedup':>8}"
+    print(header)
+    print('-' * len(header))
+    results = []
+    for size_name in args.sizes:
+        text = sample_text(parse_size(size_name), args.seed)
+        data = text.encode()
+        baseline = expected = None
+        for name in methods:
+            seconds, result = best_time(METHODS[name], text, data)
+            if expected is None:
+                expected = result
+            elif result != expected:
+                raise SystemExit(f'{name} gave {result}, expected {expected}')
+            baseline = baseline or seconds
+            results.append({'size': size_name, 'bytes': len(data), 'method': name,
+                            'seconds': seconds, 'speedup': baseline / seconds})
+            print(f"{size_name:>7} {name:<28} {seconds:>10.5f} "
+                  f"{len(data) / seconds / 1e6:>9.1f} {baseline / seconds:>7.1f}x")
+        # Explanation:
+        # - speedup = How many times faster than the first method
+        # - Any method giving different numbers stops the benchmark
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'settings': vars(args), 'results': results}, f, indent=2)
+    return results
+
+
+if __name__ == '__main__':
+    main()
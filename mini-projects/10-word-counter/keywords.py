@@ -0,0 +1,301 @@
+# Keyword Analysis
+# This module finds the most common words, bigrams and trigrams in a text!
+
+# Step 1: Import the Tools We Need
+# What is this? Tools for counting, ranking and using every CPU core
+# Think of it like: "Tally marks for every word, then pick the top 10"
+import codecs
+import heapq
+import itertools
+import multiprocessing
+import os
+import re
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+# Explanation:
+# - Counter = A dictionary that counts things (a hash table: word → count)
+# - heapq = Picks the top 10 without sorting every word
+# - itertools = Tools for looping (peek at the first chunks, then go on)
+# - ProcessPoolExecutor = Runs work in other processes (other CPU cores)
+# - codecs = Decodes an uploaded file piece by piece (UTF-8)
+
+CHUNK_SIZE = 1024 * 1024
+WORKERS = os.cpu_count() or 1
+MAX_TOP = 100
+# Explanation:
+# - CHUNK_SIZE = Each process counts about 1 MB of text at a time
+# - WORKERS = How many processes to use (one per CPU core)
+# - MAX_TOP = The most results we return per table
+
+_TOKEN = re.compile(r"(\w+(?:['’]\w+)*)|[.!?]|\n\s*\n")
+# Explanation:
+# - A word: letters/digits, with apostrophes inside ("don't" is one word)
+# - Or a sentence end (. ! ?) or a blank line
+# - Because of the ( ), findall() gives '' for a sentence end or blank line:
+#   "Hi there. Bye" → ['hi', 'there', '', 'bye']
+# - An n-gram never crosses a '' (so "there bye" is not a bigram)
+
+STOPWORDS = frozenset('''
+    a about after all also am an and any are as at be been being but by can
+    could did do does doing for from had has have having he her here hers him
+    his how i if in into is it its just me more most my no nor not of off on
+    once only or other our ours out over own same she should so some such than
+    that the their theirs them then there these they this those through to too
+    under until up very was we were what when where which while who whom why
+    will with would you your yours
+'''.split())
+# Explanation:
+# - Very common words that say nothing about what a text is about
+# - Skipped by default (?stopwords=0 keeps them)
+
+_BREAK = frozenset([''])
+_SKIP = STOPWORDS | _BREAK
+
+# How to use:
+#   result = analyze_keywords(text, top=10)
+#   result['words']     # [{'term': 'flask', 'count': 12}, ...]
+#   result['bigrams']   # [{'term': 'web app', 'count': 5}, ...]
+#   result['trigrams']  # [{'term': 'flask web app', 'count': 3}, ...]
+#
+# Big texts are cut into ~1 MB chunks (at the end of a sentence if there is
+# one, so no n-gram is cut in half). Each chunk is counted in another process,
+# and the counts are added together.
+
+
+# Step 2: Count One Chunk
+# What is this? The work each process does
+def count_terms(text, stopwords=True, carried=0):
+    """
+    Count the words, bigrams and trigrams in one chunk of text
+
+    Args:
+    - carried: How many tokens at the start were already counted
+      (the end of the previous chunk, see split_chunks())
+
+    Returns:
+    - (tokens, words, bigrams, trigrams): the number of words, then three Counters
+    """
+    tokens = _TOKEN.findall(text.lower())
+    skip = _SKIP if stopwords else _BREAK
+    new = tokens[carried:]
+    pairs = tokens[max(carried - 1, 0):]
+    triples = tokens[max(carried - 2, 0):]
+    # Explanation:
+    # - tokens = Every word (and '' for each sentence end), in order
+    # - skip = What can't start or end a term
+    # - new = The tokens no other chunk has counted
+    # - pairs, triples = Start one and two tokens earlier, so the n-grams
+    #   ENDING in the new tokens are counted (the ones before were counted
+    #   with the previous chunk)
+
+    words = Counter(token for token in new if token not in skip)
+    bigrams = Counter(f'{a} {b}' for a, b in zip(pairs, pairs[1:])
+                      if a not in skip and b not in skip)
+    trigrams = Counter(f'{a} {b} {c}' for a, b, c in zip(triples, triples[1:], triples[2:])
+                       if a not in skip and c not in skip and b)
+    # Explanation:
+    # - zip(pairs, pairs[1:]) = Each word with the next one
+    # - Counter(...) = Adds 1 for each term (one hash table lookup)
+    # - A trigram may have a stopword in the middle ("point of view")
+    #   but never a sentence end (b must not be '')
+
+    return len(new) - new.count(''), words, bigrams, trigrams
+
+
+# Step 3: Cut Text into Chunks at Sentence Ends
+# What is this? Making sure no n-gram is split between two processes
+def _boundary(text):
+    """
+    Return (cut, start, carried): the chunk is text[:cut], the next chunk
+    starts at text[start:], and its first `carried` tokens are counted already
+    """
+    cut = max(text.rfind('.'), text.rfind('!'), text.rfind('?')) + 1
+    blank = text.rfind('\n\n')
+    if blank >= 0:
+        cut = max(cut, blank + 2)
+    if cut > 0:
+        return cut, cut, 0
+    # Explanation:
+    # - rfind() = Searches from the end (fast, in C); -1 if not found
+    # - No n-gram crosses a sentence end, so nothing is carried over
+    # - No sentence end at all? Cut at the last space instead (below)
+
+    cut = start = 0
+    for index in range(len(text) - 1, -1, -1):
+        if text[index].isspace():
+            cut = start = index + 1
+            break
+    carried = 0
+    while carried < 2 and start > 0:
+        end = start
+        while start > 0 and text[start - 1].isspace():
+            start -= 1
+        while start > 0 and not text[start - 1].isspace():
+            start -= 1
+        carried += len(_TOKEN.findall(text[start:end].lower()))
+    return cut, start, carried
+    # Explanation:
+    # - Only for 1 MB without a single '.', '!', '?' or blank line
+    # - A bigram or trigram can cross the cut ("machine | learning"), so the
+    #   last two words are sent again at the start of the next chunk
+    # - The next chunk skips them when counting words (they are counted
+    #   already) but uses them to make the n-grams across the cut
+    # - start = 0 means "not enough words to cut yet" (like one giant word)
+
+
+def split_chunks(pieces, chunk_size=CHUNK_SIZE):
+    """
+    Turn pieces of text into chunks that end at a sentence end (or a space)
+
+    Args:
+    - pieces: Strings of any size (like the decoded parts of a file)
+    - chunk_size: About how big each chunk should be
+    """
+    carry = ''
+    carried = 0
+    for piece in pieces:
+        carry += piece
+        if len(carry) < chunk_size:
+            continue
+        cut, start, next_carried = _boundary(carry)
+        if start == 0:
+            continue
+        yield carry[:cut], carried
+        carry, carried = carry[start:], next_carried
+    if carry:
+        yield carry, carried
+    # Explanation:
+    # - Yields (chunk, carried): carried = tokens at the start of the chunk
+    #   that the previous chunk already counted (see count_terms())
+    # - carry = The unfinished sentence at the end of the last chunk
+    # - It goes in front of the next piece, so the sentence stays whole
+
+
+def _text_pieces(text, chunk_size):
+    for start in range(0, len(text), chunk_size):
+        yield text[start:start + chunk_size]
+
+
+def _stream_pieces(stream, chunk_size):
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    while True:
+        data = stream.read(chunk_size)
+        if not data:
+            break
+        yield decoder.decode(data)
+    yield decoder.decode(b'', final=True)
+    # Explanation:
+    # - The decoder keeps half a character ("é" is 2 bytes) for the next read
+    # - errors='replace' = Bytes that aren't UTF-8 become '�'
+
+
+# Step 4: Count Chunks in a Process Pool
+# What is this? One pool of worker processes, shared by all requests
+_pool = None
+
+
+def get_pool(workers=WORKERS):
+    """Return the process pool (created the first time it's needed)"""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=workers,
+                                    mp_context=multiprocessing.get_context('spawn'))
+    return _pool
+    # Explanation:
+    # - Starting processes is slow, so we start them once and keep them
+    # - 'spawn' = Start fresh processes (safe inside a web server with threads)
+
+
+def count_chunks(chunks, stopwords=True, workers=WORKERS):
+    """
+    Count every chunk and add the counts together
+
+    Args:
+    - chunks: (chunk, carried) pairs from split_chunks()
+
+    Returns:
+    - (tokens, words, bigrams, trigrams) for all the chunks
+    """
+    tokens, words, bigrams, trigrams = 0, Counter(), Counter(), Counter()
+
+    def merge(partial):
+        nonlocal tokens
+        tokens += partial[0]
+        words.update(partial[1])
+        bigrams.update(partial[2])
+        trigrams.update(partial[3])
+    # Explanation:
+    # - Counter.update() = ADDS the counts ("data": 3 + "data": 4 = 7)
+
+    chunks = iter(chunks)
+    first_two = list(itertools.islice(chunks, 2))
+    chunks = itertools.chain(first_two, chunks)
+    if len(first_two) < 2 or workers < 2:
+        for chunk, carried in chunks:
+            merge(count_terms(chunk, stopwords, carried))
+        return tokens, words, bigrams, trigrams
+    # Explanation:
+    # - Only one chunk (a short text)? Counting it here is faster
+    #   than sending it to another process
+    # - Only one CPU core? Other processes wouldn't be any faster
+
+    pool = get_pool(workers)
+    pending = deque()
+    for chunk, carried in chunks:
+        pending.append(pool.submit(count_terms, chunk, stopwords, carried))
+        if len(pending) >= 2 * workers:
+            merge(pending.popleft().result())
+    while pending:
+        merge(pending.popleft().result())
+    return tokens, words, bigrams, trigrams
+    # Explanation:
+    # - pool.submit() = "Count this chunk in a free process" (doesn't wait)
+    # - At most 2 chunks per worker are waiting, so a huge file
+    #   is never all in memory at once
+    # - .result() = Wait for that chunk's counts, then add them
+
+
+# Step 5: Pick the Top Terms
+# What is this? The most common terms, without sorting all of them
+def top_terms(counter, top=10):
+    """Return the `top` most common terms as [{'term': ..., 'count': ...}]"""
+    best = heapq.nsmallest(top, counter.items(), key=lambda item: (-item[1], item[0]))
+    return [{'term': term, 'count': count} for term, count in best]
+    # Explanation:
+    # - heapq keeps only the best `top` terms while it looks at all of them
+    # - Sorting 1,000,000 terms to keep 10 would be much more work
+    # - Same count? Alphabetical order, so the answer is always the same
+
+
+# Step 6: Helpers for Strings and Files
+# What is this? Everything above, in one call
+def _result(counts, top):
+    tokens, words, bigrams, trigrams = counts
+    return {
+        'total_words': tokens,
+        'unique_words': len(words),
+        'words': top_terms(words, top),
+        'bigrams': top_terms(bigrams, top),
+        'trigrams': top_terms(trigrams, top),
+    }
+
+
+def analyze_keywords(text, top=10, stopwords=True, workers=WORKERS, chunk_size=CHUNK_SIZE):
+    """Return the top words, bigrams and trigrams of a string"""
+    chunks = split_chunks(_text_pieces(text, chunk_size), chunk_size)
+    return _result(count_chunks(chunks, stopwords, workers), top)
+
+
+def analyze_keywords_stream(stream, top=10, stopwords=True, workers=WORKERS,
+                            chunk_size=CHUNK_SIZE):
+    """
+    Return the top words, bigrams and trigrams of a UTF-8 file (like an upload)
+
+    Args:
+    - stream: Anything with .read(size) that returns bytes
+    """
+    chunks = split_chunks(_stream_pieces(stream, chunk_size), chunk_size)
+    return _result(count_chunks(chunks, stopwords, workers), top)
+    # Explanation:
+    # - The file is read, cut and counted one chunk at a time
+    # - unique_words = How many different words (without stopwords)
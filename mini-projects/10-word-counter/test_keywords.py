@@ -0,0 +1,51 @@
+# Tests for Keyword Analysis
+# Run with: python -m pytest test_keywords.py
+
+import random
+
+import pytest
+
+from keywords import _text_pieces, count_chunks, count_terms, split_chunks
+
+WORDS = ['data', 'science', 'machine', 'learning', 'web', 'app', 'the', 'of',
+         "don't", 'flask', 'python', 'well-known', 'café', 'a']
+
+
+def make_text(separators, length=3000, seed=1):
+    """Random words joined by the given separators"""
+    rng = random.Random(seed)
+    return ''.join(rng.choice(WORDS) + rng.choice(separators) for _ in range(length))
+
+
+def count_in_chunks(text, chunk_size, stopwords=True):
+    chunks = split_chunks(_text_pieces(text, chunk_size), chunk_size)
+    return count_chunks(chunks, stopwords, workers=1)
+
+
+@pytest.mark.parametrize('separators', [
+    [' '],
+    [' ', '\n', '  ', ', ', ' - '],
+    [' ', ' ', ' ', '. ', '! ', '\n\n', ', '],
+    [' ', '.', '\n \n', '?'],
+], ids=['spaces', 'no-punctuation', 'punctuation', 'odd-breaks'])
+@pytest.mark.parametrize('chunk_size', [7, 50, 333, 4096])
+@pytest.mark.parametrize('stopwords', [True, False])
+def test_chunked_counts_match_whole_text(separators, chunk_size, stopwords):
+    """Cutting the text into chunks never loses or repeats a term"""
+    text = make_text(separators)
+    assert count_in_chunks(text, chunk_size, stopwords) == count_terms(text, stopwords)
+
+
+def test_one_long_word():
+    """A word longer than a chunk is never cut in half"""
+    text = 'x' * 1000 + ' data science ' + 'y' * 1000
+    assert count_in_chunks(text, 64) == count_terms(text)
+
+
+def test_carried_tokens_are_not_counted_again():
+    """The carried words only make the n-grams across the cut"""
+    tokens, words, bigrams, trigrams = count_terms('machine learning python flask', carried=2)
+    assert tokens == 2
+    assert words == {'python': 1, 'flask': 1}
+    assert bigrams == {'learning python': 1, 'python flask': 1}
+    assert trigrams == {'machine learning python': 1, 'learning python flask': 1}
@@ -0,0 +1,377 @@
+# Text Statistics
+# This module counts words, characters, sentences and paragraphs in ONE pass!
+
+# Step 1: Import the Tools We Need
+# What is this? Tools for pattern matching and reading text in pieces
+# Think of it like: "Read a long book one page at a time, counting as you go"
+import re
+# Explanation:
+# - re = Finds paragraph breaks (blank lines) inside a piece of text
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+# Explanation:
+# - numpy = Optional! Counts whole arrays of bytes at C speed
+# - Not installed? Everything still works, with plain Python (np = None)
+# - Install it with: pip install numpy
+
+CHUNK_SIZE = 1024 * 1024
+NUMPY_MIN_BYTES = 16 * 1024
+SENTENCE_ENDINGS = '.!?'
+# Explanation:
+# - CHUNK_SIZE = How much text we look at at a time (1 MB)
+# - NUMPY_MIN_BYTES = Smaller chunks are counted without NumPy
+# - SENTENCE_ENDINGS = Punctuation that ends a sentence
+
+_PARAGRAPH_BREAK = re.compile(r'\n\n\s*')
+# Explanation:
+# - Matches a blank line plus all the whitespace after it
+# - One match per gap between paragraphs, however many blank lines it has
+
+_WIDE_SPACES = {
+    0xC2: [b'\xc2\x85', b'\xc2\xa0'],
+    0xE1: [b'\xe1\x9a\x80'],
+    0xE2: [chr(code).encode() for code in [*range(0x2000, 0x200B), 0x2028, 0x2029, 0x202F, 0x205F]],
+    0xE3: [b'\xe3\x80\x80'],
+}
+# Explanation:
+# - In UTF-8, most characters are 1 byte; "é" is 2 bytes, "€" is 3
+# - These are the UTF-8 bytes of the non-ASCII spaces Python's split()
+#   also splits on (like the no-break space U+00A0), by first byte
+
+if np is not None:
+    _WHITESPACE_BYTES = np.zeros(256, dtype=bool)
+    _WHITESPACE_BYTES[[0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x1C, 0x1D, 0x1E, 0x1F, 0x20]] = True
+    _SENTENCE_BYTES = list(SENTENCE_ENDINGS.encode())
+    # Explanation:
+    # - _WHITESPACE_BYTES[byte] = True for ASCII whitespace (a lookup table)
+    # - _SENTENCE_BYTES = The byte values of '.', '!' and '?'
+
+# How to use:
+#   analyzer = TextAnalyzer()
+#   for chunk in pieces_of_text:
+#       analyzer.feed(chunk)
+#   stats = analyzer.stats()
+#
+# Or for a whole string: stats = analyze_text(text)
+#
+# Why? The count_*() functions in app.py each read the whole text again
+# (four times in total), and need all of it in memory. Here every piece is
+# looked at once and then thrown away, so a 500 MB file uses ~1 MB of memory.
+
+
+# Step 2: Create the Analyzer
+# What is this? An object that remembers the counts between pieces
+class TextAnalyzer:
+    """
+    Counts text statistics one chunk at a time
+
+    Gives the same numbers as the count_*() functions in app.py on the
+    stripped text, without ever holding the whole text.
+    """
+
+    def __init__(self):
+        self.words = 0
+        self.characters = 0
+        self.spaces = 0
+        self.sentence_marks = 0
+        self.paragraph_breaks = 0
+        self._started = False
+        self._gap = ''
+        self._gap_length = 0
+        self._gap_spaces = 0
+        self._gap_has_break = False
+        self._pending = b''
+        # Explanation:
+        # - words, characters, ... = Running totals
+        # - _started = Have we seen any non-whitespace yet?
+        #   (whitespace at the very start is ignored, like .strip())
+        # - _gap = Whitespace at the end of what we've seen so far; it only
+        #   counts once more text follows (whitespace at the very end is
+        #   ignored too). Only its last character is kept.
+        # - _gap_has_break = Does that whitespace contain a blank line?
+        # - _pending = Bytes of a character split between two chunks
+
+    # Step 3: Feed One Chunk
+    # What is this? Update every count with the next piece of text
+    def feed(self, chunk):
+        """Add the next piece of text"""
+        content_end = len(chunk.rstrip())
+        if not content_end:
+            self._add_whitespace(chunk)
+            return
+        # Explanation:
+        # - A chunk with only whitespace just makes the gap longer
+
+        content_start = len(chunk) - len(chunk.lstrip())
+        head = chunk[:content_start]
+        tail = chunk[content_end:]
+        body = chunk[content_start:content_end]
+        # Explanation:
+        # - head = Whitespace at the start (continues the gap from before)
+        # - body = From the first to the last non-whitespace character
+        # - tail = Whitespace at the end (may be the end of the text)
+
+        self._add(head, tail,
+                  words=len(body.split()),
+                  characters=len(body),
+                  spaces=body.count(' '),
+                  sentence_marks=sum(body.count(mark) for mark in SENTENCE_ENDINGS),
+                  paragraph_breaks=len(_PARAGRAPH_BREAK.findall(body)))
+        # Explanation:
+        # - Each of these is one fast loop written in C
+        # - split() = Words are separated by any whitespace
+        # - findall = Gaps with a blank line inside the body
+
+    def _add(self, head, tail, words, characters, spaces, sentence_marks, paragraph_breaks):
+        """Add one chunk's counts (head + body + tail)"""
+        # Step 4: Close the Gap Before This Chunk
+        if not self._started:
+            self._started = True
+        elif self._gap or head:
+            self._extend_gap(head)
+            self.characters += self._gap_length
+            self.spaces += self._gap_spaces
+            if self._gap_has_break:
+                self.paragraph_breaks += 1
+        else:
+            self.words -= 1
+        # Explanation:
+        # - First text ever? Whitespace before it is ignored (like .strip())
+        # - More text came, so the gap is inside the text: count it
+        # - A gap with a blank line separates two paragraphs
+        # - No gap at all? The last word of the previous chunk continues
+        #   in this chunk ("hel" + "lo"), so don't count it twice
+
+        # Step 5: Add the Body's Counts
+        self.words += words
+        self.characters += characters
+        self.spaces += spaces
+        self.sentence_marks += sentence_marks
+        self.paragraph_breaks += paragraph_breaks
+
+        # Step 6: Start a New Gap
+        self._gap = ''
+        self._extend_gap(tail)
+
+    # Step 7: Feed Bytes (Fast Path)
+    # What is this? The same counts, straight from UTF-8 bytes, with NumPy
+    def feed_bytes(self, data, final=False):
+        """
+        Add the next piece of UTF-8 encoded text
+
+        Args:
+        - data: bytes (like a chunk of an uploaded file)
+        - final: True for the last piece
+        """
+        data = self._pending + data
+        self._pending = b''
+        if not final:
+            cut = _incomplete_tail(data)
+            data, self._pending = data[:cut], data[cut:]
+        # Explanation:
+        # - A character can be split between two pieces ("é" = 2 bytes)
+        # - Its first half waits in _pending for the rest
+
+        if not data:
+            return
+
+        use_numpy = np is not None and len(data) >= NUMPY_MIN_BYTES
+        characters = _character_count(data) if use_numpy else None
+        if characters is None:
+            self.feed(data.decode('utf-8', errors='replace'))
+            return
+        # Explanation:
+        # - No NumPy, a small chunk, or broken UTF-8? Decode to text and
+        #   use the normal path (NumPy's setup costs more than it saves
+        #   on a few KB)
+        # - errors='replace' = Bytes that aren't valid text become "�"
+
+        array = np.frombuffer(data, dtype=np.uint8)
+        whitespace = _whitespace_mask(array)
+        if characters != len(data):
+            _mark_wide_spaces(data, array, whitespace)
+        content_start = _first_false(whitespace)
+        if content_start is None:
+            self._add_whitespace(data.decode())
+            return
+        content_end = len(data) - _first_false(whitespace[::-1])
+        # Explanation:
+        # - whitespace = One True/False per byte, all worked out at once
+        # - Fewer characters than bytes? There are non-ASCII letters, and
+        #   maybe non-ASCII spaces too
+        # - content_start / content_end = First and last non-whitespace byte
+
+        head = data[:content_start].decode()
+        tail = data[content_end:].decode()
+        body = array[content_start:content_end]
+        text = ~whitespace[content_start:content_end]
+        # Explanation:
+        # - Same head / body / tail split as feed()
+        # - text = True where the body is NOT whitespace
+
+        self._add(head, tail,
+                  words=int(np.count_nonzero(text[1:] & ~text[:-1])) + 1,
+                  characters=characters - len(head) - len(tail),
+                  spaces=int(np.count_nonzero(body == 0x20)),
+                  sentence_marks=sum(int(np.count_nonzero(body == mark)) for mark in _SENTENCE_BYTES),
+                  paragraph_breaks=_count_breaks(body, text))
+        # Explanation:
+        # - words = Text right after whitespace starts a new word
+        #   (+ 1 for the word the body starts with)
+        # - characters = Counted while checking the UTF-8 (see below)
+        # - spaces = Bytes equal to 0x20 (the space character)
+
+    def _add_whitespace(self, whitespace):
+        """Add a chunk with nothing but whitespace"""
+        if self._started:
+            self._extend_gap(whitespace)
+
+    def _extend_gap(self, whitespace):
+        """Add whitespace to the gap at the end of the text"""
+        if not self._gap:
+            # A new gap: start counting from zero
+            self._gap_length = 0
+            self._gap_spaces = 0
+            self._gap_has_break = False
+        if not whitespace:
+            return
+        self._gap_has_break = (self._gap_has_break or '\n\n' in whitespace
+                               or (self._gap == '\n' and whitespace[0] == '\n'))
+        self._gap_length += len(whitespace)
+        self._gap_spaces += whitespace.count(' ')
+        self._gap = whitespace[-1]
+        # Explanation:
+        # - We keep the gap's length and number of spaces, not the gap itself
+        # - _gap = Its last character: "\n" at the end of one chunk and "\n"
+        #   at the start of the next make a blank line together
+
+    # Step 8: Get the Results
+    # What is this? The same stats dictionary the app always showed
+    def stats(self):
+        """
+        Return the statistics so far
+
+        Returns:
+        - Dictionary with words, characters_with_spaces,
+          characters_without_spaces, sentences and paragraphs
+        """
+        return {
+            'words': self.words,
+            'characters_with_spaces': self.characters,
+            'characters_without_spaces': self.characters - self.spaces,
+            'sentences': self.sentence_marks if self.sentence_marks > 0 else 1,
+            'paragraphs': self.paragraph_breaks + 1,
+        }
+        # Explanation:
+        # - Like count_sentences(): no punctuation still means 1 sentence
+        # - Paragraphs = Breaks between paragraphs + 1
+        # - The gap at the end is never counted (like .strip())
+
+
+# Step 9: Byte Helpers
+# What is this? Small NumPy helpers for feed_bytes()
+def _incomplete_tail(data):
+    """Return where an unfinished UTF-8 character at the end starts"""
+    for back in range(1, min(4, len(data)) + 1):
+        byte = data[-back]
+        if byte & 0xC0 != 0x80:
+            needed = 2 if byte >= 0xC0 else 1
+            needed += (byte >= 0xE0) + (byte >= 0xF0)
+            return len(data) - back if needed > back else len(data)
+    return len(data)
+    # Explanation:
+    # - Walk back to the first byte of the last character
+    # - Its value says how many bytes the character needs (1 to 4)
+
+
+def _character_count(data):
+    """Return how many characters the UTF-8 bytes hold (None if not valid UTF-8)"""
+    if data.isascii():
+        return len(data)
+    try:
+        return len(data.decode())
+    except UnicodeDecodeError:
+        return None
+    # Explanation:
+    # - isascii() = Very fast check for plain English text (1 byte each)
+    # - The fast path counts bytes, so it needs valid UTF-8 to give
+    #   the same numbers as the text path
+
+
+def _whitespace_mask(array):
+    """Return True for every ASCII whitespace byte"""
+    whitespace = array <= 0x20
+    controls = np.flatnonzero(array < 0x20)
+    whitespace[controls] = _WHITESPACE_BYTES[array[controls]]
+    return whitespace
+    # Explanation:
+    # - Every ASCII whitespace byte is <= 0x20 (the space)
+    # - The other bytes below 0x20 (rare control characters, plus tabs and
+    #   newlines) are checked in the lookup table
+
+
+def _first_false(mask):
+    """Return the position of the first False (None if all True)"""
+    position = int(np.argmin(mask))
+    return None if mask[position] else position
+
+
+def _mark_wide_spaces(data, array, whitespace):
+    """Mark the bytes of non-ASCII spaces as whitespace"""
+    for first_byte, sequences in _WIDE_SPACES.items():
+        for start in np.flatnonzero(array == first_byte):
+            for sequence in sequences:
+                if data.startswith(sequence, start):
+                    whitespace[start:start + len(sequence)] = True
+                    break
+    # Explanation:
+    # - Only bytes that START a non-ASCII space are checked one by one
+    # - Those are rare, so this loop is short
+
+
+def _count_breaks(body, text):
+    """Count the gaps inside `body` that contain a blank line"""
+    newlines = np.flatnonzero(body == 0x0A)
+    blank_lines = newlines[:-1][np.diff(newlines) == 1]
+    if not blank_lines.size:
+        return 0
+    text_between = np.logical_or.reduceat(text, blank_lines)[:-1]
+    return int(np.count_nonzero(text_between)) + 1
+    # Explanation:
+    # - blank_lines = Positions of "\n\n" (two newlines in a row)
+    # - text_between = Is there any text from one blank line to the next?
+    # - No text between them? They are in the same gap: count it once
+
+
+# Step 10: Helpers for Strings and Files
+# What is this? Feeding a whole string, or an uploaded file, chunk by chunk
+def analyze_text(text, chunk_size=CHUNK_SIZE):
+    """Return the stats dictionary for a string"""
+    analyzer = TextAnalyzer()
+    for start in range(0, len(text), chunk_size):
+        analyzer.feed(text[start:start + chunk_size])
+    return analyzer.stats()
+
+
+def analyze_stream(stream, chunk_size=CHUNK_SIZE):
+    """
+    Return the stats dictionary for a UTF-8 file (like an upload)
+
+    Args:
+    - stream: Anything with .read(size) that returns bytes
+    - chunk_size: Bytes to read at a time
+    """
+    analyzer = TextAnalyzer()
+    while True:
+        data = stream.read(chunk_size)
+        if not data:
+            break
+        analyzer.feed_bytes(data)
+    analyzer.feed_bytes(b'', final=True)
+    return analyzer.stats()
+    # Explanation:
+    # - Only one chunk is in memory at a time
+    # - With NumPy, the bytes are counted directly (no decoding to text)
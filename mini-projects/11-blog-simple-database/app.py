@@ -7,6 +7,8 @@
 from flask import Flask, render_template, request, redirect, url_for, flash
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
+from keyset_pagination import keyset_paginate
+from streaming_export import export_response, iter_query
 # Explanation:
 # - Flask = The main Flask class
 # - render_template = Function to display HTML templates
@@ -16,6 +18,8 @@ from datetime import datetime
 # - flash = Function to show messages to users
 # - SQLAlchemy = Database toolkit (helps us work with databases)
 # - datetime = Module for working with dates and times
+# - keyset_paginate = Shows posts one page at a time (keyset_pagination.py)
+# - export_response, iter_query = Download every post in one response (streaming_export.py)
 # - We'll use SQLAlchemy to store blog posts in a database!
 
 # Step 2: Create the Flask Application
@@ -78,6 +82,12 @@ class Post(db.Model):
     # - Table = Like a spreadsheet with rows and columns
     # - This table will store all our blog posts
     
+    __table_args__ = (db.Index('ix_posts_date_created_id', 'date_created', 'id'),)
+    # Explanation:
+    # - db.Index = A sorted lookup table the database keeps for us
+    # - (date_created, id) = The order the home page lists posts in
+    # - Lets every page of posts start right where the last one ended
+    
     # Step 7: Define Columns (Fields)
     # What is this? Defining what data each post will have
     # Think of it like: "What information does each post need?"
@@ -145,6 +155,13 @@ with app.app_context():
     # - If tables already exist, does nothing
     # - This builds the database structure
     # - Like creating an empty spreadsheet with column headers
+    
+    for index in Post.__table__.indexes:
+        index.create(db.engine, checkfirst=True)
+    # Explanation:
+    # - create_all() skips tables that already exist, so a database made
+    #   before the index was added would never get it
+    # - checkfirst=True = Only creates the index if it isn't there yet
 
 # Step 10: Create Home Route (GET)
 # What is this? The main page that shows all blog posts
@@ -160,26 +177,29 @@ def index():
     This function runs when someone visits the home page
     It shows all blog posts from the database
     """
-    # Step 11: Get All Posts from Database
-    # What is this? Fetching all blog posts from the database
-    posts = Post.query.order_by(Post.date_created.desc()).all()
+    # Step 11: Get One Page of Posts from Database
+    # What is this? Fetching the next 10 blog posts from the database
+    page = keyset_paginate(Post.query, [Post.date_created, Post.id],
+                           per_page=10, cursor=request.args.get('cursor'))
+    posts = page.items
     # Explanation:
     # - Post.query = Query object for Post model
-    # - .order_by(Post.date_created.desc()) = Sort by date, newest first
-    # - .desc() = Descending order (newest to oldest)
-    # - .all() = Get all posts (returns a list)
-    # - posts = List of all Post objects
-    # - This is like saying: "Get all posts, sorted by date, newest first"
+    # - [Post.date_created, Post.id] = Sort by date, newest first
+    #   (id breaks ties between posts created at the same moment)
+    # - cursor = Where the previous page stopped (from the URL)
+    # - Only 10 posts are loaded, not the whole table!
+    # - posts = List of Post objects on this page
     
     # Step 12: Render Template with Posts
-    # What is this? Showing the HTML page with all posts
-    return render_template('index.html', posts=posts)
+    # What is this? Showing the HTML page with this page of posts
+    return render_template('index.html', posts=posts, page=page)
     # Explanation:
     # - render_template = Function that displays HTML templates
     # - 'index.html' = The template file to display
     # - posts=posts = Passes the posts list to the template
     # - The first 'posts' = Variable name in the template
     # - The second posts = The actual posts list from Python
+    # - page=page = Used for the "Newer" and "Older" links
     # - In the template, we can use posts to display them
 
 # Step 13: Create Post Route (GET)
@@ -328,7 +348,37 @@ def create_post():
     # - 'create.html' = The template file with the form
     # - This shows the form to create a new post
 
-# Step 25: Run the Application
+# Step 25: Create Export Route (GET)
+# What is this? Download ALL posts in one response, instead of page by page
+# Think of it like: "Give me the whole blog, not one page at a time"
+@app.route('/export')
+def export():
+    """
+    Stream every post as NDJSON (default) or CSV
+    Example: /export?format=csv → posts.csv
+    Example: /export?after=40 → Posts with id 41 onwards (resume a broken download)
+    """
+    # Step 26: Get Export Settings from URL
+    export_format = request.args.get('format', 'ndjson')
+    after = request.args.get('after', type=int)
+    # Explanation:
+    # - format = 'ndjson' (one JSON object per line) or 'csv'; anything else
+    #   gets a 400 error
+    # - after = The last post id the client already has (None = from the start)
+    
+    # Step 27: Stream the Posts
+    columns = [Post.id, Post.title, Post.content, Post.date_created]
+    rows = iter_query(Post.query, Post.id, after=after, columns=columns)
+    return export_response(rows, [column.key for column in columns],
+                           export_format, 'posts', header=after is None)
+    # Explanation:
+    # - columns = What goes in the file (column.key = 'id', 'title', ...)
+    # - iter_query() = Reads posts in id order, 500 at a time
+    # - export_response() = Sends the posts while they are read
+    # - Memory does not grow with the number of posts
+    # - header=after is None = A resumed CSV has no second header line
+
+# Step 28: Run the Application
 # What is this? This starts the web server
 # Think of it like: "Turn on the website so people can visit it"
 if __name__ == '__main__':
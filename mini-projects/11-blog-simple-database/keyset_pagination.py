@@ -0,0 +1,181 @@
+# Keyset Pagination
+# This module pages through database queries without OFFSET!
+
+# Step 1: Import the Tools We Need
+# What is this? We're importing tools for cursors and SQL comparisons
+# Think of it like: "Get a bookmark so we can continue where we stopped"
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import tuple_
+# Explanation:
+# - base64 + json = Turn the bookmark (cursor) into a short URL-safe string
+# - datetime = Dates must be converted to text to go inside the cursor
+# - tuple_ = Builds SQL like (date_created, id) < ('2024-01-01', 42)
+
+# How to use (with Flask-SQLAlchemy):
+#   page = keyset_paginate(Post.query, [Post.date_created, Post.id],
+#                          per_page=10, cursor=request.args.get('cursor'))
+#   page.items        → The posts on this page
+#   page.next_cursor  → Put in the "Older" link: /?cursor=...
+#   page.prev_cursor  → Put in the "Newer" link
+#
+# Why not .offset()? OFFSET 10000 makes the database read and throw away
+# 10,000 rows. A cursor says "continue after THIS row", which an index
+# finds directly - page 1,000 is as fast as page 1.
+# Add an index on the columns (e.g. (date_created, id)) to make it so.
+
+
+# Step 2: Create the Page Object
+# What is this? One page of results plus the bookmarks around it
+class KeysetPage:
+    """
+    One page of a keyset-paginated query
+
+    Attributes:
+    - items: The rows on this page
+    - per_page: Rows per page
+    - next_cursor: Cursor for the next page (None = this is the last page)
+    - prev_cursor: Cursor for the previous page (None = this is the first page)
+    """
+
+    def __init__(self, items, per_page, next_cursor=None, prev_cursor=None):
+        self.items = items
+        self.per_page = per_page
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+
+# Step 3: Paginate a Query
+# What is this? The WHERE + ORDER BY + LIMIT that replaces .offset()
+def keyset_paginate(query, columns, per_page=10, cursor=None, descending=True):
+    """
+    Return one page of a SQLAlchemy query using a cursor
+
+    Args:
+    - query: A query (Post.query, Post.query.filter_by(...), ...)
+    - columns: Columns that give every row a unique place in the order,
+      most important first, e.g. [Post.date_created, Post.id]
+    - per_page: Rows per page
+    - cursor: A cursor from a previous page (None = first page)
+    - descending: True = Newest first (largest values first)
+
+    Returns:
+    - KeysetPage
+    """
+    direction, values = decode_cursor(cursor, len(columns))
+    backwards = direction == 'prev'
+    key = tuple_(*columns)
+    # Explanation:
+    # - direction = 'next' (older rows) or 'prev' (newer rows)
+    # - values = The sort values of the row we stopped at
+    # - The last column (like id) breaks ties between equal dates
+
+    if values is not None:
+        if descending != backwards:
+            query = query.filter(key < tuple_(*values))
+        else:
+            query = query.filter(key > tuple_(*values))
+    # Explanation:
+    # - Newest first, going forwards: rows that sort AFTER the bookmark,
+    #   which means (date_created, id) < (bookmark date, bookmark id)
+    # - Going backwards flips the comparison
+    # - The database uses the index to jump straight to the bookmark
+
+    ascending = backwards if descending else not backwards
+    query = query.order_by(*[column.asc() if ascending else column.desc()
+                             for column in columns])
+    rows = query.limit(per_page + 1).all()
+    # Explanation:
+    # - Going backwards we read in the opposite order, then flip the page
+    # - limit(per_page + 1) = One extra row tells us if there is more,
+    #   without counting the whole table
+
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backwards:
+        rows.reverse()
+    has_next = more if not backwards else True
+    has_prev = more if backwards else values is not None
+    return KeysetPage(
+        rows, per_page,
+        next_cursor=encode_cursor('next', _key_of(rows[-1], columns)) if rows and has_next else None,
+        prev_cursor=encode_cursor('prev', _key_of(rows[0], columns)) if rows and has_prev else None,
+    )
+    # Explanation:
+    # - Going forwards: the extra row means "there is a next page",
+    #   and we came from somewhere, so there is a previous page
+    # - Going backwards: the other way round
+    # - The cursors point at the last and first rows of THIS page
+
+
+# Step 4: Encode and Decode Cursors
+# What is this? Turning the bookmark into a string for the URL (and back)
+def encode_cursor(direction, values):
+    """Return an opaque, URL-safe cursor string"""
+    payload = json.dumps([direction, [_to_json(value) for value in values]],
+                         separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+    # Explanation:
+    # - "Opaque" = Clients just pass it back; they don't need to read it
+    # - rstrip('=') = Drop base64 padding, so the URL stays clean
+
+
+def decode_cursor(cursor, count):
+    """
+    Return (direction, values) from a cursor string
+
+    A missing or damaged cursor gives (None, None), i.e. the first page.
+
+    Args:
+    - cursor: The cursor from the URL (or None)
+    - count: How many sort columns there are (one value each)
+    """
+    if not cursor:
+        return None, None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        direction, values = json.loads(base64.urlsafe_b64decode(padded))
+        if (direction not in ('next', 'prev') or not isinstance(values, list)
+                or len(values) != count):
+            return None, None
+        return direction, [_from_json(value) for value in values]
+    except (ValueError, TypeError):
+        return None, None
+    # Explanation:
+    # - Someone edited the URL? Just show the first page instead of an error
+    # - Exactly one value per sort column, each a plain value or a date;
+    #   anything else (like a list) would make the database query fail
+
+
+def _key_of(row, columns):
+    """Return a row's values for the sort columns"""
+    return [getattr(row, column.key) for column in columns]
+
+
+def _to_json(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    return value
+    # Explanation:
+    # - JSON has no dates, so a date becomes {"dt": "2024-01-01T12:00:00"}
+
+
+def _from_json(value):
+    if isinstance(value, dict) and list(value) == ['dt'] and isinstance(value['dt'], str):
+        return datetime.fromisoformat(value['dt'])
+    if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+        return value
+    raise ValueError(f'not a cursor value: {value!r}')
+    # Explanation:
+    # - Only what _to_json() makes: text, numbers or {"dt": "..."}
+    # - bool is a kind of int in Python, but never a sort value here
+    # - ValueError = decode_cursor() gives the first page instead
@@ -0,0 +1,95 @@
+# Tests for Keyset Pagination
+# Run with: python -m pytest test_keyset_pagination.py
+
+import base64
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+
+from keyset_pagination import decode_cursor, encode_cursor, keyset_paginate
+
+db = SQLAlchemy()
+
+
+class Item(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    date_created = db.Column(db.DateTime, nullable=False)
+
+
+@pytest.fixture
+def test_app():
+    """An in-memory database with 25 items, one minute apart"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        start = datetime(2024, 1, 1)
+        db.session.add_all(Item(id=number, date_created=start + timedelta(minutes=number))
+                           for number in range(1, 26))
+        db.session.commit()
+        yield app
+
+
+def paginate(cursor=None):
+    return keyset_paginate(Item.query, [Item.date_created, Item.id],
+                           per_page=10, cursor=cursor)
+
+
+def make_cursor(payload):
+    """Encode any JSON the way encode_cursor() does (for tampering)"""
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+def test_pages_forwards_and_backwards(test_app):
+    """Older and Newer links walk through every item exactly once"""
+    first = paginate()
+    assert [item.id for item in first.items] == list(range(25, 15, -1))
+    assert not first.has_prev
+
+    second = paginate(first.next_cursor)
+    third = paginate(second.next_cursor)
+    assert [item.id for item in third.items] == list(range(5, 0, -1))
+    assert not third.has_next
+
+    back = paginate(third.prev_cursor)
+    assert [item.id for item in back.items] == [item.id for item in second.items]
+
+
+@pytest.mark.parametrize('payload', [
+    ['next', [[1], [2]]],
+    ['next', [{'dt': '2024-01-01T00:10:00'}]],
+    ['next', [{'dt': '2024-01-01T00:10:00'}, 10, 3]],
+    ['next', [{'dt': 5}, 10]],
+    ['next', [{'dt': 'yesterday'}, 10]],
+    ['next', [{'dt': '2024-01-01T00:10:00', 'x': 1}, 10]],
+    ['next', [{'when': '2024-01-01T00:10:00'}, 10]],
+    ['next', [None, 10]],
+    ['next', [True, 10]],
+    ['next', 'abc'],
+    ['sideways', [{'dt': '2024-01-01T00:10:00'}, 10]],
+    {'next': []},
+    'next',
+])
+def test_tampered_cursor_gives_first_page(test_app, payload):
+    """A well-formed cursor with wrong values must not reach the database"""
+    cursor = make_cursor(payload)
+    assert decode_cursor(cursor, 2) == (None, None)
+    page = paginate(cursor)
+    assert [item.id for item in page.items] == list(range(25, 15, -1))
+
+
+@pytest.mark.parametrize('cursor', ['', 'not base64!', 'e30', '%%%', 'bnVsbA'])
+def test_damaged_cursor_gives_first_page(test_app, cursor):
+    """Garbage that isn't even JSON also shows the first page"""
+    assert decode_cursor(cursor, 2) == (None, None)
+    assert [item.id for item in paginate(cursor).items] == list(range(25, 15, -1))
+
+
+def test_cursor_round_trip():
+    """encode_cursor() output decodes back to the same values"""
+    values = [datetime(2024, 1, 1, 12, 30), 42]
+    assert decode_cursor(encode_cursor('prev', values), 2) == ('prev', values)
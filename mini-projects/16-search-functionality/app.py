@@ -4,12 +4,19 @@
 # Step 1: Import Flask
 # What is this? We're importing Flask
 # Think of it like: "Get Flask tools"
-from flask import Flask, render_template, request
+import os
+from flask import Flask, jsonify, render_template, request
+from search_backends import make_search_index, make_suggest_index
+from suggest_index import MAX_SUGGESTIONS
 # Explanation:
+# - os = Builds the path of the SQLite database file
 # - Flask = The main Flask class
 # - render_template = Function to display HTML templates
 # - request = Object that contains form data and query parameters
 # - We'll use request to get search queries
+# - jsonify = Converts Python data to a JSON response
+# - make_search_index = Creates the search backend (in search_backends.py)
+# - make_suggest_index = Creates the matching autocomplete index
 
 # Step 2: Create the Flask Application
 # What is this? We're creating our web application
@@ -20,20 +27,35 @@ app = Flask(__name__)
 # - Flask(__name__) = Creates a new Flask app
 # - __name__ = Tells Flask where to find files (current folder)
 
+app.config['SEARCH_BACKEND'] = 'memory'
+app.config['SEARCH_DATABASE'] = os.path.join(app.instance_path, 'search.sqlite3')
+# Explanation:
+# - 'SEARCH_BACKEND' = Where items and the search index live
+#   - 'memory' = Inverted index in this process (search_index.py)
+#   - 'sqlite' = SQLite file with an FTS5 full-text index (search_backends.py),
+#     for catalogues too big for memory
+# - 'SEARCH_DATABASE' = The SQLite file (in Flask's instance folder)
+# - Load a big catalogue with: python search_backends.py items.jsonl instance/search.sqlite3
+
+app.config.from_prefixed_env()
+# Explanation:
+# - Reads environment variables that start with FLASK_
+# - Example: FLASK_SEARCH_BACKEND=sqlite python app.py
+
 # Step 3: Create Sample Data
 # What is this? Creating a list of items to search through
 # Think of it like: "Create a list of items to search"
 sample_data = [
-    {'id': 1, 'title': 'Python Programming', 'category': 'Programming', 'description': 'Learn Python programming language'},
-    {'id': 2, 'title': 'Web Development', 'category': 'Web', 'description': 'Build websites with HTML, CSS, and JavaScript'},
-    {'id': 3, 'title': 'Data Science', 'category': 'Science', 'description': 'Analyze data with Python and machine learning'},
-    {'id': 4, 'title': 'Flask Framework', 'category': 'Programming', 'description': 'Build web applications with Flask'},
-    {'id': 5, 'title': 'JavaScript Basics', 'category': 'Programming', 'description': 'Learn JavaScript for web development'},
-    {'id': 6, 'title': 'Database Design', 'category': 'Database', 'description': 'Design and manage databases'},
-    {'id': 7, 'title': 'API Development', 'category': 'Web', 'description': 'Create RESTful APIs'},
-    {'id': 8, 'title': 'Machine Learning', 'category': 'Science', 'description': 'Introduction to machine learning algorithms'},
-    {'id': 9, 'title': 'SQL Queries', 'category': 'Database', 'description': 'Learn SQL for database queries'},
-    {'id': 10, 'title': 'React Framework', 'category': 'Web', 'description': 'Build user interfaces with React'}
+    {'id': 1, 'title': 'Python Programming', 'category': 'Programming', 'description': 'Learn Python programming language', 'popularity': 950},
+    {'id': 2, 'title': 'Web Development', 'category': 'Web', 'description': 'Build websites with HTML, CSS, and JavaScript', 'popularity': 870},
+    {'id': 3, 'title': 'Data Science', 'category': 'Science', 'description': 'Analyze data with Python and machine learning', 'popularity': 720},
+    {'id': 4, 'title': 'Flask Framework', 'category': 'Programming', 'description': 'Build web applications with Flask', 'popularity': 640},
+    {'id': 5, 'title': 'JavaScript Basics', 'category': 'Programming', 'description': 'Learn JavaScript for web development', 'popularity': 810},
+    {'id': 6, 'title': 'Database Design', 'category': 'Database', 'description': 'Design and manage databases', 'popularity': 300},
+    {'id': 7, 'title': 'API Development', 'category': 'Web', 'description': 'Create RESTful APIs', 'popularity': 560},
+    {'id': 8, 'title': 'Machine Learning', 'category': 'Science', 'description': 'Introduction to machine learning algorithms', 'popularity': 690},
+    {'id': 9, 'title': 'SQL Queries', 'category': 'Database', 'description': 'Learn SQL for database queries', 'popularity': 410},
+    {'id': 10, 'title': 'React Framework', 'category': 'Web', 'description': 'Build user interfaces with React', 'popularity': 530}
 ]
 # Explanation:
 # - sample_data = List of dictionaries
@@ -42,126 +64,91 @@ sample_data = [
 # - title = Item title
 # - category = Item category
 # - description = Item description
+# - popularity = How often people open this item (ranks suggestions)
 # - This is our "database" to search through
 # - In a real app, this would come from a database!
 
-# Step 4: Search Function
+RESULTS_PER_PAGE = 10
+MAX_LIMIT = 100
+# Explanation:
+# - RESULTS_PER_PAGE = Results shown when ?limit= is not given
+# - MAX_LIMIT = The most results one request can ask for
+
+# Step 4: Build the Search Index
+# What is this? An index of every word, built once when the app starts
+# Think of it like: "The index at the back of a book"
+search_index = make_search_index(app.config['SEARCH_BACKEND'],
+                                 app.config['SEARCH_DATABASE'], sample_data)
+suggest_index = make_suggest_index(search_index)
+# Explanation:
+# - make_search_index() = Our inverted index (or the SQLite backend)
+# - It maps every word to the items containing it
+# - Searching looks words up instead of reading every item
+# - The SQLite backend only loads sample_data into an empty database
+# - suggest_index = Sorted titles for type-ahead suggestions
+# - Built once here, then updated item by item (see Step 6)
+# - With the SQLite backend it queries the database instead, so startup
+#   never reads the whole catalogue into memory
+
+# Step 5: Search Function
 # What is this? Function to search through the data
 # Think of it like: "Find items that match the search query"
-def search_items(query, category_filter=None):
+def search_items(query, category_filter=None, limit=None, offset=0):
     """
     Search items by query and optional category filter
     
     Parameters:
     - query: Search query string
     - category_filter: Optional category to filter by
+    - limit: Maximum number of results (None = all)
+    - offset: Number of results to skip
     
     Returns:
-    - List of matching items
+    - List of matching items, best match first (.total = number of matches)
     """
-    # Step 5: Initialize Results List
-    # What is this? Creating a list to store search results
-    results = []
+    return search_index.search(query, category_filter, limit, offset)
     # Explanation:
-    # - results = Empty list to store matching items
-    # - [] = Empty list
-    # - We'll add matching items to this list
+    # - search_index.search() = Looks up each query word in the index
+    # - Every query word must appear in the title or description
+    # - A word also matches longer words ("web" finds "websites")
+    # - Results are ranked with BM25 (title matches count double)
+    # - Only the top offset + limit results are ever sorted (a heap)
+    # - No query = All items (or all items in the category)
+    # - Time depends on how many items match, not on the total number of items!
+
+# Step 6: Add and Delete Items
+# What is this? Keeping the data and the index in sync
+def add_item(item):
+    """
+    Add a new item (or replace one with the same id)
     
-    # Step 6: Normalize Search Query
-    # What is this? Making search case-insensitive
-    query_lower = query.lower() if query else ''
+    Parameters:
+    - item: Dictionary with id, title, category, description
+    """
+    delete_item(item['id'])
+    sample_data.append(item)
+    search_index.add(item)
+    suggest_index.add(item)
     # Explanation:
-    # - query.lower() = Converts query to lowercase
-    # - if query = Only convert if query exists
-    # - '' = Empty string if no query
-    # - query_lower = Lowercase version of query
-    # - This makes search case-insensitive (Python = python)
-    # - Example: "Python" → "python"
-    
-    # Step 7: Loop Through All Items
-    # What is this? Checking each item to see if it matches
-    for item in sample_data:
-        # Explanation:
-        # - for item in sample_data = Loop through each item
-        # - item = Current item being checked
-        # - Loops through all items in sample_data
-        
-        # Step 8: Check Category Filter
-        # What is this? Filtering by category if specified
-        if category_filter and item['category'].lower() != category_filter.lower():
-            # Explanation:
-            # - if category_filter = If a category filter was specified
-            # - item['category'].lower() = Item's category in lowercase
-            # - category_filter.lower() = Filter category in lowercase
-            # - != = Not equal operator
-            # - If categories don't match, skip this item
-            # - Only proceed if category matches (or no filter)
-            
-            continue
-            # Explanation:
-            # - continue = Skip to next item in loop
-            # - Don't check this item further
-            # - Move to next item
-        
-        # Step 9: Check if Query Matches
-        # What is this? Checking if search query matches item
-        if query_lower:
-            # Explanation:
-            # - if query_lower = If there's a search query
-            # - Only search if query exists
-            
-            # Step 10: Check Title Match
-            # What is this? Checking if query is in title
-            title_match = query_lower in item['title'].lower()
-            # Explanation:
-            # - query_lower in item['title'].lower() = Checks if query is in title
-            # - .lower() = Converts to lowercase for case-insensitive search
-            # - in = Checks if string contains substring
-            # - title_match = True if query found in title, False otherwise
-            # - Example: query="python", title="Python Programming" → True
-            
-            # Step 11: Check Description Match
-            # What is this? Checking if query is in description
-            description_match = query_lower in item['description'].lower()
-            # Explanation:
-            # - query_lower in item['description'].lower() = Checks if query is in description
-            # - .lower() = Converts to lowercase
-            # - description_match = True if query found in description, False otherwise
-            # - Example: query="web", description="Build websites" → True
-            
-            # Step 12: Check if Item Matches
-            # What is this? Item matches if query is in title OR description
-            if title_match or description_match:
-                # Explanation:
-                # - if title_match or description_match = If query found in title OR description
-                # - or = Logical OR operator
-                # - Item matches if query is anywhere in title or description
-                # - Only proceed if item matches
-                
-                results.append(item)
-                # Explanation:
-                # - results.append(item) = Adds item to results list
-                # - .append() = Method to add item to list
-                # - This item matches the search!
-        else:
-            # Explanation:
-            # - else = If there's no search query
-            # - Show all items (if no query, show everything)
-            
-            results.append(item)
-            # Explanation:
-            # - results.append(item) = Adds item to results list
-            # - If no query, include all items (or filtered by category)
+    # - search_index.add() = Indexes only this item's words
+    # - suggest_index.add() = Inserts the title at its sorted position
+    # - No need to rebuild the whole index!
+
+def delete_item(item_id):
+    """
+    Delete an item by id
     
-    # Step 13: Return Results
-    # What is this? Returning the list of matching items
-    return results
+    Parameters:
+    - item_id: The id of the item to delete
+    """
+    sample_data[:] = [item for item in sample_data if item['id'] != item_id]
+    search_index.remove(item_id)
+    suggest_index.remove(item_id)
     # Explanation:
-    # - return results = Returns the list of matching items
-    # - results = List of items that match the search
-    # - This is what we'll display to the user!
+    # - search_index.remove() = Removes only this item's words from the index
+    # - suggest_index.remove() = Removes the title from the suggestions
 
-# Step 14: Create Home Route (GET)
+# Step 7: Create Home Route (GET)
 # What is this? The main page that shows the search form
 # Think of it like: "When someone visits the home page, show the search form"
 @app.route('/')
@@ -175,7 +162,7 @@ def index():
     This function runs when someone visits the home page
     It shows the search form and search results
     """
-    # Step 15: Get Search Query from URL
+    # Step 8: Get Search Query from URL
     # What is this? Getting the search query from URL parameters
     query = request.args.get('q', '').strip()
     # Explanation:
@@ -188,7 +175,7 @@ def index():
     # - Example: /?q=python → query = "python"
     # - Example: /?q=web%20development → query = "web development"
     
-    # Step 16: Get Category Filter from URL
+    # Step 9: Get Category Filter from URL
     # What is this? Getting the category filter from URL parameters
     category_filter = request.args.get('category', '').strip()
     # Explanation:
@@ -200,44 +187,87 @@ def index():
     # - Example: /?category=Programming → category_filter = "Programming"
     # - If empty, no category filter
     
-    # Step 17: Get All Unique Categories
-    # What is this? Getting list of all categories for the filter dropdown
-    categories = sorted(set(item['category'] for item in sample_data))
+    # Step 10: Get Page Settings from URL
+    # What is this? How many results to show, and how many to skip
+    limit = min(max(request.args.get('limit', RESULTS_PER_PAGE, type=int), 1), MAX_LIMIT)
+    offset = max(request.args.get('offset', 0, type=int), 0)
     # Explanation:
-    # - item['category'] for item in sample_data = Gets all categories (list comprehension)
-    # - set() = Converts to set (removes duplicates)
-    # - sorted() = Sorts categories alphabetically
-    # - categories = List of unique categories
-    # - Example: ['Database', 'Programming', 'Science', 'Web']
-    # - This is for the category filter dropdown
+    # - type=int = Converts the value to a number (bad values use the default)
+    # - max(..., 1) and min(..., MAX_LIMIT) = Keep limit between 1 and 100
+    # - Example: /?q=web&limit=5&offset=5 → results 6 to 10
     
-    # Step 18: Perform Search
+    # Step 11: Perform Search
     # What is this? Searching for items that match the query
-    results = search_items(query, category_filter if category_filter else None)
+    results = search_items(query, category_filter if category_filter else None,
+                           limit=limit, offset=offset)
     # Explanation:
     # - search_items() = Our search function
     # - query = Search query string
     # - category_filter if category_filter else None = Category filter or None
-    # - results = List of matching items
+    # - limit, offset = Which page of results to return
+    # - results = List of matching items (results.total = all matches)
     # - If no query and no filter, returns all items
     
-    # Step 19: Render Template with Results
+    # Step 12: Get Category Counts (Facets)
+    # What is this? Every category, with how many results it has
+    categories = results.facets
+    # Explanation:
+    # - results.facets = Category → number of matches for this query
+    # - Kept up to date by the index (no need to loop over every item!)
+    # - Counted before the category filter, so you can see how many
+    #   results switching to another category would give
+    # - Example: {'Database': 0, 'Programming': 2, 'Science': 1, 'Web': 0}
+    # - This is for the category filter dropdown
+    
+    # Step 13: Render Template with Results
     # What is this? Showing the HTML page with search results
     return render_template('index.html', 
                          results=results, 
                          query=query, 
                          category_filter=category_filter,
-                         categories=categories)
+                         categories=categories,
+                         limit=limit,
+                         offset=offset)
     # Explanation:
     # - render_template = Function that displays HTML templates
     # - 'index.html' = The template file to display
     # - results=results = Passes search results to template
     # - query=query = Passes search query to template (to show in input)
     # - category_filter=category_filter = Passes category filter to template
-    # - categories=categories = Passes categories list to template (for dropdown)
+    # - categories=categories = Passes category counts to template (for dropdown)
+    # - limit, offset = Used for the Previous/Next links
     # - In the template, we can use these to display search form and results!
 
-# Step 20: Run the Application
+# Step 14: Create Suggest Route (API)
+# What is this? Type-ahead suggestions while the user is typing
+# Think of it like: "Finish the word for me"
+@app.route('/api/suggest')
+def suggest():
+    """
+    Return the most popular titles starting with what was typed
+    Example: /api/suggest?q=py → Python Programming
+    """
+    # Step 15: Get the Prefix and Limit
+    prefix = request.args.get('q', '')
+    limit = min(max(request.args.get('limit', 8, type=int), 1), MAX_SUGGESTIONS)
+    # Explanation:
+    # - q = What the user typed so far
+    # - limit = How many suggestions (between 1 and 20)
+    
+    suggestions = suggest_index.suggest(prefix, limit)
+    return jsonify({
+        'query': prefix,
+        'suggestions': [{'title': title, 'popularity': popularity}
+                        for title, popularity in suggestions]
+    })
+    # Explanation:
+    # - suggest_index.suggest() = A ready-made list for 1-3 letters,
+    #   binary search in the sorted titles for longer prefixes
+    # - Matches the start of the title OR of any word in it
+    # - Most popular first
+    # - Fast enough to call on every keystroke!
+
+# Step 16: Run the Application
 # What is this? This starts the web server
 # Think of it like: "Turn on the website so people can visit it"
 if __name__ == '__main__':
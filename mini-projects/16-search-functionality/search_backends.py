@@ -0,0 +1,527 @@
+# Search Backends
+# This module stores the catalogue in SQLite with a full-text (FTS5) index!
+
+# Step 1: Import the Tools We Need
+# What is this? We're importing Python tools for databases and files
+# Think of it like: "Get a filing cabinet that can search itself"
+import csv
+import itertools
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from search_index import SearchIndex, SearchResults, tokenize
+from suggest_index import MAX_SUGGESTIONS, SuggestIndex
+# Explanation:
+# - csv / json = Read catalogue files for the bulk loader
+# - itertools = Cut a long stream of items into batches
+# - sqlite3 = Python's built-in SQLite database (no server needed)
+# - threading = One database connection per thread
+# - time = Remembered suggestions expire after a few seconds, and a
+#   crashed bulk load is noticed after a minute
+# - SearchIndex = The in-memory index (the "memory" backend)
+# - SearchResults, tokenize = Shared with the in-memory index, so both
+#   backends return exactly the same result shape
+# - SuggestIndex = The in-memory autocomplete index (for the memory backend)
+
+BULK_BATCH_SIZE = 10000
+LOAD_TIMEOUT = 60
+# Explanation:
+# - The bulk loader commits once every 10,000 items
+# - One transaction per item would be ~100x slower (each commit syncs the disk)
+# - LOAD_TIMEOUT = A fresh load that hasn't committed a batch for 60 seconds
+#   is treated as crashed, and the next load takes over
+
+SUGGEST_CACHE_SECONDS = 30
+# Explanation:
+# - Suggestions for short prefixes ("a", "py") are remembered for 30 seconds
+
+
+# Step 2: Create the SQLite Backend
+# What is this? The same add/remove/search API as SearchIndex, on disk
+# Think of it like: "The index at the back of the book, but the book is
+#                    too big to carry, so it stays in the library"
+class SQLiteSearchIndex:
+    """
+    Search backend that keeps items in SQLite with an FTS5 full-text index
+
+    Use it when the catalogue no longer fits in memory. search() runs an
+    indexed MATCH query ranked with BM25 and returns the same SearchResults
+    as the in-memory SearchIndex.
+
+    Args:
+    - path: Location of the SQLite database file
+    - title_boost: How much more a title match counts than a description match
+    """
+
+    def __init__(self, path, title_boost=2.0):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        conn.executescript('''
+            CREATE TABLE IF NOT EXISTS items (
+                id INTEGER PRIMARY KEY,
+                title TEXT NOT NULL,
+                category TEXT NOT NULL,
+                description TEXT NOT NULL,
+                popularity INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS items_by_category
+                ON items (category COLLATE NOCASE);
+            CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+                title, description,
+                content='items', content_rowid='id', prefix='2 3'
+            );
+            CREATE TABLE IF NOT EXISTS categories (
+                name TEXT PRIMARY KEY COLLATE NOCASE,
+                count INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS fresh_load (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                heartbeat REAL NOT NULL
+            );
+        ''')
+        # Explanation:
+        # - items = The real data (one row per item)
+        # - items_by_category = Filtering by category uses an index
+        # - items_fts = The FTS5 full-text index over title and description
+        # - content='items' = The index points at the items table instead of
+        #   storing a second copy of every title and description
+        # - prefix='2 3' = Extra index for 2- and 3-letter word starts,
+        #   so 'web*' stays fast
+        # - categories = Item count per category (the facets), kept up to date
+        # - fresh_load = One row while a load into an empty database runs
+        #   (see bulk_load)
+
+        conn.execute('BEGIN IMMEDIATE')
+        if not self._loading(conn):
+            for statement in _TRIGGERS:
+                conn.execute(statement)
+        conn.execute('COMMIT')
+        conn.execute("INSERT INTO items_fts (items_fts, rank) VALUES ('rank', ?)",
+                     (f'bm25({float(title_boost)}, 1.0)',))
+        # Explanation:
+        # - Triggers = SQL that runs automatically on every insert/delete/update
+        # - They keep the full-text index and the category counts in sync,
+        #   so add(), remove() and the bulk loader never forget a step
+        # - Not while another process is loading an empty database: it
+        #   switched them off on purpose, and puts them back when it's done
+        # - 'rank' = Tells FTS5 to rank with BM25, title matches counting double
+
+    def _connect(self):
+        """Return this thread's connection, reconnecting after a fork"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            _use_wal(conn)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+        # Explanation:
+        # - gunicorn forks workers, and a connection must not cross a fork
+        # - isolation_level=None = Autocommit (we open transactions ourselves)
+        # - row_factory = sqlite3.Row = Rows can be turned into dictionaries
+        # - journal_mode=WAL = Searches never wait for the bulk loader
+
+    def __len__(self):
+        row = self._connect().execute('SELECT COALESCE(SUM(count), 0) FROM categories').fetchone()
+        return row[0]
+
+    def __iter__(self):
+        """Yield every item, in id order"""
+        for row in self._connect().execute('SELECT * FROM items ORDER BY id'):
+            yield dict(row)
+
+    # Step 3: Add, Remove and Bulk Load Items
+    # What is this? Writing items (the triggers update the indexes)
+    def add(self, item):
+        """Store one item (replaces an item with the same id)"""
+        self._connect().execute(_UPSERT, _row(item))
+
+    def remove(self, item_id):
+        """Remove one item (does nothing if it is not there)"""
+        self._connect().execute('DELETE FROM items WHERE id = ?', (item_id,))
+
+    def bulk_load(self, items, batch_size=BULK_BATCH_SIZE, only_if_empty=False):
+        """
+        Store many items quickly, in batched transactions
+
+        Args:
+        - items: Any iterable of items (a list, a generator reading a file, ...)
+        - batch_size: Items per transaction
+        - only_if_empty: Load nothing if the database already has items
+          (or another process is already loading it)
+
+        Returns:
+        - Number of items loaded
+        """
+        conn = self._connect()
+        rows = map(_row, items)
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            fresh = not len(self) and not self._loading(conn)
+            if fresh:
+                conn.execute('INSERT OR REPLACE INTO fresh_load (id, heartbeat) VALUES (1, ?)',
+                             (time.time(),))
+                for statement in _DROP_TRIGGERS:
+                    conn.execute(statement)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        if only_if_empty and not fresh:
+            return 0
+        if not fresh:
+            return self._load_batches(conn, rows, batch_size)
+        try:
+            return self._load_batches(conn, rows, batch_size, heartbeat=True)
+        finally:
+            self._finish_fresh_load(conn)
+        # Explanation:
+        # - BEGIN IMMEDIATE = Take the write lock BEFORE checking for items,
+        #   so two workers starting together can't both see an empty database
+        # - The fresh_load row is our "I'm loading it" sign: the other worker
+        #   sees it (the category counts are still 0 while we load) and
+        #   doesn't load the same items again
+        # - Loading into an EMPTY database? Then we switch the triggers off,
+        #   load the plain rows, and build the full-text index and category
+        #   counts once at the end - about twice as fast
+        # - Loading into a database that already has items keeps the
+        #   triggers on, so existing items are updated correctly
+
+    def _loading(self, conn):
+        """True while another process is loading an empty database"""
+        row = conn.execute('SELECT heartbeat FROM fresh_load').fetchone()
+        return row is not None and row[0] > time.time() - LOAD_TIMEOUT
+        # Explanation:
+        # - heartbeat = When the loader last committed a batch
+        # - A loader that crashed stops updating it; after LOAD_TIMEOUT
+        #   seconds the next load starts over (its rows are simply upserted)
+
+    def _finish_fresh_load(self, conn):
+        """Build the full-text index and category counts, switch the triggers back on"""
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute("INSERT INTO items_fts (items_fts) VALUES ('rebuild')")
+            conn.execute('DELETE FROM categories')
+            conn.execute('INSERT INTO categories (name, count) '
+                         'SELECT category, COUNT(*) FROM items GROUP BY category COLLATE NOCASE')
+            for statement in _TRIGGERS:
+                conn.execute(statement)
+            conn.execute('DELETE FROM fresh_load')
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        # Explanation:
+        # - 'rebuild' = FTS5 indexes every row of items in one go
+        # - Runs even if the load failed halfway, so the batches that were
+        #   committed are searchable
+        # - All in ONE transaction: items written by other workers while the
+        #   triggers were off are covered by the rebuild, and new ones by
+        #   the triggers (there's no moment in between)
+        # - conn.execute() one statement at a time: executescript() would
+        #   COMMIT our transaction halfway through
+
+    def _load_batches(self, conn, rows, batch_size, heartbeat=False):
+        """Insert rows in transactions of batch_size, return the count"""
+        loaded = 0
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                return loaded
+            conn.execute('BEGIN')
+            try:
+                conn.executemany(_UPSERT, batch)
+                if heartbeat:
+                    conn.execute('UPDATE fresh_load SET heartbeat = ?', (time.time(),))
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            loaded += len(batch)
+        # Explanation:
+        # - islice() = Take the next batch_size items (the rest stay unread,
+        #   so a 10 GB file never has to fit in memory)
+        # - executemany() = One prepared statement, many rows
+        # - BEGIN ... COMMIT = The whole batch is written (and synced) once
+        # - A failing batch is rolled back; earlier batches stay loaded
+        # - heartbeat = Tells other processes this fresh load is still alive
+
+    # Step 4: Search
+    # What is this? A MATCH query against the FTS5 index
+    def search(self, query, category_filter=None, limit=None, offset=0, fuzzy=True):
+        """
+        Find items containing every query word (as a word or word start)
+
+        Args:
+        - query: Search query string
+        - category_filter: Optional category to filter by
+        - limit: Maximum number of results (None = all)
+        - offset: Number of results to skip (for pages)
+        - fuzzy: Accepted for compatibility (FTS5 has no typo tolerance)
+
+        Returns:
+        - SearchResults (a list), best match first, with .total and .facets set
+        """
+        conn = self._connect()
+        words = tokenize(query) if query else []
+        facets = {row['name']: 0 if query else row['count'] for row in
+                  conn.execute('SELECT name, count FROM categories ORDER BY name')}
+        if query and not words:
+            return SearchResults(facets=facets)
+        match = ' '.join(f'"{word}"*' for word in dict.fromkeys(words))
+        # Explanation:
+        # - facets start as the stored counts (or 0 when there is a query)
+        # - '"python"*' = Words starting with "python" (like the memory index)
+        # - Words separated by spaces = ALL of them must match
+        # - tokenize() only keeps letters and digits, so the quotes are safe
+
+        where, params = [], []
+        if words:
+            where.append('items_fts MATCH ?')
+            params.append(match)
+            for row in conn.execute(
+                    'SELECT i.category AS name, COUNT(*) AS count '
+                    'FROM items_fts JOIN items i ON i.id = items_fts.rowid '
+                    'WHERE items_fts MATCH ? GROUP BY i.category COLLATE NOCASE',
+                    (match,)):
+                facets[_facet_name(facets, row['name'])] = row['count']
+        if category_filter:
+            where.append('i.category = ? COLLATE NOCASE')
+            params.append(category_filter)
+        # Explanation:
+        # - Facets are counted BEFORE the category filter (like the memory index)
+        # - GROUP BY = SQLite counts the matches per category for us
+
+        if words:
+            source = 'items_fts JOIN items i ON i.id = items_fts.rowid'
+            order = 'items_fts.rank, i.id'
+        else:
+            source = 'items i'
+            order = 'i.id'
+        condition = ' WHERE ' + ' AND '.join(where) if where else ''
+        total = conn.execute(f'SELECT COUNT(*) FROM {source}{condition}', params).fetchone()[0]
+        rows = conn.execute(
+            f'SELECT i.* FROM {source}{condition} ORDER BY {order} LIMIT ? OFFSET ?',
+            params + [-1 if limit is None else limit, offset]
+        )
+        return SearchResults([dict(row) for row in rows], total=total, facets=facets)
+        # Explanation:
+        # - ORDER BY rank = Best BM25 score first (FTS5 computes it)
+        # - LIMIT/OFFSET = SQLite only returns the page we need
+        # - LIMIT -1 = No limit
+        # - No query words = Plain table scan in id order
+
+
+# Step 5: Suggestions from SQLite
+# What is this? Autocomplete straight from the full-text index
+# Think of it like: "Asking the librarian instead of copying the whole
+#                    card catalogue into your notebook first"
+class SQLiteSuggestIndex:
+    """
+    Type-ahead suggestions for the SQLite backend
+
+    Same suggest() as SuggestIndex, answered with an FTS5 prefix query on
+    the title column, so no title has to be read into memory at startup.
+
+    Args:
+    - search_index: The SQLiteSearchIndex to suggest from
+    """
+
+    def __init__(self, search_index):
+        self.search_index = search_index
+        self._top = {}
+        # Explanation:
+        # - _top = prefix → (expiry time, suggestions) for short prefixes
+
+    def add(self, item):
+        """Forget remembered suggestions (the triggers index the item)"""
+        self._top.clear()
+
+    def remove(self, item_id):
+        """Forget remembered suggestions (the triggers unindex the item)"""
+        self._top.clear()
+
+    def suggest(self, prefix, limit=8):
+        """
+        Return the most popular titles matching a prefix
+
+        Args:
+        - prefix: What the user typed so far
+        - limit: Maximum number of suggestions (at most MAX_SUGGESTIONS)
+
+        Returns:
+        - List of (title, popularity), most popular first
+        """
+        words = tokenize(prefix)
+        if not words:
+            return []
+        key = ' '.join(words)
+        now = time.monotonic()
+        expires, top = self._top.get(key, (0, None))
+        if expires <= now:
+            match = 'title : "' + key + '" *'
+            top = [(row[0], row[1]) for row in self.search_index._connect().execute(
+                'SELECT i.title, SUM(i.popularity) AS weight '
+                'FROM items_fts JOIN items i ON i.id = items_fts.rowid '
+                'WHERE items_fts MATCH ? GROUP BY i.title '
+                'ORDER BY weight DESC, i.title LIMIT ?',
+                (match, MAX_SUGGESTIONS))]
+            if len(key) <= 3:
+                self._top[key] = (now + SUGGEST_CACHE_SECONDS, top)
+        return top[:limit]
+        # Explanation:
+        # - 'title : "machine le" *' = The words "machine" then a word starting
+        #   with "le", in the title (like SuggestIndex's word starts)
+        # - prefix='2 3' on items_fts makes short word starts an index lookup
+        # - GROUP BY title = Items sharing a title are suggested once, with
+        #   their popularity added up
+        # - Prefixes of 1-3 letters match many items, so their answer is
+        #   remembered for SUGGEST_CACHE_SECONDS (other workers' new items
+        #   show up after that)
+
+
+def make_suggest_index(search_index):
+    """Create the autocomplete index that fits the search backend"""
+    if isinstance(search_index, SQLiteSearchIndex):
+        return SQLiteSuggestIndex(search_index)
+    return SuggestIndex(search_index)
+    # Explanation:
+    # - memory backend = Sorted titles in memory (fastest)
+    # - sqlite backend = Query the database (nothing loaded at startup)
+
+
+# Step 6: Helper Functions
+_TRIGGERS = (
+    '''CREATE TRIGGER IF NOT EXISTS items_after_insert AFTER INSERT ON items BEGIN
+        INSERT INTO items_fts (rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        INSERT INTO categories (name, count) VALUES (new.category, 1)
+            ON CONFLICT (name) DO UPDATE SET count = count + 1;
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS items_after_delete AFTER DELETE ON items BEGIN
+        INSERT INTO items_fts (items_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+        UPDATE categories SET count = count - 1 WHERE name = old.category;
+        DELETE FROM categories WHERE name = old.category AND count <= 0;
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS items_after_update AFTER UPDATE ON items BEGIN
+        INSERT INTO items_fts (items_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO items_fts (rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        UPDATE categories SET count = count - 1 WHERE name = old.category;
+        DELETE FROM categories WHERE name = old.category AND count <= 0;
+        INSERT INTO categories (name, count) VALUES (new.category, 1)
+            ON CONFLICT (name) DO UPDATE SET count = count + 1;
+    END''',
+)
+# Explanation:
+# - One trigger per kind of change (insert, delete, update)
+# - _DROP_TRIGGERS = Switches them off during a fresh bulk load
+# - 'delete' = FTS5's way of removing a row from an external-content index
+# - One statement per string, so they can run inside a transaction
+
+_DROP_TRIGGERS = (
+    'DROP TRIGGER IF EXISTS items_after_insert',
+    'DROP TRIGGER IF EXISTS items_after_delete',
+    'DROP TRIGGER IF EXISTS items_after_update',
+)
+
+_UPSERT = (
+    'INSERT INTO items (id, title, category, description, popularity) '
+    'VALUES (?, ?, ?, ?, ?) '
+    'ON CONFLICT (id) DO UPDATE SET title = excluded.title, '
+    'category = excluded.category, description = excluded.description, '
+    'popularity = excluded.popularity'
+)
+# Explanation:
+# - ON CONFLICT ... DO UPDATE = Insert, or update the item if the id exists
+#   (an update fires the update trigger, so the indexes stay right)
+
+
+def _use_wal(conn, attempts=50):
+    """Switch a connection to WAL mode, waiting while another one does it"""
+    for attempt in range(attempts):
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            return
+        except sqlite3.OperationalError:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(0.1)
+    # Explanation:
+    # - On a brand-new file, the first worker to switch it to WAL locks it
+    #   for a moment, and SQLite answers "database is locked" right away
+    #   instead of waiting (the timeout doesn't apply to this step)
+    # - So we try again a few times, 0.1 seconds apart
+
+
+def _row(item):
+    """Turn an item dictionary into a row for _UPSERT"""
+    return (item['id'], item['title'], item['category'], item['description'],
+            int(item.get('popularity', 0)))
+
+
+def _facet_name(facets, name):
+    """Return the facet key matching `name` (categories ignore case)"""
+    lowered = name.lower()
+    for existing in facets:
+        if existing.lower() == lowered:
+            return existing
+    return name
+
+
+def make_search_index(backend='memory', path=None, items=()):
+    """
+    Create a search backend
+
+    Args:
+    - backend: 'memory' (SearchIndex) or 'sqlite' (SQLiteSearchIndex)
+    - path: SQLite database file (only for 'sqlite')
+    - items: Items to start with (SQLite only loads them into an empty database)
+
+    Returns:
+    - An object with add(), remove(), search() and iteration
+    """
+    if backend == 'memory':
+        return SearchIndex(items)
+    if backend == 'sqlite':
+        index = SQLiteSearchIndex(path)
+        index.bulk_load(items, only_if_empty=True)
+        return index
+    raise ValueError(f'Unknown search backend: {backend!r} (use "memory" or "sqlite")')
+
+
+def read_items(path):
+    """
+    Read items from a .jsonl (one JSON object per line) or .csv file
+
+    Yields items one at a time, so huge files are never fully in memory.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.endswith('.csv'):
+            for row in csv.DictReader(f):
+                row['id'] = int(row['id'])
+                yield row
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+# Step 7: Command-Line Bulk Loader
+# What is this? Load a big catalogue file from the terminal
+#   python search_backends.py catalogue.jsonl instance/search.sqlite3
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        sys.exit('usage: python search_backends.py ITEMS.jsonl|ITEMS.csv DATABASE')
+    loaded = SQLiteSearchIndex(sys.argv[2]).bulk_load(read_items(sys.argv[1]))
+    print(f'Loaded {loaded} items into {sys.argv[2]}')
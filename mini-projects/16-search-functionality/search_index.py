@@ -0,0 +1,449 @@
+# Search Index
+# This module builds an inverted index so searches don't scan every item!
+
+# Step 1: Import the Tools We Need
+# What is this? We're importing Python tools for text and sorted lists
+# Think of it like: "Get scissors (to cut text into words) and a card catalogue"
+import bisect
+import heapq
+import math
+import re
+from collections import Counter
+# Explanation:
+# - bisect = Fast search in a sorted list (finds words that start with a prefix)
+# - heapq = A heap: keeps the best k results without sorting all of them
+# - math = Logarithms for the ranking formula
+# - re = Regular expressions (splits text into words)
+# - Counter = Counts how often each word appears
+
+# Step 2: Define How Text Becomes Words
+# What is this? A rule for cutting text into searchable words (tokens)
+# Think of it like: "Split 'Build web apps!' into ['build', 'web', 'apps']"
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """
+    Split text into lowercase words
+
+    Example: 'Learn Python, fast!' → ['learn', 'python', 'fast']
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+    # Explanation:
+    # - \w+ = One or more letters, digits or underscores
+    # - .lower() = Case-insensitive (Python = python)
+
+
+FIELDS = ('title', 'description')
+# Explanation:
+# - The fields we search (and rank) in
+# - A word's count is stored per field, so each field can have its own boost
+
+PREFIX_WEIGHT = 0.5
+FUZZY_WEIGHT = 0.3
+# Explanation:
+# - 'web' matching 'websites' (a word start) counts half as much
+#   as 'web' matching 'web' (the whole word)
+# - 'pyhton' matching 'python' (a typo) counts even less
+
+
+def trigrams(word):
+    """
+    Split a word into overlapping 3-letter pieces
+
+    Example: 'flask' → {'$fl', 'fla', 'las', 'ask', 'sk$'}
+    """
+    padded = f'${word}$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+    # Explanation:
+    # - $ marks the start and end, so first and last letters count too
+    # - A word with one typo still shares most of its trigrams
+
+
+SHORT_WORD = 5
+
+
+def deletions(word):
+    """
+    The word itself plus every way to delete one letter
+
+    Example: 'word' → {'word', 'ord', 'wrd', 'wod', 'wor'}
+    """
+    return {word} | {word[:i] + word[i + 1:] for i in range(len(word))}
+    # Explanation:
+    # - Two words one typo apart always share one of these:
+    #   'wrod' and 'word' both become 'wod' (delete the r/o they swapped)
+    # - Used for words up to SHORT_WORD letters, where one swap can break
+    #   every trigram ('wrod' and 'word' share none)
+
+
+def max_edits(word):
+    """How many typos we forgive in a word of this length"""
+    if len(word) < 4:
+        return 0
+    return 1 if len(word) < 8 else 2
+    # Explanation:
+    # - Short words have too many neighbours ('cat' is 1 typo from 'car')
+
+
+def edit_distance(a, b, limit):
+    """
+    Count the typos (insert, delete, replace, swap) between two words
+
+    Stops early and returns limit + 1 as soon as the answer is over `limit`.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before, previous = None, list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            cost = min(previous[j] + 1,
+                       current[j - 1] + 1,
+                       previous[j - 1] + (char_a != char_b))
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+    # Explanation:
+    # - Classic Levenshtein table, one row at a time
+    # - Plus swapped neighbours ('pyhton' → 'python') count as ONE typo
+    # - If a whole row is already over the limit, the end result will be too
+
+
+class SearchResults(list):
+    """
+    A list of results plus the total number of matches
+
+    It behaves exactly like a list (loop over it, len(), ...), and
+    `total` tells you how many items matched before limit/offset.
+    """
+
+    def __init__(self, items=(), total=0, corrections=None, facets=None):
+        super().__init__(items)
+        self.total = total
+        self.corrections = corrections or {}
+        self.facets = facets or {}
+        # Explanation:
+        # - corrections = Misspelled word → words we searched for instead
+        # - facets = Category → number of matches (ignoring the category filter)
+
+
+# Step 3: Create the Inverted Index
+# What is this? A map from every word to the items that contain it
+# Think of it like: "The index at the back of a book: word → page numbers"
+class SearchIndex:
+    """
+    Inverted index over item titles and descriptions
+
+    Instead of reading every item on every search, we look up each query
+    word and only touch the items listed for it. The index is built once
+    and updated item by item with add() and remove(). Results are ranked
+    with BM25, the formula most search engines start from.
+
+    Args:
+    - items: Items to index (dictionaries with id, title, category, description)
+    - title_boost: How much more a title match counts than a description match
+    - k1: How quickly repeating a word stops adding to the score
+    - b: How much long fields are penalised (0 = not at all, 1 = fully)
+    """
+
+    def __init__(self, items=(), title_boost=2.0, k1=1.2, b=0.75):
+        self.boosts = (title_boost, 1.0)
+        self.k1 = k1
+        self.b = b
+        self.items = {}
+        self.postings = {}
+        self.categories = {}
+        self.category_names = {}
+        self.terms = []
+        self.trigram_index = {}
+        self.deletion_index = {}
+        self._order = {}
+        self._lengths = {}
+        self._total_lengths = [0] * len(FIELDS)
+        self._next_position = 0
+        for item in items:
+            self.add(item)
+        # Explanation:
+        # - boosts = Weight per field (title, description)
+        # - items = id → item (every indexed item)
+        # - postings = word → {item id: (count in title, count in description)}
+        #   (a "posting list" - the items containing the word)
+        # - categories = lowercase category → set of item ids
+        # - category_names = lowercase category → name to display
+        # - terms = Every indexed word, kept sorted (for prefix lookups)
+        # - trigram_index = trigram → words containing it (for typos)
+        # - deletion_index = word minus one letter → short words (for typos
+        #   in short words, see deletions())
+        # - _order = id → position (ties keep insertion order)
+        # - _lengths = id → number of words in each field
+        # - _total_lengths = Words per field over all items (for averages)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        """Yield every item (used to build the suggest index)"""
+        return iter(list(self.items.values()))
+
+    # Step 4: Add and Remove Items
+    # What is this? Keeping the index up to date one item at a time
+    def add(self, item):
+        """Index one item (replaces an item with the same id)"""
+        item_id = item['id']
+        if item_id in self.items:
+            self.remove(item_id)
+        field_words = [tokenize(item[field]) for field in FIELDS]
+        counts = [Counter(words) for words in field_words]
+        for word in set().union(*counts):
+            posting = self.postings.get(word)
+            if posting is None:
+                posting = self.postings[word] = {}
+                bisect.insort(self.terms, word)
+                for gram in trigrams(word):
+                    self.trigram_index.setdefault(gram, set()).add(word)
+                if len(word) <= SHORT_WORD:
+                    for variant in deletions(word):
+                        self.deletion_index.setdefault(variant, set()).add(word)
+            posting[item_id] = tuple(count[word] for count in counts)
+        category = item['category'].lower()
+        self.categories.setdefault(category, set()).add(item_id)
+        self.category_names.setdefault(category, item['category'])
+        self.items[item_id] = item
+        self._lengths[item_id] = lengths = tuple(len(words) for words in field_words)
+        self._total_lengths = [a + b for a, b in zip(self._total_lengths, lengths)]
+        self._order[item_id] = self._next_position
+        self._next_position += 1
+        # Explanation:
+        # - Only the words of THIS item are touched (no full rebuild)
+        # - Each posting stores how often the word appears in each field
+        # - A brand-new word is inserted into the sorted terms list
+        #   and into the trigram index (and the deletion index if it's short)
+        # - bisect.insort() = Insert while keeping the list sorted
+
+    def remove(self, item_id):
+        """Remove one item from the index (does nothing if it is not there)"""
+        item = self.items.pop(item_id, None)
+        if item is None:
+            return
+        words = set(tokenize(item['title'])) | set(tokenize(item['description']))
+        for word in words:
+            posting = self.postings[word]
+            del posting[item_id]
+            if not posting:
+                del self.postings[word]
+                del self.terms[bisect.bisect_left(self.terms, word)]
+                for gram in trigrams(word):
+                    self.trigram_index[gram].discard(word)
+                    if not self.trigram_index[gram]:
+                        del self.trigram_index[gram]
+                if len(word) <= SHORT_WORD:
+                    for variant in deletions(word):
+                        self.deletion_index[variant].discard(word)
+                        if not self.deletion_index[variant]:
+                            del self.deletion_index[variant]
+        category = item['category'].lower()
+        self.categories[category].discard(item_id)
+        if not self.categories[category]:
+            del self.categories[category]
+            del self.category_names[category]
+        lengths = self._lengths.pop(item_id)
+        self._total_lengths = [a - b for a, b in zip(self._total_lengths, lengths)]
+        del self._order[item_id]
+        # Explanation:
+        # - We re-read the item's words to know which postings to update
+        # - Words no item uses any more are dropped from the index
+        # - Empty categories disappear from the category list
+
+    # Step 5: Look Up Words
+    # What is this? Finding every item containing a word (or a word start)
+    def _expand(self, word):
+        """Return {indexed word: weight} for every word starting with `word`"""
+        start = bisect.bisect_left(self.terms, word)
+        end = bisect.bisect_left(self.terms, word + '\uffff')
+        return {term: 1.0 if term == word else PREFIX_WEIGHT
+                for term in self.terms[start:end]}
+
+    def _matching(self, terms):
+        """Return the ids of items containing any of `terms`"""
+        if len(terms) == 1:
+            return self.postings[next(iter(terms))]
+        matched = set()
+        for term in terms:
+            matched.update(self.postings[term])
+        return matched
+        # Explanation:
+        # - The terms list is sorted, so all words starting with 'web'
+        #   ('web', 'websites', ...) sit next to each other
+        # - bisect finds that slice without looking at the other words
+        # - '\uffff' = A character bigger than any normal letter (slice end)
+        # - So 'web' still finds 'websites', like the old substring search
+
+    def _similar(self, word):
+        """Return indexed words within max_edits(word) typos of `word`"""
+        limit = max_edits(word)
+        if not limit:
+            return []
+        grams = trigrams(word)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.trigram_index.get(gram, ()))
+        candidates = {term for term, count in shared.items()
+                      if count >= max(len(grams), len(term)) - 4 * limit}
+        if len(word) <= SHORT_WORD + 1:
+            for variant in deletions(word):
+                candidates.update(self.deletion_index.get(variant, ()))
+        return [term for term in candidates if edit_distance(word, term, limit) <= limit]
+        # Explanation:
+        # - Step 1 (filter): Count shared trigrams using the trigram index,
+        #   touching only words that share at least one trigram
+        # - Each typo can break at most 4 trigrams (3, or 4 for a swap), so
+        #   a word sharing fewer than (trigrams - 4 × typos) is too far away
+        # - A short word can lose ALL its trigrams to one typo ('wrod' vs
+        #   'word'), so short words also look in the deletion index
+        # - SHORT_WORD + 1 = A 6-letter typo can still be a 5-letter word
+        #   with one extra letter
+        # - Step 2 (verify): Only the few survivors get the exact (slower)
+        #   edit distance check - never every word in the index
+
+    # Step 6: Rank with BM25
+    # What is this? Giving each matching item a relevance score
+    # Think of it like: "Rare words that appear in short titles count most"
+    def _scores(self, expansions, ids):
+        """Return {item id: BM25 score} for the items in `ids`"""
+        n = len(self.items)
+        k1, b = self.k1, self.b
+        title_boost, description_boost = self.boosts
+        title_average, description_average = (total / n if total else 1
+                                              for total in self._total_lengths)
+        lengths = self._lengths
+        scores = dict.fromkeys(ids, 0.0)
+        for terms in expansions.values():
+            for term, term_weight in terms.items():
+                posting = self.postings[term]
+                idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+                weight = idf * term_weight
+                for item_id in ids if len(ids) < len(posting) else posting:
+                    counts = posting.get(item_id)
+                    if counts is None or item_id not in scores:
+                        continue
+                    title_count, description_count = counts
+                    title_length, description_length = lengths[item_id]
+                    tf = (title_boost * title_count
+                          / (1 - b + b * title_length / title_average)
+                          + description_boost * description_count
+                          / (1 - b + b * description_length / description_average))
+                    scores[item_id] += weight * tf / (k1 + tf)
+        return scores
+        # Explanation:
+        # - idf = "Inverse document frequency": rare words score higher
+        # - tf = How often the word appears, per field, times the field boost
+        #   (divided by the field length, so short titles are not drowned out)
+        # - tf / (k1 + tf) = Saturates: the 10th "python" adds little
+        # - We only loop over the shorter of the candidates and the posting list
+
+    # Step 7: Count Results per Category (Facets)
+    # What is this? "Programming (3), Web (2)" next to the search results
+    def facet_counts(self, ids=None):
+        """
+        Count items per category
+
+        Args:
+        - ids: Item ids to count (None = every item)
+
+        Returns:
+        - Dictionary of category name → count, alphabetical
+        """
+        names = self.category_names
+        if ids is None:
+            counts = {key: len(members) for key, members in self.categories.items()}
+        else:
+            counts = {key: len(ids & members) for key, members in self.categories.items()}
+        return {names[key]: counts[key] for key in sorted(counts, key=names.get)}
+        # Explanation:
+        # - Each category keeps a set of its item ids (updated on add/remove)
+        # - No query = The set sizes ARE the counts (nothing to scan at all)
+        # - With a query: ids & members = Intersection of two sets, which
+        #   Python does by walking the smaller one
+        # - Categories with 0 matches are kept, so the dropdown stays complete
+
+    # Step 8: Search
+    # What is this? Combining the posting lists of every query word
+    def search(self, query, category_filter=None, limit=None, offset=0, fuzzy=True):
+        """
+        Find items containing every query word (as a word or word start)
+
+        Args:
+        - query: Search query string
+        - category_filter: Optional category to filter by
+        - limit: Maximum number of results (None = all)
+        - offset: Number of results to skip (for pages)
+        - fuzzy: Forgive typos in words that match nothing
+
+        Returns:
+        - SearchResults (a list), best match first, with .total and .facets set
+        """
+        words = tokenize(query) if query else []
+        if query and not words:
+            return SearchResults(facets=self.facet_counts(set()))
+        expansions = {}
+        corrections = {}
+        for word in set(words):
+            terms = self._expand(word)
+            if not terms and fuzzy:
+                terms = dict.fromkeys(self._similar(word), FUZZY_WEIGHT)
+                if terms:
+                    corrections[word] = sorted(terms)
+            expansions[word] = terms
+        postings = sorted((self._matching(terms) for terms in expansions.values()), key=len)
+        # Explanation:
+        # - A query with no words at all (like '!!!') matches nothing
+        # - A word that matches nothing is probably a typo, so we use
+        #   the indexed words within one or two typos of it instead
+        # - Each query word gives a set of item ids
+        # - Smallest set first: intersecting starts small and stays small
+
+        if not postings:
+            ids = None
+        else:
+            ids = set(postings[0])
+            for posting in postings[1:]:
+                if not ids:
+                    break
+                ids = {item_id for item_id in ids if item_id in posting}
+        # Explanation:
+        # - No query words = None (meaning "every item")
+        # - Keep only ids that are in BOTH (checks the smaller set only)
+        # - Work depends on the posting list sizes, not the number of items
+
+        facets = self.facet_counts(ids)
+        if category_filter:
+            members = self.categories.get(category_filter.lower(), set())
+            ids = set(members) if ids is None else ids & members
+        elif ids is None:
+            ids = self.items.keys()
+        # Explanation:
+        # - Facets are counted BEFORE the category filter, so the page can
+        #   show how many results every other category would have
+        # - The category is then just one more set to intersect with
+
+        count = offset + limit if limit is not None else len(ids)
+        order = self._order
+        if words:
+            scores = self._scores(expansions, ids)
+            top = heapq.nsmallest(count, ids, key=lambda i: (-scores[i], order[i]))
+        else:
+            top = heapq.nsmallest(count, ids, key=order.__getitem__)
+        return SearchResults([self.items[i] for i in top[offset:]], total=len(ids),
+                             corrections=corrections, facets=facets)
+        # Explanation:
+        # - heapq.nsmallest(count, ...) = Keeps a heap of only `count` items,
+        #   so 10 results out of 100,000 matches never sorts all 100,000
+        # - -score = Highest score first; ties keep insertion order
+        # - No query words = Nothing to rank, so insertion order
+        # - top[offset:] = Skip the earlier pages
+        # - corrections = Lets the page say "showing results for python"
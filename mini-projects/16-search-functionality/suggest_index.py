@@ -0,0 +1,311 @@
+# Suggest Index
+# This module powers type-ahead suggestions (autocomplete)!
+
+# Step 1: Import the Tools We Need
+# What is this? We're importing Python tools for sorted lists and heaps
+# Think of it like: "Get a dictionary (sorted words) and a leaderboard"
+import bisect
+import heapq
+from collections import OrderedDict
+# Explanation:
+# - bisect = Fast search in a sorted list (finds everything starting with "pyt")
+# - heapq = Picks the most popular titles without sorting all of them
+# - OrderedDict = Remembers which long prefixes were used least recently
+
+MAX_SUGGESTIONS = 20
+SHORT_PREFIX = 3
+SCAN_LIMIT = 64
+MAX_REMEMBERED = 4096
+# Explanation:
+# - MAX_SUGGESTIONS = The most suggestions one request can get
+# - Prefixes of 1-3 characters ("p", "py", "pyt") get their best titles
+#   worked out in advance, and kept up to date (see Step 4)
+# - Longer prefixes matching at most 64 entries are answered by scanning them
+# - Bigger ones are remembered too, but only the 4,096 used most recently
+
+_KEEP = 2 * MAX_SUGGESTIONS
+# Explanation:
+# - Each remembered list keeps the best 40 titles, not just 20, so a few
+#   titles can be removed before the list has to be worked out again
+
+
+def _word_starts(title):
+    """
+    Return the title from each word onwards, in lowercase
+
+    Example: 'Machine Learning' → ['machine learning', 'learning']
+    """
+    words = title.lower().split()
+    return [' '.join(words[start:]) for start in range(len(words))]
+    # Explanation:
+    # - split() + join = Single spaces, however the title was typed
+    # - So typing "learn" suggests "Machine Learning" too, not just
+    #   titles that START with "learn"
+
+
+# Step 2: Create the Suggest Index
+# What is this? A sorted list of every title (and every word start in it)
+# Think of it like: "A phone book: all names starting with 'Py' are together"
+class SuggestIndex:
+    """
+    Prefix index over item titles, ranked by popularity
+
+    Every title is stored once per word start in one sorted list, so all
+    completions of a prefix sit next to each other and bisect finds them
+    in O(log n). The best titles for short and busy prefixes are kept in
+    ready-made lists that add() and remove() update in place.
+
+    Args:
+    - items: Items to index (dictionaries with id, title and optional popularity)
+    """
+
+    def __init__(self, items=()):
+        self.keys = []
+        self.titles = []
+        self.weights = {}
+        self._counts = {}
+        self._item_titles = {}
+        self._top = {}
+        self._remembered = OrderedDict()
+        self._build(items)
+        # Explanation:
+        # - keys = Sorted lowercase title texts (one per word start)
+        # - titles = The real title for each key (same position in the list)
+        # - weights = title → popularity (added up over items with that title)
+        # - _counts = title → how many items have that title
+        # - _item_titles = item id → (title, popularity), so remove() works
+        # - _top = Every 1-3 character prefix → [best titles, complete?]
+        # - _remembered = Longer busy prefixes → [best titles, complete?],
+        #   oldest first (an OrderedDict, so we know which one to forget)
+
+    def __len__(self):
+        return len(self.weights)
+
+    def _build(self, items):
+        """Index many items at once (much faster than add() one by one)"""
+        for item in items:
+            self._count(item)
+        pairs = sorted((key, title) for title in self.weights
+                       for key in _word_starts(title))
+        self.keys = [key for key, _ in pairs]
+        self.titles = [title for _, title in pairs]
+        # Explanation:
+        # - One sort of everything = O(n log n)
+        # - Inserting one by one would move the whole list every time
+
+        ranked = [title for _, title in
+                  sorted((-weight, title) for title, weight in self.weights.items())]
+        order = {title: position for position, title in enumerate(ranked)}
+        self._fill(0, len(self.keys), 1, order, ranked)
+        # Explanation:
+        # - ranked = Every title, most popular first (ONE sort)
+        # - order = title → its place in ranked, so "best" is just "smallest number"
+        # - _fill() makes the ready-made list of every 1-3 character prefix
+
+    def _fill(self, start, end, size, order, ranked):
+        """Make the lists for every `size`-character prefix in keys start:end"""
+        keys = self.keys
+        found = set()
+        complete = True
+        while start < end:
+            key = keys[start]
+            if len(key) < size:
+                found.add(order[self.titles[start]])
+                start += 1
+                continue
+            prefix = key[:size]
+            stop = bisect.bisect_left(keys, prefix + '\uffff', start, end)
+            if size == SHORT_PREFIX:
+                best, whole = set(map(order.__getitem__, self.titles[start:stop])), True
+            else:
+                best, whole = self._fill(start, stop, size + 1, order, ranked)
+            best = sorted(best)
+            if len(best) > _KEEP:
+                best, whole = best[:_KEEP], False
+            self._top[prefix] = [[ranked[position] for position in best], whole]
+            found.update(best)
+            complete = complete and whole
+            start = stop
+        return found, complete
+        # Explanation:
+        # - All keys starting with "py" sit next to each other, so we jump
+        #   from one prefix range to the next (one bisect per prefix)
+        # - Only the 3-character prefixes look at every key; the list for
+        #   "py" is picked from the lists of "pya", "pyb", ... "pyz"
+        #   (the best 40 titles of "py" are always among those)
+        # - A key shorter than `size` ("c" when making 2-character lists)
+        #   isn't in any longer prefix, so its title joins directly
+        # - complete only if every smaller list was complete (and short)
+
+    def _count(self, item):
+        """Record an item's title and popularity; True if the title is new"""
+        title = item['title']
+        popularity = item.get('popularity', 0)
+        self._item_titles[item['id']] = (title, popularity)
+        is_new = title not in self.weights
+        self.weights[title] = self.weights.get(title, 0) + popularity
+        self._counts[title] = self._counts.get(title, 0) + 1
+        return is_new
+
+    def _rank(self, title):
+        """Sort key: most popular first, ties alphabetical"""
+        return -self.weights[title], title
+
+    # Step 3: Add and Remove Items
+    # What is this? Keeping the index up to date one item at a time
+    def add(self, item):
+        """Index one item (replaces an item with the same id)"""
+        self.remove(item['id'])
+        title = item['title']
+        if self._count(item):
+            for key in _word_starts(title):
+                position = bisect.bisect_right(self.keys, key)
+                self.keys.insert(position, key)
+                self.titles.insert(position, title)
+        self._update(title)
+        # Explanation:
+        # - A new title is inserted at its sorted position (once per word start)
+        # - A title we already have just gets more popular
+
+    def remove(self, item_id):
+        """Remove one item (does nothing if it is not there)"""
+        entry = self._item_titles.pop(item_id, None)
+        if entry is None:
+            return
+        title, popularity = entry
+        self.weights[title] -= popularity
+        self._counts[title] -= 1
+        if not self._counts[title]:
+            del self.weights[title]
+            del self._counts[title]
+            for key in _word_starts(title):
+                position = bisect.bisect_left(self.keys, key)
+                while self.titles[position] != title:
+                    position += 1
+                del self.keys[position]
+                del self.titles[position]
+        self._update(title)
+        # Explanation:
+        # - Several titles can share a key ("Python" and "Learn Python"
+        #   both have "python"), so we step to the one with OUR title
+
+    # Step 4: Keep the Ready-Made Lists Up to Date
+    # What is this? Moving one title inside the lists it belongs to
+    # Think of it like: "Updating one line of a leaderboard, not re-running the race"
+    def _update(self, title):
+        """Re-place a title whose popularity changed (or that was added/removed)"""
+        for prefix in _short_prefixes(title):
+            entry = self._top.get(prefix)
+            if entry is None:
+                if title in self.weights:
+                    self._top[prefix] = [[title], True]
+            elif self._place(prefix, entry, title):
+                del self._top[prefix]
+        if self._remembered:
+            for key in _word_starts(title):
+                for end in range(SHORT_PREFIX + 1, len(key) + 1):
+                    entry = self._remembered.get(key[:end])
+                    if entry is not None and self._place(key[:end], entry, title):
+                        del self._remembered[key[:end]]
+        # Explanation:
+        # - Only the lists for THIS title's prefixes can change
+        # - A brand-new 1-3 character prefix starts a list of its own
+        # - Lists that end up empty are deleted
+
+    def _place(self, prefix, entry, title):
+        """Move one title within a prefix list; True if the list is now empty"""
+        best, complete = entry
+        if title in best:
+            best.remove(title)
+        if title in self.weights:
+            rank = self._rank(title)
+            if complete or (best and rank < self._rank(best[-1])):
+                bisect.insort(best, title, key=self._rank)
+                if len(best) > _KEEP:
+                    best.pop()
+                    entry[1] = False
+        if not entry[1] and len(best) < MAX_SUGGESTIONS:
+            entry[0], entry[1] = self._scan(*self._range(prefix))
+        return not entry[0]
+        # Explanation:
+        # - The title is taken out, then put back at its new position
+        # - A title ranked below the whole (incomplete) list stays out:
+        #   there may be titles we don't list that are better than it
+        # - insort() = Insert into a sorted list, keeping it sorted
+        # - Only when fewer than 20 titles are left (after about 20 removals)
+        #   is the list worked out again from the sorted keys
+
+    # Step 5: Suggest Completions
+    # What is this? Finding the most popular titles starting with a prefix
+    def suggest(self, prefix, limit=8):
+        """
+        Return the most popular titles matching a prefix
+
+        Args:
+        - prefix: What the user typed so far
+        - limit: Maximum number of suggestions (at most MAX_SUGGESTIONS)
+
+        Returns:
+        - List of (title, popularity), most popular first
+        """
+        prefix = ' '.join(prefix.lower().split())
+        if not prefix:
+            return []
+        if len(prefix) <= SHORT_PREFIX:
+            entry = self._top.get(prefix)
+            best = entry[0] if entry else []
+        else:
+            best = self._long(prefix)
+        return [(title, self.weights[title]) for title in best[:limit]]
+        # Explanation:
+        # - ' '.join(....split()) = Lowercase with single spaces (like the keys)
+        # - 1-3 characters = One dictionary lookup (the list is ready)
+
+    def _long(self, prefix):
+        """Return the best titles for a prefix longer than SHORT_PREFIX"""
+        entry = self._remembered.get(prefix)
+        if entry is not None:
+            self._remembered.move_to_end(prefix)
+            return entry[0]
+        start, end = self._range(prefix)
+        if end - start <= SCAN_LIMIT:
+            return self._best(set(self.titles[start:end]), MAX_SUGGESTIONS)
+        self._remembered[prefix] = list(self._scan(start, end))
+        if len(self._remembered) > MAX_REMEMBERED:
+            self._remembered.popitem(last=False)
+        return self._remembered[prefix][0]
+        # Explanation:
+        # - Small ranges are just scanned
+        # - Big ranges are remembered (and kept up to date like the short ones);
+        #   past 4,096 of them, the least recently used one is forgotten
+
+    # Step 6: Pick the Best Titles
+    def _scan(self, start, end):
+        """Work out [best titles, complete?] for the keys start:end"""
+        best = self._best(set(self.titles[start:end]), _KEEP + 1)
+        if len(best) > _KEEP:
+            return best[:_KEEP], False
+        return best, True
+        # Explanation:
+        # - set() = A title matching at two word starts is counted once
+        # - Asking for 41 tells us whether there were more than 40
+        # - complete = True when the list holds EVERY title with the prefix
+        #   (then nothing is missing when one is removed)
+
+    def _range(self, prefix):
+        """Return (start, end): where the keys starting with prefix are"""
+        start = bisect.bisect_left(self.keys, prefix)
+        return start, bisect.bisect_left(self.keys, prefix + '\uffff', start)
+        # Explanation:
+        # - '\uffff' = A character bigger than any normal letter (range end)
+        # - bisect finds where the prefix range starts and ends: O(log n)
+
+    def _best(self, titles, count):
+        """Return the `count` most popular titles (ties alphabetical)"""
+        return heapq.nsmallest(count, titles, key=self._rank)
+
+
+def _short_prefixes(title):
+    """Return every 1-3 character prefix of the title's word starts"""
+    return {key[:end] for key in _word_starts(title)
+            for end in range(1, min(len(key), SHORT_PREFIX) + 1)}
@@ -6,6 +6,12 @@
 # Think of it like: "Get Flask tools and math tools"
 from flask import Flask, render_template, request, url_for
 import math
+import os
+import sys
+from lazy_pagination import lazy_paginate
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             '..', '11-blog-simple-database'))
+from streaming_export import export_response
 # Explanation:
 # - Flask = The main Flask class
 # - render_template = Function to display HTML templates
@@ -14,6 +20,10 @@ import math
 # - math = Module for mathematical operations
 # - We'll use math.ceil() to calculate total pages
 # - math.ceil() = Rounds up to nearest whole number
+# - lazy_paginate = Pages through any data without counting it all (lazy_pagination.py)
+# - export_response = Download every item in one response
+# - sys.path.append(...) = streaming_export.py lives in the Blog project
+#   (11-blog-simple-database); we use that one copy instead of our own
 
 # Step 2: Create the Flask Application
 # What is this? We're creating our web application
@@ -207,6 +217,9 @@ def paginate(items, page=1, per_page=10):
     # Explanation:
     # - Returns dictionary with all pagination information
     # - Template can use this to display items and pagination controls
+    # - len(items) needs the WHOLE list in memory, on every page view
+    # - For generators, queries or huge lists, use lazy_paginate() instead
+    #   (the home page below does)
 
 # Step 11: Create Home Route (GET)
 # What is this? The main page that shows paginated items
@@ -272,13 +285,23 @@ def index():
     
     # Step 15: Get Paginated Data
     # What is this? Getting items for current page and pagination info
-    pagination = paginate(sample_data, page=page, per_page=per_page)
+    pagination = lazy_paginate(sample_data, page=page, per_page=per_page, total='exact')
     # Explanation:
-    # - paginate() = Our pagination helper function
-    # - sample_data = All items to paginate
+    # - lazy_paginate() = Our lazy pagination helper (lazy_pagination.py)
+    # - sample_data = All items to paginate (could also be a generator or a query)
     # - page=page = Current page number
     # - per_page=per_page = Items per page
-    # - pagination = Dictionary with pagination info and items
+    # - total='exact' = len(sample_data) is instant for a list, so show
+    #   "Page X of Y"; use total=None to skip counting altogether
+    # - Only per_page + 1 items are read: the extra one tells us
+    #   whether there is a next page
+    # - pagination = Page object with items and pagination info
+    
+    if not pagination.items and pagination.total_pages and page > pagination.total_pages:
+        pagination = lazy_paginate(sample_data, page=pagination.total_pages,
+                                   per_page=per_page, total='exact')
+    # Explanation:
+    # - Page 11 of 10? Show the last page instead (like paginate() does)
     
     # Step 16: Render Template with Pagination
     # What is this? Showing the HTML page with paginated items
@@ -286,12 +309,41 @@ def index():
     # Explanation:
     # - render_template = Function that displays HTML templates
     # - 'index.html' = The template file to display
-    # - pagination=pagination = Passes pagination dictionary to template
+    # - pagination=pagination = Passes pagination info to template
     # - The first 'pagination' = Variable name in the template
-    # - The second pagination = The actual pagination dictionary from Python
+    # - The second pagination = The actual page object from Python
     # - In the template, we can use pagination.items, pagination.page, etc.
 
-# Step 17: Run the Application
+# Step 17: Create Export Route (GET)
+# What is this? Download ALL items in one response, instead of page by page
+# Think of it like: "Give me the whole book, not one page at a time"
+@app.route('/export')
+def export():
+    """
+    Stream every item as NDJSON (default) or CSV
+    Example: /export?format=csv → items.csv
+    Example: /export?after=40 → Items 41 onwards (resume a broken download)
+    """
+    # Step 18: Get Export Settings from URL
+    export_format = request.args.get('format', 'ndjson')
+    after = request.args.get('after', type=int)
+    # Explanation:
+    # - format = 'ndjson' (one JSON object per line) or 'csv'; anything else
+    #   gets a 400 error
+    # - after = The last id the client already has (None = start at the beginning)
+    
+    # Step 19: Stream the Items
+    rows = (item for item in sample_data if after is None or item['id'] > after)
+    return export_response(rows, ['id', 'title', 'description'], export_format,
+                           'items', header=after is None)
+    # Explanation:
+    # - ( ... for item in sample_data if ...) = A generator: skips items the
+    #   client already has (sample_data is in id order)
+    # - export_response() = Sends the rows while they are produced
+    # - Memory does not grow with the number of items
+    # - header=after is None = A resumed CSV has no second header line
+
+# Step 20: Run the Application
 # What is this? This starts the web server
 # Think of it like: "Turn on the website so people can visit it"
 if __name__ == '__main__':
@@ -0,0 +1,195 @@
+# Lazy Pagination
+# This module pages through ANY data without loading or counting all of it!
+
+# Step 1: Import the Tools We Need
+# What is this? We're importing tools for slicing iterators and timing
+# Think of it like: "Read only the pages we need from a very long book"
+import math
+import operator
+import time
+from itertools import islice
+# Explanation:
+# - math = math.ceil() turns a total into a number of pages
+# - operator.length_hint = Python's built-in "roughly how long is this?"
+# - time = Lets CachedCount know when its number is too old
+# - islice = Slices iterators and generators (they have no [start:end])
+
+# How to use:
+#   page = lazy_paginate(items, page=3, per_page=10)                  # No count
+#   page = lazy_paginate(items, page=3, per_page=10, total='exact')   # Exact count
+#   page = lazy_paginate(Post.query, page=3, total=post_count)        # Cached count
+#
+# Why? paginate() in app.py calls len(items) on every page view, so the
+# whole list must exist and be counted. Here we read per_page + 1 rows:
+# the extra row tells us if there is a next page, and counting is optional.
+
+
+# Step 2: Create the Page Object
+# What is this? One page of items plus the links around it
+class LazyPage:
+    """
+    One page of a lazily paginated source
+
+    Attributes:
+    - items: The items on this page
+    - page: Current page number (starting at 1)
+    - per_page: Items per page
+    - has_next: True if there is at least one more item after this page
+    - total_items: Total number of items, or None if it was not counted
+    - total_is_exact: False if total_items is only an estimate
+    """
+
+    def __init__(self, items, page, per_page, has_next, total_items=None, total_is_exact=True):
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.has_next = has_next
+        self.total_items = total_items
+        self.total_is_exact = total_is_exact if total_items is not None else False
+
+    @property
+    def has_prev(self):
+        return self.page > 1
+
+    @property
+    def prev_page(self):
+        return self.page - 1 if self.has_prev else None
+
+    @property
+    def next_page(self):
+        return self.page + 1 if self.has_next else None
+
+    @property
+    def total_pages(self):
+        """Number of pages, or None if the total is unknown"""
+        if self.total_items is None:
+            return None
+        return max(math.ceil(self.total_items / self.per_page), self.page if self.items else 1)
+        # Explanation:
+        # - An estimate might be too small; we never show fewer pages than
+        #   the one we are on
+    # Explanation:
+    # - Same names as the dictionary paginate() returns, so the same
+    #   template works for both (page.items, page.has_next, ...)
+
+
+# Step 3: Paginate Lazily
+# What is this? Reading just one page (plus one item) from the source
+def lazy_paginate(source, page=1, per_page=10, total=None):
+    """
+    Return one page of a list, generator or SQLAlchemy query
+
+    Args:
+    - source: A list/tuple/range, any iterable (like a generator),
+      or a query with .offset() and .limit()
+    - page: Page number (starting at 1)
+    - per_page: Items per page
+    - total: How to get the total number of items:
+      - None = Don't count (fastest; no "Page X of Y")
+      - 'exact' = Count everything (len(), query.count(), or reading to the end)
+      - 'estimate' = Use a cheap guess (len() or operator.length_hint())
+      - A number = Use this total (e.g. counted earlier)
+      - A function = Call it to get the total (e.g. a CachedCount)
+
+    Returns:
+    - LazyPage
+    """
+    page = max(page, 1)
+    per_page = max(per_page, 1)
+    start = (page - 1) * per_page
+    # Explanation:
+    # - No "page > total_pages" check: we may not know total_pages!
+    # - A page past the end is just an empty page
+
+    # Step 4: Read per_page + 1 Items
+    iterator = None
+    if hasattr(source, 'offset') and hasattr(source, 'limit'):
+        rows = source.offset(start).limit(per_page + 1).all()
+        # Explanation:
+        # - A database query: OFFSET + LIMIT, run by the database
+    elif hasattr(source, '__getitem__') and hasattr(source, '__len__'):
+        rows = list(source[start:start + per_page + 1])
+        # Explanation:
+        # - A list, tuple or range: slicing copies only this page
+    else:
+        iterator = iter(source)
+        rows = list(islice(iterator, start, start + per_page + 1))
+        # Explanation:
+        # - A generator: islice skips to the page and stops after it
+        # - Items after this page are never created!
+
+    has_next = len(rows) > per_page
+    read = start + len(rows)
+    rows = rows[:per_page]
+    # Explanation:
+    # - Got the extra item? Then there is a next page
+    # - No need to know the total for Previous/Next links
+
+    # Step 5: Get the Total (Only If Asked)
+    if not has_next and (rows or page == 1):
+        total_items, exact = start + len(rows), True
+    else:
+        total_items, exact = _total(source, total, iterator, read)
+    # Explanation:
+    # - On the last page we know the exact total for free
+    # - Otherwise we only count when `total` asks for it
+    return LazyPage(rows, page, per_page, has_next, total_items, exact)
+
+
+def _total(source, total, iterator, read):
+    """Return (total items or None, is it exact?)"""
+    if total is None:
+        return None, False
+    if total == 'exact':
+        if hasattr(source, 'count') and hasattr(source, 'limit'):
+            return source.count(), True
+        if hasattr(source, '__len__'):
+            return len(source), True
+        return read + sum(1 for _ in iterator), True
+    if total == 'estimate':
+        if hasattr(source, '__len__'):
+            return len(source), True
+        hint = operator.length_hint(iterator, -1) if iterator is not None else -1
+        return (read + hint, False) if hint >= 0 else (None, False)
+    if callable(total):
+        total = total()
+    return total, True
+    # Explanation:
+    # - 'exact' on a generator = Read (and throw away) the rest of it,
+    #   adding to the `read` items we already took - slow, but exact
+    # - length_hint() = Python's "about this many are left" (-1 = no idea)
+    # - Queries have no cheap guess: pass a number or a CachedCount instead
+    # - A function (like CachedCount) is only called when a total is wanted
+
+
+# Step 6: Cache an Expensive Count
+# What is this? Remember a count for a while instead of counting every time
+class CachedCount:
+    """
+    Remembers the result of a count function for `ttl` seconds
+
+    Example:
+        post_count = CachedCount(lambda: Post.query.count(), ttl=60)
+        lazy_paginate(Post.query, page, total=post_count)
+    """
+
+    def __init__(self, count, ttl=60):
+        self.count = count
+        self.ttl = ttl
+        self._value = None
+        self._expires = 0.0
+
+    def __call__(self):
+        now = time.monotonic()
+        if self._value is None or now >= self._expires:
+            self._value = self.count()
+            self._expires = now + self.ttl
+        return self._value
+        # Explanation:
+        # - First call (or after ttl seconds) = Really count
+        # - Every other call = Return the remembered number instantly
+        # - "Page 3 of 12" may be a minute out of date; that's usually fine
+
+    def invalidate(self):
+        """Forget the remembered count (call after adding or deleting items)"""
+        self._value = None
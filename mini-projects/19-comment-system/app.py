@@ -7,6 +7,11 @@
 from flask import Flask, render_template, request, redirect, url_for, flash
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             '..', '11-blog-simple-database'))
+from keyset_pagination import keyset_paginate
 # Explanation:
 # - Flask = The main Flask class
 # - render_template = Function to display HTML templates
@@ -16,6 +21,10 @@ from datetime import datetime
 # - flash = Function to show messages to users
 # - SQLAlchemy = Database toolkit
 # - datetime = Module for working with dates and times
+# - keyset_paginate = Shows comments one page at a time
+# - sys.path.append(...) = keyset_pagination.py lives in the Blog project
+#   (11-blog-simple-database); we use that one copy instead of our own,
+#   so a fix there fixes every project that pages with it
 # - We'll use SQLAlchemy to store comments in a database!
 
 # Step 2: Create the Flask Application
@@ -74,6 +83,12 @@ class Comment(db.Model):
     # - Table = Like a spreadsheet with rows and columns
     # - This table will store all our comments
     
+    __table_args__ = (db.Index('ix_comments_date_created_id', 'date_created', 'id'),)
+    # Explanation:
+    # - db.Index = A sorted lookup table the database keeps for us
+    # - (date_created, id) = The order the home page lists comments in
+    # - Lets every page of comments start right where the last one ended
+    
     # Step 7: Define Columns (Fields)
     # What is this? Defining what data each comment will have
     # Think of it like: "What information does each comment need?"
@@ -143,6 +158,13 @@ with app.app_context():
     # - Looks at our models (like Comment) and creates tables
     # - If tables already exist, does nothing
     # - This builds the database structure
+    
+    for index in Comment.__table__.indexes:
+        index.create(db.engine, checkfirst=True)
+    # Explanation:
+    # - create_all() skips tables that already exist, so a database made
+    #   before the index was added would never get it
+    # - checkfirst=True = Only creates the index if it isn't there yet
 
 # Step 10: Create Home Route (GET)
 # What is this? The main page that shows all comments
@@ -158,26 +180,30 @@ def index():
     This function runs when someone visits the home page
     It shows all comments from the database
     """
-    # Step 11: Get All Comments from Database
-    # What is this? Fetching all comments from the database
-    comments = Comment.query.order_by(Comment.date_created.desc()).all()
+    # Step 11: Get One Page of Comments from Database
+    # What is this? Fetching the next 20 comments from the database
+    page = keyset_paginate(Comment.query, [Comment.date_created, Comment.id],
+                           per_page=20, cursor=request.args.get('cursor'))
+    comments = page.items
     # Explanation:
     # - Comment.query = Query object for Comment model
-    # - .order_by(Comment.date_created.desc()) = Sort by date, newest first
-    # - .desc() = Descending order (newest to oldest)
-    # - .all() = Get all comments (returns a list)
-    # - comments = List of all Comment objects
-    # - This is like saying: "Get all comments, sorted by date, newest first"
+    # - [Comment.date_created, Comment.id] = Sort by date, newest first
+    #   (id breaks ties between comments created at the same moment)
+    # - cursor = Where the previous page stopped (from the URL)
+    # - Only 20 comments are loaded, not the whole table!
+    # - comments = List of Comment objects on this page
+    # - No total count: .count() would read every row on every page
     
     # Step 12: Render Template with Comments
-    # What is this? Showing the HTML page with all comments
-    return render_template('index.html', comments=comments)
+    # What is this? Showing the HTML page with this page of comments
+    return render_template('index.html', comments=comments, page=page)
     # Explanation:
     # - render_template = Function that displays HTML templates
     # - 'index.html' = The template file to display
     # - comments=comments = Passes the comments list to the template
     # - The first 'comments' = Variable name in the template
     # - The second comments = The actual comments list from Python
+    # - page=page = Used for the "Newer" and "Older" links
     # - In the template, we can use comments to display them
 
 # Step 13: Create Add Comment Route (POST)
@@ -8,6 +8,11 @@ from flask import Flask, render_template, request, redirect, url_for, flash, ses
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             '..', '11-blog-simple-database'))
+from keyset_pagination import keyset_paginate
 # Explanation:
 # - Flask = The main Flask class
 # - render_template = Function to display HTML templates
@@ -21,6 +26,10 @@ from werkzeug.security import generate_password_hash, check_password_hash
 # - datetime = Module for working with dates and times
 # - generate_password_hash = Function to hash passwords securely
 # - check_password_hash = Function to verify password hashes
+# - keyset_paginate = Shows notifications one page at a time
+# - sys.path.append(...) = keyset_pagination.py lives in the Blog project
+#   (11-blog-simple-database); we use that one copy instead of our own,
+#   so a fix there fixes every project that pages with it
 # - We'll use SQLAlchemy to store users and notifications!
 
 # Step 2: Create the Flask Application
@@ -126,6 +135,12 @@ class Notification(db.Model):
     # - __tablename__ = Special variable for table name
     # - 'notifications' = Name of the table in database
     
+    __table_args__ = (db.Index('ix_notifications_user_date_created_id', 'user_id', 'date_created', 'id'),)
+    # Explanation:
+    # - db.Index = A sorted lookup table the database keeps for us
+    # - (user_id, date_created, id) = One user's notifications, newest first
+    # - Lets every page of notifications start right where the last one ended
+    
     id = db.Column(db.Integer, primary_key=True)
     # Explanation:
     # - id = Unique identifier
@@ -184,6 +199,13 @@ with app.app_context():
     # Explanation:
     # - db.create_all() = Creates all database tables
     # - Looks at our models and creates tables
+    
+    for index in Notification.__table__.indexes:
+        index.create(db.engine, checkfirst=True)
+    # Explanation:
+    # - create_all() skips tables that already exist, so a database made
+    #   before the index was added would never get it
+    # - checkfirst=True = Only creates the index if it isn't there yet
 
 # Step 9: Helper Functions
 # What is this? Functions to help with authentication
@@ -514,14 +536,18 @@ def notifications():
     # - get_current_user() = Gets logged-in user
     # - current_user = User object
     
-    # Step 27: Get All Notifications
-    # What is this? Getting all notifications for the user
-    all_notifications = Notification.query.filter_by(user_id=current_user.id).order_by(Notification.date_created.desc()).all()
+    # Step 27: Get One Page of Notifications
+    # What is this? Getting the next 20 notifications for the user
+    user_notifications = Notification.query.filter_by(user_id=current_user.id)
+    page = keyset_paginate(user_notifications, [Notification.date_created, Notification.id],
+                           per_page=20, cursor=request.args.get('cursor'))
     # Explanation:
     # - Notification.query.filter_by(user_id=current_user.id) = Find notifications for user
-    # - .order_by(Notification.date_created.desc()) = Sort by date, newest first
-    # - .all() = Get all matching notifications
-    # - all_notifications = List of all notifications for user
+    # - [Notification.date_created, Notification.id] = Sort by date, newest first
+    #   (id breaks ties between notifications created at the same moment)
+    # - cursor = Where the previous page stopped (from the URL)
+    # - page.items = Only this page's notifications are loaded
+    # - No total count: .count() would read all of them on every page
     
     # Step 28: Get Unread Count
     # What is this? Counting unread notifications
@@ -531,11 +557,12 @@ def notifications():
     # - .count() = Counts how many match
     # - unread_count = Number of unread notifications
     
-    return render_template('notifications.html', notifications=all_notifications, unread_count=unread_count, current_user=current_user)
+    return render_template('notifications.html', notifications=page.items, page=page, unread_count=unread_count, current_user=current_user)
     # Explanation:
     # - render_template = Displays HTML template
     # - 'notifications.html' = Notifications list template
-    # - notifications=all_notifications = Passes notifications to template
+    # - notifications=page.items = Passes this page of notifications to template
+    # - page=page = Used for the "Newer" and "Older" links
     # - unread_count=unread_count = Passes unread count to template
     # - current_user=current_user = Passes current user to template
 
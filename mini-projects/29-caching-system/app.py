@@ -6,6 +6,8 @@
 # Think of it like: "Get Flask tools and caching tools"
 from flask import Flask, render_template, request, jsonify
 from flask_caching import Cache
+from cache_decorators import RefreshAhead, SingleFlight
+from cache_metrics import metrics
 import time
 import random
 # Explanation:
@@ -14,6 +16,9 @@ import random
 # - request = Object that contains request data
 # - jsonify = Function to return JSON responses
 # - Cache = Flask-Caching extension for caching
+# - SingleFlight = Our request coalescer (see cache_decorators.py)
+# - RefreshAhead = Our stale-while-revalidate decorator (see cache_decorators.py)
+# - metrics = Live cache statistics (see cache_metrics.py)
 # - time = Module for time-related functions
 # - random = Module for random number generation
 # - We'll use caching to store frequently accessed data!
@@ -30,14 +35,57 @@ app = Flask(__name__)
 # Step 3: Configure Caching
 # What is this? Setting up caching system
 # Think of it like: "Tell Flask how to cache data"
-app.config['CACHE_TYPE'] = 'SimpleCache'
+app.config['CACHE_TYPE'] = 'cache_backends.TieredCache'
 # Explanation:
 # - app.config = Flask configuration dictionary
 # - 'CACHE_TYPE' = Type of cache to use
-# - 'SimpleCache' = In-memory cache (simple, no Redis needed)
-# - This stores data in Python's memory
+# - 'cache_backends.TieredCache' = Our two-tier cache (see cache_backends.py)
+# - L1 = Small LRU cache inside each worker process (no I/O at all)
+# - L2 = SQLite file shared by every worker process
+# - With 4 gunicorn workers, each key is computed once, not four times!
+# - You can still switch back to 'SimpleCache' (in-memory, one process only)
 # - For production, use 'RedisCache' with Redis server
 
+app.config['CACHE_THRESHOLD'] = 500
+# Explanation:
+# - 'CACHE_THRESHOLD' = Maximum entries in each worker's L1 cache
+# - When L1 is full, the least recently used entry is demoted to L2
+# - This keeps memory bounded no matter how many keys we see
+
+app.config['CACHE_MAX_BYTES'] = 64 * 1024 * 1024
+# Explanation:
+# - 'CACHE_MAX_BYTES' = Memory budget for each worker's L1 cache (64 MB)
+# - Every value's pickled size is counted, so a few huge JSON
+#   payloads can no longer push a worker past its memory limit
+
+app.config['CACHE_EVICTION_POLICY'] = 'gds'
+# Explanation:
+# - 'CACHE_EVICTION_POLICY' = Which entry to drop when L1 is full
+# - 'lru' = Least recently used
+# - 'gds' = GreedyDual-Size: drops big, cheap-to-recompute values first
+#   and keeps small, expensive ones (evictions show up in /api/cache-stats)
+# - Want a single-process cache with a byte budget instead?
+#   Use CACHE_TYPE = 'cache_backends.SizeBoundedCache'
+
+app.config['CACHE_SNAPSHOT_PATH'] = 'cache-snapshot.bin'
+app.config['CACHE_SNAPSHOT_INTERVAL'] = 60
+# Explanation:
+# - 'CACHE_SNAPSHOT_PATH' = File where each worker saves its hot L1 entries
+#   (relative paths go in the instance folder; None turns snapshots off)
+# - 'CACHE_SNAPSHOT_INTERVAL' = Save every 60 seconds AND on shutdown
+# - After a deploy, new workers memory-map this file on their first miss
+#   and reuse the saved values, so there is no slow "cold cache" period!
+
+app.config['CACHE_L1_TIMEOUT'] = 5
+# Explanation:
+# - 'CACHE_L1_TIMEOUT' = Seconds an L1 entry is trusted before L2 is re-checked
+# - If another worker deletes a key, we notice within 5 seconds
+
+app.config['CACHE_L2_PATH'] = None
+# Explanation:
+# - 'CACHE_L2_PATH' = Location of the shared SQLite file
+# - None = Use instance/cache.sqlite3 (Flask's instance folder)
+
 app.config['CACHE_DEFAULT_TIMEOUT'] = 300
 # Explanation:
 # - 'CACHE_DEFAULT_TIMEOUT' = Default time before cache expires
@@ -50,6 +98,22 @@ app.config['SECRET_KEY'] = 'your-secret-key-change-this-in-production'
 # - 'SECRET_KEY' = Secret key for Flask sessions
 # - Required for sessions to work
 
+app.config['EXPENSIVE_OPERATION_SECONDS'] = 2
+# Explanation:
+# - 'EXPENSIVE_OPERATION_SECONDS' = How long expensive_operation takes
+# - benchmark.py lowers this so a full benchmark run stays short
+
+app.config['CACHE_COALESCE'] = True
+# Explanation:
+# - 'CACHE_COALESCE' = Turn single-flight coalescing on or off
+# - benchmark.py turns it off to compare "cached" against "coalesced"
+
+app.config.from_prefixed_env()
+# Explanation:
+# - Reads environment variables that start with FLASK_
+# - Example: FLASK_CACHE_EVICTION_POLICY=lru overrides 'CACHE_EVICTION_POLICY'
+# - This lets benchmark.py start gunicorn with different cache settings
+
 # Step 4: Initialize Cache
 # What is this? Creating the cache object
 # Think of it like: "Create a cache manager"
@@ -59,6 +123,28 @@ cache = Cache(app)
 # - cache = Our cache manager
 # - This enables caching functionality!
 
+# Step 4b: Initialize Single-Flight Coalescing
+# What is this? Making sure only one caller computes a missing value
+# Think of it like: "One person goes to the shop, everyone else waits"
+single_flight = SingleFlight(cache)
+# Explanation:
+# - SingleFlight(cache) = Coalescer from cache_decorators.py
+# - When a hot key expires, many requests miss the cache at once
+# - Without coalescing, they ALL run the 2-second expensive_operation
+# - With coalescing, one request computes and the others wait for it
+# - Across worker processes, a lock in the shared cache picks the leader
+
+# Step 4c: Initialize Refresh-Ahead Caching
+# What is this? Serving stale data while fresh data is computed
+# Think of it like: "Keep serving yesterday's bread while today's bakes"
+refresh_ahead = RefreshAhead(cache)
+# Explanation:
+# - RefreshAhead(cache) = Decorators from cache_decorators.py
+# - Normally, when a cached value expires, the next user waits 2 seconds
+# - With stale_ttl, that user gets the old value instantly instead
+# - A background thread recomputes the value at the same time
+# - With beta, hot keys are refreshed a little BEFORE they expire
+
 # Step 5: Simulate Expensive Operation
 # What is this? Function that takes time to complete
 # Think of it like: "A slow operation we want to cache"
@@ -75,9 +161,9 @@ def expensive_operation(data_key):
     """
     # Step 6: Simulate Processing Time
     # What is this? Making the function take time
-    time.sleep(2)
+    time.sleep(app.config['EXPENSIVE_OPERATION_SECONDS'])
     # Explanation:
-    # - time.sleep(2) = Pause execution for 2 seconds
+    # - time.sleep(2) = Pause execution for 2 seconds (set in Step 3)
     # - This simulates a slow operation
     # - In real apps, this could be a database query or API call
     # - We want to cache this result so we don't have to wait every time!
@@ -175,12 +261,22 @@ def get_data_no_cache(key):
 # Step 10: Create Get Data Route (GET) - With Cache
 # What is this? Route that uses caching (fast!)
 @app.route('/api/data-cached/<key>')
-@cache.cached(timeout=60)
+@metrics.track('get_data_cached')
+@refresh_ahead.cached(timeout=60, stale_ttl=30, beta=1.0, tags=['data:{key}'])
+@single_flight.coalesce()
 # Explanation:
-# - @cache.cached(timeout=60) = Decorator that caches the result
-# - timeout=60 = Cache expires after 60 seconds
+# - @metrics.track(...) = Counts this endpoint's hits, misses and latency
+# - tags=['data:{key}'] = Labels the entry (e.g. 'data:test-key') so it
+#   can be invalidated later without knowing the exact cache key
+# - @refresh_ahead.cached(...) = Works like @cache.cached(timeout=60)
+# - timeout=60 = Cached value is fresh for 60 seconds
 # - If same request comes within 60 seconds, returns cached result
 # - This makes the route much faster!
+# - stale_ttl=30 = For 30 more seconds, the old value is served instantly
+#   while a background thread refreshes it
+# - beta=1.0 = Hot keys are refreshed early (XFetch), so they almost never expire
+# - @single_flight.coalesce() = Runs only on a cache miss
+# - If 50 requests miss at once, only one runs expensive_operation
 
 def get_data_cached(key):
     """
@@ -256,21 +352,85 @@ def clear_cache_key(key):
     """
     # Step 13: Clear Specific Cache Entry
     # What is this? Removing cached data for one key
-    cache.delete(key)
+    if hasattr(cache.cache, 'delete_tag'):
+        removed = cache.cache.delete_tag(f'data:{key}')
+    else:
+        removed = int(bool(cache.delete(f'view//api/data-cached/{key}')))
     # Explanation:
-    # - cache.delete(key) = Removes cached data for this key
+    # - The cached entry's real key is 'view//api/data-cached/<key>',
+    #   so cache.delete(key) would never find it
+    # - Instead we delete by tag: every entry tagged 'data:<key>'
+    # - SimpleCache and SizeBoundedCache have no tags, so there we
+    #   delete the view's own key instead
     # - Other cached data remains
     # - More efficient than clearing everything
     
     return jsonify({
         'message': f'Cache cleared for key: {key}',
+        'removed': removed,
         'timestamp': time.time()
     })
     # Explanation:
     # - jsonify() = Returns JSON response
     # - 'message' = Success message with key name
+    # - 'removed' = How many cached entries were deleted
     # - 'timestamp' = When cache was cleared
 
+# Step 12a: Helper for Backends Without Tags or Prefixes
+# What is this? The answer when the cache backend can't do targeted invalidation
+def invalidation_not_supported(kind):
+    """Return a 501 JSON response: this backend has no tag/prefix support"""
+    return jsonify({
+        'error': f'The {type(cache.cache).__name__} backend does not support '
+                 f'{kind} invalidation (use cache_backends.TieredCache, '
+                 'or POST /api/clear-cache to clear everything)'
+    }), 501
+    # Explanation:
+    # - delete_tag() and delete_prefix() only exist on TieredCache
+    # - 501 = Not Implemented (instead of crashing with a 500)
+
+# Step 12b: Create Clear by Tag Route (POST)
+# What is this? Route to clear every entry with a tag (like 'user:42')
+@app.route('/api/clear-cache/tag/<tag>', methods=['POST'])
+def clear_cache_tag(tag):
+    """
+    This function clears every cached entry carrying a tag
+    Only the dependent entries are removed
+    """
+    if not hasattr(cache.cache, 'delete_tag'):
+        return invalidation_not_supported('tag')
+    removed = cache.cache.delete_tag(tag)
+    # Explanation:
+    # - delete_tag() = Looks up the tag's entries and deletes only those
+    # - Cost grows with the number of removed entries, not the cache size
+    
+    return jsonify({
+        'message': f'Cache cleared for tag: {tag}',
+        'removed': removed,
+        'timestamp': time.time()
+    })
+
+# Step 12c: Create Clear by Prefix Route (POST)
+# What is this? Route to clear every entry whose key starts with a prefix
+@app.route('/api/clear-cache/prefix/<path:prefix>', methods=['POST'])
+def clear_cache_prefix(prefix):
+    """
+    This function clears every cached entry whose key starts with prefix
+    Example: POST /api/clear-cache/prefix/view//api/data-cached/
+    """
+    if not hasattr(cache.cache, 'delete_prefix'):
+        return invalidation_not_supported('prefix')
+    removed = cache.cache.delete_prefix(prefix)
+    # Explanation:
+    # - <path:prefix> = The prefix may contain slashes
+    # - delete_prefix() = Reads the matching key range from an index
+    
+    return jsonify({
+        'message': f'Cache cleared for prefix: {prefix}',
+        'removed': removed,
+        'timestamp': time.time()
+    })
+
 # Step 13: Create Cache Statistics Route (GET)
 # What is this? Route to get cache statistics
 @app.route('/api/cache-stats')
@@ -292,11 +452,24 @@ def cache_stats():
     # - 'default_timeout' = Default expiration time
     # - 'timestamp' = Current time
     
+    # Step 15: Add Live Statistics
+    # What is this? Real numbers from every worker process
+    if getattr(cache.cache, 'metrics', None) is not None:
+        stats.update(cache.cache.metrics.collect())
+    # Explanation:
+    # - cache.cache = The backend (TieredCache records live metrics)
+    # - collect() = Adds up the counters saved by every worker
+    # - 'total' = Hits, misses, hit ratio and latency for all lookups
+    # - 'scopes' = The same numbers per endpoint (@metrics.track)
+    # - 'l1_entries', 'l1_bytes', 'l2_entries', 'l2_bytes' = Cache size
+    # - 'evictions' = Entries removed because the cache was full
+    # - Other backends (like SimpleCache) only report the configuration
+    
     return jsonify(stats)
     # Explanation:
     # - jsonify() = Returns JSON response
     # - stats = Cache statistics
-    # - Client can see cache configuration
+    # - Client can see cache configuration and live statistics
 
 # Step 14: Run the Application
 # What is this? This starts the web server
@@ -0,0 +1,371 @@
+# Cache Benchmark
+# This script measures how much faster caching really makes the app!
+
+# Step 1: Import the Tools We Need
+# What is this? We're importing Python tools for timing and concurrency
+# Think of it like: "Get a stopwatch and a crowd of test users"
+import argparse
+import bisect
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+# Explanation:
+# - argparse = Reads command-line options (like --concurrency 16)
+# - bisect = Fast search in a sorted list (used to pick Zipfian keys)
+# - json = Reads the app's JSON responses
+# - subprocess = Starts gunicorn in the background
+# - ThreadPoolExecutor = Runs many requests at the same time
+# - urllib.request = Sends HTTP requests to gunicorn (no extra library)
+
+# How to use:
+#   python benchmark.py                          # in-process, every scenario
+#   python benchmark.py --mode gunicorn          # over a local gunicorn
+#   python benchmark.py --mode both --json results.json
+#   python benchmark.py --paths cached coalesced --policies gds
+#
+# gunicorn mode needs gunicorn installed: pip install gunicorn
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Step 2: Describe What We Compare
+# What is this? The routes, backends and policies a scenario can use
+PATHS = {
+    'uncached': ('/api/data/', False),
+    'cached': ('/api/data-cached/', False),
+    'coalesced': ('/api/data-cached/', True),
+}
+# Explanation:
+# - 'uncached' = /api/data/<key> (always runs expensive_operation)
+# - 'cached' = /api/data-cached/<key> with coalescing switched off
+# - 'coalesced' = /api/data-cached/<key> with single-flight coalescing
+
+BACKENDS = {
+    'tiered': 'cache_backends.TieredCache',
+    'size-bounded': 'cache_backends.SizeBoundedCache',
+    'simple': 'SimpleCache',
+}
+POLICIES = ('lru', 'gds')
+# Explanation:
+# - Each backend is tested with each eviction policy
+# - SimpleCache has no policy choice, so it runs once
+
+
+# Step 3: Generate Zipfian Keys
+# What is this? Picks keys the way real traffic does: a few are very hot
+# Think of it like: "Most people ask for the same few popular pages"
+class ZipfKeys:
+    """
+    Random key generator following a Zipf distribution
+
+    Args:
+    - n: Number of distinct keys
+    - s: Skew (1.0 is typical; higher = hotter hot keys)
+    - seed: Random seed, so every run replays the same sequence
+    """
+
+    def __init__(self, n, s=1.0, seed=42):
+        weights = [1.0 / (rank ** s) for rank in range(1, n + 1)]
+        total = sum(weights)
+        running = 0.0
+        self.cumulative = []
+        for weight in weights:
+            running += weight / total
+            self.cumulative.append(running)
+        self.random = random.Random(seed)
+        # Explanation:
+        # - Key number k is picked with probability proportional to 1 / k**s
+        # - cumulative = Running total of probabilities (ends at 1.0)
+
+    def sequence(self, count):
+        """Return a list of `count` keys like 'key-3'"""
+        keys = []
+        for _ in range(count):
+            rank = bisect.bisect_left(self.cumulative, self.random.random())
+            keys.append(f'key-{min(rank, len(self.cumulative) - 1)}')
+        return keys
+        # Explanation:
+        # - bisect finds which key's slice of [0, 1) the random number hit
+
+
+# Step 4: Create the Request Runners
+# What is this? Two ways of sending requests: in-process and over HTTP
+class InProcessTarget:
+    """Sends requests through Flask's test client (no network at all)"""
+
+    name = 'in-process'
+
+    def __init__(self, config):
+        import app as app_module
+        self.app_module = app_module
+        app_module.app.config.update(config)
+        app_module.cache.init_app(app_module.app)
+        app_module.cache.clear()
+        self._local = threading.local()
+        # Explanation:
+        # - import app = Uses the real application from app.py
+        # - cache.init_app() = Rebuilds the cache backend with the new config
+
+    def get(self, path):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app_module.app.test_client()
+        response = client.get(path)
+        return response.status_code, response.get_json()
+        # Explanation:
+        # - One test client per thread (clients are not shared)
+
+    def stats(self):
+        backend = self.app_module.cache.cache
+        result = {'rss_bytes': _rss_bytes([os.getpid()])}
+        if getattr(backend, 'metrics', None) is not None:
+            collected = backend.metrics.collect()
+            result['cache_bytes'] = collected['l1_bytes'] + collected.get('l2_bytes', 0)
+            result['evictions'] = collected['evictions']
+        return result
+
+    def close(self):
+        pass
+
+
+class GunicornTarget:
+    """Starts a local gunicorn and sends requests over HTTP"""
+
+    name = 'gunicorn'
+
+    def __init__(self, config, workers=4, threads=8):
+        self.port = _free_port()
+        env = dict(os.environ)
+        for key, value in config.items():
+            env['FLASK_' + key] = json.dumps(value)
+        self.process = subprocess.Popen(
+            ['gunicorn', '-w', str(workers), '--threads', str(threads),
+             '-b', f'127.0.0.1:{self.port}', '--log-level', 'warning', 'app:app'],
+            cwd=PROJECT_DIR, env=env)
+        self._wait_until_ready()
+        # Explanation:
+        # - FLASK_* environment variables = Read by app.config.from_prefixed_env()
+        # - json.dumps = Flask parses each value as JSON (so 0.05 stays a number)
+        # - -w = Worker processes, --threads = Threads per worker
+
+    def _wait_until_ready(self, timeout=30):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            try:
+                urllib.request.urlopen(self._url('/api/cache-stats'), timeout=1).read()
+                return
+            except OSError:
+                time.sleep(0.2)
+        self.close()
+        raise RuntimeError('gunicorn did not start within %d seconds' % timeout)
+
+    def _url(self, path):
+        return f'http://127.0.0.1:{self.port}{path}'
+
+    def get(self, path):
+        with urllib.request.urlopen(self._url(path), timeout=60) as response:
+            return response.status, json.loads(response.read())
+
+    def stats(self):
+        _, collected = self.get('/api/cache-stats')
+        result = {'rss_bytes': _rss_bytes(_children(self.process.pid) + [self.process.pid])}
+        if 'l1_bytes' in collected:
+            result['cache_bytes'] = collected['l1_bytes'] + collected.get('l2_bytes', 0)
+            result['evictions'] = collected['evictions']
+        return result
+
+    def close(self):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+# Step 5: Run One Scenario
+# What is this? Replays the key sequence and measures everything
+def run_scenario(target, path_prefix, keys, concurrency):
+    """
+    Send one request per key with `concurrency` requests in flight
+
+    Returns:
+    - Dictionary with throughput, latency percentiles and hit ratio
+    """
+    latencies = []
+    hits = []
+
+    def one(key):
+        start_wall = time.time()
+        start = time.perf_counter()
+        status, data = target.get(path_prefix + key)
+        latencies.append(time.perf_counter() - start)
+        hits.append(status == 200 and data['timestamp'] < start_wall)
+        # Explanation:
+        # - data['timestamp'] = When expensive_operation produced the value
+        # - Produced BEFORE this request started = served from cache (a hit)
+        # - Produced during the request = this request waited for it (a miss)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, keys))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': len(keys),
+        'throughput_rps': len(keys) / elapsed,
+        'p50_ms': _percentile(latencies, 0.50) * 1000,
+        'p99_ms': _percentile(latencies, 0.99) * 1000,
+        'hit_ratio': sum(hits) / len(hits),
+    }
+
+
+def _percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+# Step 6: Helper Functions
+def _free_port():
+    """Ask the OS for a free TCP port"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _children(pid):
+    """Return the PIDs of a process's children (Linux only)"""
+    children = []
+    for entry in os.listdir('/proc') if os.path.isdir('/proc') else []:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            children.append(int(entry))
+    return children
+
+
+def _rss_bytes(pids):
+    """Return the total resident memory of some processes (Linux only)"""
+    total = 0
+    for pid in pids:
+        try:
+            with open(f'/proc/{pid}/statm') as f:
+                total += int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError):
+            return None
+    return total
+
+
+def scenarios(args):
+    """List (name, path, config) for every combination we benchmark"""
+    for path_name in args.paths:
+        path_prefix, coalesce = PATHS[path_name]
+        if path_name == 'uncached':
+            yield path_name, path_prefix, {'CACHE_TYPE': 'SimpleCache'}
+            continue
+        for backend_name in args.backends:
+            policies = [None] if backend_name == 'simple' else args.policies
+            for policy in policies:
+                config = {
+                    'CACHE_TYPE': BACKENDS[backend_name],
+                    'CACHE_COALESCE': coalesce,
+                    'CACHE_THRESHOLD': args.l1_entries,
+                    'CACHE_MAX_BYTES': args.max_bytes,
+                    'CACHE_SNAPSHOT_PATH': None,
+                }
+                if policy:
+                    config['CACHE_EVICTION_POLICY'] = policy
+                label = f'{path_name}/{backend_name}' + (f'/{policy}' if policy else '')
+                yield label, path_prefix, config
+    # Explanation:
+    # - Snapshots are switched off so every scenario starts cold
+
+
+# Step 7: Run Everything and Print a Table
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the caching system app')
+    parser.add_argument('--mode', choices=['in-process', 'gunicorn', 'both'],
+                        default='in-process')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--keys', type=int, default=500, help='distinct keys')
+    parser.add_argument('--zipf-s', type=float, default=1.0, help='Zipf skew')
+    parser.add_argument('--delay', type=float, default=0.05,
+                        help='seconds expensive_operation takes')
+    parser.add_argument('--paths', nargs='+', choices=list(PATHS), default=list(PATHS))
+    parser.add_argument('--backends', nargs='+', choices=list(BACKENDS),
+                        default=list(BACKENDS))
+    parser.add_argument('--policies', nargs='+', choices=POLICIES, default=list(POLICIES))
+    parser.add_argument('--l1-entries', type=int, default=100)
+    parser.add_argument('--max-bytes', type=int, default=1024 * 1024)
+    parser.add_argument('--workers', type=int, default=4, help='gunicorn workers')
+    parser.add_argument('--threads', type=int, default=8, help='gunicorn threads')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args(argv)
+    # Explanation:
+    # - Small --l1-entries / --max-bytes make eviction policies matter
+    # - The same --seed replays exactly the same key sequence
+
+    modes = ['in-process', 'gunicorn'] if args.mode == 'both' else [args.mode]
+    if 'gunicorn' in modes and shutil.which('gunicorn') is None:
+        print('gunicorn is not installed (pip install gunicorn); skipping that mode')
+        modes.remove('gunicorn')
+
+    keys = ZipfKeys(args.keys, args.zipf_s, args.seed).sequence(args.requests)
+    sys.path.insert(0, PROJECT_DIR)
+    results = []
+    header = (f"{'mode':<11} {'scenario':<28} {'req/s':>9} {'p50 ms':>9} "
+              f"{'p99 ms':>9} {'hit %':>6} {'RSS MB':>8} {'cache KB':>9}")
+    print(header)
+    print('-' * len(header))
+
+    for mode in modes:
+        for label, path_prefix, config in scenarios(args):
+            with tempfile.TemporaryDirectory() as tmp:
+                config = dict(config, EXPENSIVE_OPERATION_SECONDS=args.delay,
+                              CACHE_L2_PATH=os.path.join(tmp, 'cache.sqlite3'))
+                if mode == 'in-process':
+                    target = InProcessTarget(config)
+                else:
+                    target = GunicornTarget(config, args.workers, args.threads)
+                try:
+                    result = run_scenario(target, path_prefix, keys, args.concurrency)
+                    result.update(target.stats())
+                finally:
+                    target.close()
+            # Explanation:
+            # - Every scenario gets its own empty L2 file in a temp folder
+            # - target.close() stops gunicorn even if something fails
+
+            result.update(mode=mode, scenario=label)
+            results.append(result)
+            rss = result.get('rss_bytes')
+            cache_bytes = result.get('cache_bytes')
+            print(f"{mode:<11} {label:<28} {result['throughput_rps']:>9.1f} "
+                  f"{result['p50_ms']:>9.2f} {result['p99_ms']:>9.2f} "
+                  f"{result['hit_ratio'] * 100:>6.1f} "
+                  f"{rss / 1e6 if rss else float('nan'):>8.1f} "
+                  f"{cache_bytes / 1e3 if cache_bytes is not None else float('nan'):>9.1f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'settings': vars(args), 'results': results}, f, indent=2)
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,924 @@
+# Cache Backends
+# This module adds a two-tier cache for the Caching System app!
+
+# Step 1: Import the Tools We Need
+# What is this? We're importing Python tools and the Flask-Caching base class
+# Think of it like: "Get the building blocks for our own cache"
+import heapq
+import itertools
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask_caching.backends.base import BaseCache
+
+from cache_metrics import (L1_HIT, L2_HIT, MISS, SET, SNAPSHOT_HIT,
+                           metrics as default_metrics)
+from cache_snapshot import CacheSnapshot
+# Explanation:
+# - heapq = Priority queue (finds the cheapest entry to evict)
+# - itertools = Counter for breaking ties in the priority queue
+# - os = Module for files and process IDs
+# - pickle = Turns Python objects into bytes (and back)
+# - sqlite3 = Built-in SQLite database (a file every worker can share)
+# - threading = Locks so several threads can use the cache safely
+# - time = Module for time-related functions
+# - OrderedDict = Dictionary that remembers order (perfect for LRU!)
+# - BaseCache = The class every Flask-Caching backend builds on
+# - cache_metrics = Live hit/miss counters and latency histograms
+# - CacheSnapshot = Saves the hot set to a file for warm starts
+
+# Step 2: Understand the Two Tiers
+# What is this? A quick map of how the cache is organised
+# Think of it like: "A desk drawer (L1) in front of a filing cabinet (L2)"
+# Explanation:
+# - L1 = Small LRU cache inside each worker process (fastest, no I/O)
+# - L2 = SQLite file shared by every worker process (survives restarts)
+# - Promotion = An L2 hit is copied into L1 so the next hit stays local
+# - Demotion = When L1 is full, the least recently used entry is dropped
+#   from L1 but stays in L2 (every write goes to both tiers)
+# - With 4 gunicorn workers, expensive_operation runs once per key
+#   instead of once per key per worker!
+
+
+# Step 3: Create the L1 Store (In-Process LRU)
+# What is this? A bounded dictionary that forgets the oldest entries
+# Think of it like: "A desk drawer that only holds a few folders"
+class LRUStore:
+    """
+    Bounded least-recently-used store for pickled cache entries
+
+    Args:
+    - max_entries: Maximum number of entries kept in memory (None = no limit)
+    - max_bytes: Maximum total size of the pickled values (None = no limit)
+    """
+
+    def __init__(self, max_entries=500, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Explanation:
+        # - bytes = Total size of the pickled values we hold
+        # - evictions = How many entries were pushed out because L1 was full
+        # - evicted_bytes = How many bytes those entries held
+        # - _entries = key -> (l1_expires, expires, blob)
+        # - l1_expires = When this worker must re-check L2
+        # - expires = When the value itself expires (0 = never)
+        # - blob = The pickled value (bytes)
+        # - _lock = Keeps threads from changing the OrderedDict together
+
+    def get(self, key, now):
+        """Return (expires, blob) for a fresh entry, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] and entry[0] <= now:
+                del self._entries[key]
+                self.bytes -= len(entry[2])
+                return None
+            self._entries.move_to_end(key)
+            return entry[1], entry[2]
+        # Explanation:
+        # - move_to_end() = Marks the key as "most recently used"
+        # - Expired entries are removed as soon as we see them
+
+    def set(self, key, l1_expires, expires, blob, cost=1.0):
+        """Store an entry and return the list of evicted keys"""
+        evicted = []
+        with self._lock:
+            old = self._entries.get(key)
+            if old is not None:
+                self.bytes -= len(old[2])
+            self._entries[key] = (l1_expires, expires, blob)
+            self._entries.move_to_end(key)
+            self.bytes += len(blob)
+            while self._entries and (
+                    (self.max_entries is not None and len(self._entries) > self.max_entries)
+                    or (self.max_bytes is not None and self.bytes > self.max_bytes)):
+                old_key, old = self._entries.popitem(last=False)
+                self.bytes -= len(old[2])
+                self.evicted_bytes += len(old[2])
+                evicted.append(old_key)
+            self.evictions += len(evicted)
+        return evicted
+        # Explanation:
+        # - popitem(last=False) = Removes the least recently used entry
+        # - We evict until BOTH the entry limit and the byte limit hold
+        #   (a limit set to None is never exceeded)
+        # - cost = Ignored by LRU (only GreedyDualSizeStore uses it)
+        # - evicted = Keys demoted to L2 (they are still stored there)
+
+    def delete(self, key):
+        """Remove one key, return True if it was present"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return False
+            self.bytes -= len(entry[2])
+            return True
+
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def hot_items(self, limit=None):
+        """Return [(key, expires, blob)], most recently used first"""
+        now = time.time()
+        with self._lock:
+            entries = list(self._entries.items())
+        entries.reverse()
+        items = [(key, e[1], e[2]) for key, e in entries if not e[1] or e[1] > now]
+        return items[:limit] if limit else items
+        # Explanation:
+        # - The end of the OrderedDict is the most recently used entry
+        # - Expired values are left out
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Step 3b: Create a Cost-Aware L1 Store (GreedyDual-Size)
+# What is this? A byte-bounded store that evicts the "cheapest" entries
+# Think of it like: "Keep the folders that are small and hard to replace"
+class GreedyDualSizeStore:
+    """
+    Byte-bounded store using the GreedyDual-Size eviction policy
+
+    Every entry gets a priority H = L + cost / size, where size is the
+    pickled size in bytes and cost is how expensive the value is to
+    recompute. The entry with the lowest H is evicted, and L is raised to
+    that H, so entries that are not used again slowly "age" out.
+
+    Args:
+    - max_bytes: Maximum total size of the pickled values
+    - max_entries: Optional maximum number of entries (None = no limit)
+    """
+
+    ENTRY_OVERHEAD = 100
+    # Explanation:
+    # - Rough bytes of bookkeeping per entry (key, tuple, heap item)
+    # - Counted in the budget so millions of tiny entries can't sneak past
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, max_entries=None):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.bytes = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+        self._inflation = 0.0
+        self._entries = {}
+        self._heap = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        # Explanation:
+        # - _inflation = L in the formula (the H of the last evicted entry)
+        # - _entries = key -> [H, seq, l1_expires, expires, blob, cost, size]
+        # - _heap = (H, seq, key) items; the smallest H is at the top
+        # - seq = Unique number, so outdated heap items can be skipped
+
+    def _size(self, key, blob):
+        return len(blob) + len(key) + self.ENTRY_OVERHEAD
+
+    def _push(self, key, entry):
+        """Give an entry a fresh priority and add it to the heap"""
+        entry[0] = self._inflation + entry[5] / entry[6]
+        entry[1] = next(self._counter)
+        heapq.heappush(self._heap, (entry[0], entry[1], key))
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [(e[0], e[1], k) for k, e in self._entries.items()]
+            heapq.heapify(self._heap)
+        # Explanation:
+        # - Old heap items are not removed (that would be slow); instead
+        #   they are skipped later because their seq no longer matches
+        # - If the heap gets twice as big as needed, we rebuild it
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[6]
+        return entry
+
+    def get(self, key, now):
+        """Return (expires, blob) for a fresh entry, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[2] and entry[2] <= now:
+                self._remove(key)
+                return None
+            self._push(key, entry)
+            return entry[3], entry[4]
+        # Explanation:
+        # - A hit raises the entry's priority back to L + cost / size
+
+    def set(self, key, l1_expires, expires, blob, cost=1.0):
+        """Store an entry and return the list of evicted keys"""
+        size = self._size(key, blob)
+        evicted = []
+        with self._lock:
+            self._remove(key)
+            if size > self.max_bytes:
+                return evicted
+            entry = [0.0, 0, l1_expires, expires, blob, max(cost, 1e-9), size]
+            self._entries[key] = entry
+            self.bytes += size
+            self._push(key, entry)
+            while self.bytes > self.max_bytes or (
+                    self.max_entries is not None and len(self._entries) > self.max_entries):
+                priority, seq, victim = heapq.heappop(self._heap)
+                current = self._entries.get(victim)
+                if current is None or current[1] != seq:
+                    continue
+                self._inflation = priority
+                self._remove(victim)
+                self.evicted_bytes += current[6]
+                evicted.append(victim)
+            self.evictions += len(evicted)
+        return evicted
+        # Explanation:
+        # - A value bigger than the whole budget is simply not cached
+        # - We pop the lowest H until the budget holds again
+        # - Big, cheap values go first; small, expensive values stay
+
+    def delete(self, key):
+        """Remove one key, return True if it was present"""
+        with self._lock:
+            return self._remove(key) is not None
+
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            self._entries.clear()
+            self._heap = []
+            self.bytes = 0
+            self._inflation = 0.0
+
+    def hot_items(self, limit=None):
+        """Return [(key, expires, blob)], highest priority first"""
+        now = time.time()
+        with self._lock:
+            entries = sorted(self._entries.items(), key=lambda item: -item[1][0])
+        items = [(key, e[3], e[4]) for key, e in entries if not e[3] or e[3] > now]
+        return items[:limit] if limit else items
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def make_l1_store(policy='lru', max_entries=500, max_bytes=None):
+    """
+    Create an in-process store for the given eviction policy
+
+    Args:
+    - policy: 'lru' (least recently used) or 'gds' (GreedyDual-Size)
+    - max_entries: Maximum number of entries (None = no limit)
+    - max_bytes: Maximum total bytes (required for 'gds')
+
+    Returns:
+    - LRUStore or GreedyDualSizeStore
+    """
+    if policy == 'lru':
+        return LRUStore(max_entries=max_entries, max_bytes=max_bytes)
+    if policy == 'gds':
+        return GreedyDualSizeStore(max_bytes=max_bytes or 64 * 1024 * 1024,
+                                   max_entries=max_entries)
+    raise ValueError(f'Unknown eviction policy: {policy!r} (use "lru" or "gds")')
+
+
+# Step 4: Create the L2 Store (Shared SQLite File)
+# What is this? A cache table in a SQLite file that all workers open
+# Think of it like: "A filing cabinet the whole office shares"
+class SQLiteStore:
+    """
+    Shared cache store backed by a SQLite file
+
+    Args:
+    - path: Location of the SQLite database file
+    - threshold: Maximum number of rows before old entries are pruned
+    """
+
+    def __init__(self, path, threshold=10000):
+        self.path = path
+        self.threshold = threshold
+        self.evictions = 0
+        self._local = threading.local()
+        self._writes = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL)'
+            )
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS tags ('
+                'tag TEXT NOT NULL, key TEXT NOT NULL, PRIMARY KEY (tag, key)) '
+                'WITHOUT ROWID'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS tags_by_key ON tags (key)')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS stats ('
+                'pid INTEGER PRIMARY KEY, payload TEXT NOT NULL, updated REAL NOT NULL)'
+            )
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS meta ('
+                'name TEXT PRIMARY KEY, value INTEGER NOT NULL)'
+            )
+            conn.execute("INSERT OR IGNORE INTO meta (name, value) VALUES ('generation', 0)")
+        # Explanation:
+        # - _local = One SQLite connection per thread (SQLite requires this)
+        # - key TEXT PRIMARY KEY = Lookups by key use an index
+        # - expires = Unix time when the entry expires (0 = never)
+        # - tags = Which entries belong to which tag (like 'data:abc')
+        # - PRIMARY KEY (tag, key) = Finding all keys of a tag uses an index
+        # - tags_by_key = Removing a key's tags also uses an index
+        # - stats = One row of counters per worker process (see cache_metrics.py)
+        # - meta 'generation' = Goes up on every delete/invalidation, so old
+        #   snapshots know they may hold deleted values (see cache_snapshot.py)
+
+    def _connect(self):
+        """Return this thread's connection, reconnecting after a fork"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+        # Explanation:
+        # - gunicorn forks workers, and a connection must not cross a fork
+        # - isolation_level=None = Autocommit (each statement is atomic)
+        # - journal_mode=WAL = Readers never block the writer
+        # - synchronous=NORMAL = Fast writes that are still crash-safe
+
+    def get(self, key, now):
+        """Return (expires, blob) for a fresh entry, or None"""
+        row = self._connect().execute(
+            'SELECT expires, value FROM cache WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None or (row[0] and row[0] <= now):
+            return None
+        return row[0], row[1]
+
+    def set(self, key, expires, blob):
+        """Insert or replace an entry"""
+        self._connect().execute(
+            'INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)',
+            (key, blob, expires)
+        )
+        self._maybe_prune()
+
+    def add(self, key, expires, blob, now):
+        """Insert an entry only if no fresh entry exists, return True if added"""
+        conn = self._connect()
+        conn.execute(
+            'DELETE FROM cache WHERE key = ? AND expires != 0 AND expires <= ?',
+            (key, now)
+        )
+        cursor = conn.execute(
+            'INSERT OR IGNORE INTO cache (key, value, expires) VALUES (?, ?, ?)',
+            (key, blob, expires)
+        )
+        self._maybe_prune()
+        return cursor.rowcount == 1
+        # Explanation:
+        # - Expired rows are removed first so add() can replace them
+        # - INSERT OR IGNORE = Does nothing if the key is already there
+        # - rowcount == 1 = We really inserted the row
+
+    def delete(self, key, invalidate=False):
+        """Remove one key, return True if it was present"""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            cursor = conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+            conn.execute('DELETE FROM tags WHERE key = ?', (key,))
+            if invalidate:
+                self._next_generation(conn)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return cursor.rowcount > 0
+        # Explanation:
+        # - invalidate=True = A real delete (cache.delete): snapshots taken
+        #   before it must not bring the value back
+        # - invalidate=False = Housekeeping keys (like single-flight locks)
+
+    def clear(self):
+        """Remove every entry"""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM cache')
+            conn.execute('DELETE FROM tags')
+            self._next_generation(conn)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _next_generation(self, conn):
+        """Count one invalidation (inside an open transaction)"""
+        conn.execute("UPDATE meta SET value = value + 1 WHERE name = 'generation'")
+
+    def generation(self, conn=None):
+        """Return how many invalidations the shared file has seen"""
+        conn = conn or self._connect()
+        return conn.execute("SELECT value FROM meta WHERE name = 'generation'").fetchone()[0]
+
+    def current_items(self, items):
+        """
+        Return (generation, the items whose value is still the one in L2)
+
+        Used before saving a snapshot: an L1 copy may be up to l1_timeout
+        seconds older than L2, and must not be saved if L2 has moved on.
+        """
+        conn = self._connect()
+        conn.execute('BEGIN')
+        try:
+            generation = self.generation(conn)
+            current = []
+            for key, expires, blob in items:
+                row = conn.execute('SELECT value FROM cache WHERE key = ?', (key,)).fetchone()
+                if row is not None and row[0] == blob:
+                    current.append((key, expires, blob))
+        finally:
+            conn.execute('COMMIT')
+        return generation, current
+        # Explanation:
+        # - BEGIN = One consistent read: the generation matches the rows we see
+        # - Deleted or replaced since it was copied to L1? Not saved
+
+    def restore(self, key, expires, blob, now, generation):
+        """Add a snapshot entry if nothing was invalidated since `generation`"""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if self.generation(conn) != generation:
+                conn.execute('ROLLBACK')
+                return False
+            conn.execute(
+                'DELETE FROM cache WHERE key = ? AND expires != 0 AND expires <= ?',
+                (key, now)
+            )
+            cursor = conn.execute(
+                'INSERT OR IGNORE INTO cache (key, value, expires) VALUES (?, ?, ?)',
+                (key, blob, expires)
+            )
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        self._maybe_prune()
+        return cursor.rowcount == 1
+        # Explanation:
+        # - The generation check and the insert are ONE transaction, so a
+        #   delete in another worker can't slip in between them
+        # - Not added (invalidated, or someone set a newer value) = False
+
+    def tag(self, key, tags):
+        """Attach tags to a key"""
+        self._connect().executemany(
+            'INSERT OR IGNORE INTO tags (tag, key) VALUES (?, ?)',
+            [(tag, key) for tag in tags]
+        )
+
+    def delete_tagged(self, tags):
+        """Remove every entry carrying any of the tags, return the keys"""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            keys = set()
+            for tag in tags:
+                keys.update(row[0] for row in conn.execute(
+                    'SELECT key FROM tags WHERE tag = ?', (tag,)))
+            self._delete_keys(conn, keys)
+            self._next_generation(conn)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return keys
+        # Explanation:
+        # - BEGIN IMMEDIATE = Other workers wait until we are done
+        # - Only the tagged rows are touched: O(number of affected entries)
+
+    def delete_prefix(self, prefix):
+        """Remove every entry whose key starts with prefix, return the keys"""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if prefix:
+                upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+                rows = conn.execute(
+                    'SELECT key FROM cache WHERE key >= ? AND key < ?', (prefix, upper))
+            else:
+                rows = conn.execute('SELECT key FROM cache')
+            keys = {row[0] for row in rows}
+            self._delete_keys(conn, keys)
+            self._next_generation(conn)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return keys
+        # Explanation:
+        # - key >= 'view/' AND key < 'view0' = Every key starting with 'view/'
+        # - This range is read straight from the primary key index,
+        #   so only the matching keys are visited
+
+    def _delete_keys(self, conn, keys):
+        """Remove entries and their tags (inside an open transaction)"""
+        rows = [(key,) for key in keys]
+        conn.executemany('DELETE FROM cache WHERE key = ?', rows)
+        conn.executemany('DELETE FROM tags WHERE key = ?', rows)
+
+    def _maybe_prune(self):
+        """Every 100 writes, drop expired rows and trim to the threshold"""
+        self._writes += 1
+        if self._writes % 100:
+            return
+        conn = self._connect()
+        conn.execute(
+            'DELETE FROM cache WHERE expires != 0 AND expires <= ?', (time.time(),)
+        )
+        cursor = conn.execute(
+            'DELETE FROM cache WHERE key IN ('
+            'SELECT key FROM cache ORDER BY expires = 0, expires LIMIT '
+            'MAX(0, (SELECT COUNT(*) FROM cache) - ?))',
+            (self.threshold,)
+        )
+        self.evictions += cursor.rowcount
+        conn.execute('DELETE FROM tags WHERE key NOT IN (SELECT key FROM cache)')
+        # Explanation:
+        # - Pruning every write would be slow, so we do it every 100 writes
+        # - Entries closest to expiring are removed first
+        # - Entries that never expire (expires = 0) are removed last
+        # - Tags of removed entries are cleaned up too
+
+    def size(self):
+        """Return (entries, bytes) held in the shared file"""
+        row = self._connect().execute(
+            'SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM cache'
+        ).fetchone()
+        return row[0], row[1]
+
+    def save_stats(self, pid, payload):
+        """Save one worker's counters (a JSON string)"""
+        self._connect().execute(
+            'INSERT OR REPLACE INTO stats (pid, payload, updated) VALUES (?, ?, ?)',
+            (pid, payload, time.time())
+        )
+
+    def load_stats(self, since):
+        """Return the counters of every worker that saved after `since`"""
+        rows = self._connect().execute(
+            'SELECT payload FROM stats WHERE updated >= ?', (since,)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+
+# Step 5: Create the Two-Tier Cache Backend
+# What is this? A Flask-Caching backend that combines L1 and L2
+# Think of it like: "Check the desk drawer first, then the filing cabinet"
+class TieredCache(BaseCache):
+    """
+    Two-tier cache: a bounded LRU per process in front of a shared SQLite file
+
+    Use it by setting app.config['CACHE_TYPE'] = 'cache_backends.TieredCache'
+
+    Args:
+    - l1_threshold: Maximum entries in each worker's L1 cache
+    - l1_timeout: Maximum seconds an entry stays in L1 before L2 is re-checked
+    - path: Location of the shared L2 SQLite file
+    - l2_threshold: Maximum entries in the L2 file
+    - default_timeout: Default expiration time in seconds
+    - metrics: CacheMetrics collector (defaults to cache_metrics.metrics)
+    - l1_policy: L1 eviction policy, 'lru' or 'gds' (GreedyDual-Size)
+    - l1_max_bytes: Byte budget for each worker's L1 (None = entries only)
+    - snapshot_path: File for warm-start snapshots of L1 (None = off)
+    - snapshot_interval: Seconds between snapshots (0 = only on shutdown)
+    """
+
+    cost_aware = True
+    # Explanation:
+    # - Tells decorators they may pass cost= to set() (used by 'gds')
+
+    def __init__(self, l1_threshold=500, l1_timeout=5, path='cache.sqlite3',
+                 l2_threshold=10000, default_timeout=300, metrics=None,
+                 l1_policy='lru', l1_max_bytes=None, snapshot_path=None,
+                 snapshot_interval=0):
+        super().__init__(default_timeout=default_timeout)
+        self.l1 = make_l1_store(l1_policy, l1_threshold, l1_max_bytes)
+        self.l2 = SQLiteStore(path, threshold=l2_threshold)
+        self.l1_timeout = l1_timeout
+        self.metrics = metrics or default_metrics
+        self.metrics.store = self.l2
+        self.metrics.l1 = self.l1
+        self.snapshot = None
+        if snapshot_path:
+            self.snapshot = CacheSnapshot(snapshot_path, self.l1, snapshot_interval,
+                                          shared=self.l2)
+        # Explanation:
+        # - l1 = This worker's private LRU cache
+        # - l2 = The SQLite file shared by all workers
+        # - l1_timeout = Limits how long another worker's delete can go unseen
+        # - metrics = Counts hits, misses and latency (see cache_metrics.py)
+        # - The metrics are saved in the L2 file, so all workers add up
+        # - snapshot = Saves L1's hot set so a restarted worker starts warm
+        #   (checked against L2's generation, so deleted values stay deleted)
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        """Build the backend from the Flask config (called by Flask-Caching)"""
+        kwargs.update(
+            l1_threshold=config.get('CACHE_THRESHOLD', 500),
+            l1_timeout=config.get('CACHE_L1_TIMEOUT', 5),
+            path=config.get('CACHE_L2_PATH')
+            or os.path.join(app.instance_path, 'cache.sqlite3'),
+            l2_threshold=config.get('CACHE_L2_THRESHOLD', 10000),
+            l1_policy=config.get('CACHE_EVICTION_POLICY', 'lru'),
+            l1_max_bytes=config.get('CACHE_MAX_BYTES'),
+            snapshot_path=_snapshot_path(app, config),
+            snapshot_interval=config.get('CACHE_SNAPSHOT_INTERVAL', 0),
+        )
+        return cls(*args, **kwargs)
+        # Explanation:
+        # - Flask-Caching calls factory() when it sees our CACHE_TYPE
+        # - CACHE_THRESHOLD = Size of L1 (same meaning as for SimpleCache)
+        # - CACHE_L2_PATH = Where the shared SQLite file lives
+        # - CACHE_EVICTION_POLICY = 'lru' or 'gds' for L1
+        # - CACHE_MAX_BYTES = Byte budget for L1 in each worker
+        # - CACHE_SNAPSHOT_PATH / CACHE_SNAPSHOT_INTERVAL = Warm-start snapshots
+        # - app.instance_path = Flask's "instance" folder (ignored by git)
+
+    def _expires(self, timeout):
+        """Convert a timeout in seconds to an absolute expiry time"""
+        timeout = self._normalize_timeout(timeout)
+        return time.time() + timeout if timeout > 0 else 0
+
+    def _promote(self, key, expires, blob, now, cost=1.0):
+        """Copy an entry into L1 with a capped L1 lifetime"""
+        l1_expires = now + self.l1_timeout
+        if expires:
+            l1_expires = min(l1_expires, expires)
+        self.l1.set(key, l1_expires, expires, blob, cost)
+        # Explanation:
+        # - l1_expires = Whichever comes first: value expiry or L1 timeout
+        # - Evicted keys are demoted automatically (they stay in L2)
+        # - cost = How expensive the value is to recompute (L2 does not
+        #   store it, so promoted entries use the default of 1.0)
+
+    def get(self, key):
+        """Look up a key in L1, then L2 (promoting L2 hits to L1)"""
+        start = time.perf_counter_ns()
+        now = time.time()
+        entry = self.l1.get(key, now)
+        if entry is not None:
+            value = pickle.loads(entry[1])
+            self.metrics.record(L1_HIT, time.perf_counter_ns() - start)
+            return value
+        event = L2_HIT
+        entry = self.l2.get(key, now)
+        if entry is None and self.snapshot is not None:
+            entry = self.snapshot.take(key, now)
+            if entry is not None:
+                event = SNAPSHOT_HIT
+        if entry is None:
+            self.metrics.record(MISS, time.perf_counter_ns() - start)
+            return None
+        self._promote(key, entry[0], entry[1], now)
+        value = pickle.loads(entry[1])
+        self.metrics.record(event, time.perf_counter_ns() - start)
+        return value
+        # Explanation:
+        # - L1 hit = Served from this process's memory (fastest!)
+        # - L2 hit = Read from the shared file, then promoted to L1
+        # - Snapshot hit = Found in the last snapshot (right after a
+        #   deploy); take() has already copied it back into L2, but only if
+        #   no worker deleted or invalidated anything since the snapshot
+        # - Miss = None, so Flask-Caching runs the view function
+        # - perf_counter_ns() = High-resolution timer for the latency histograms
+
+    def set(self, key, value, timeout=None, tags=None, cost=1.0):
+        """Store a value in both tiers (write-through), optionally tagged"""
+        expires = self._expires(timeout)
+        blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        self.l2.set(key, expires, blob)
+        if tags:
+            self.l2.tag(key, tags)
+        self._promote(key, expires, blob, time.time(), cost)
+        self.metrics.record(SET, 0)
+        self.metrics.l2_evictions = self.l2.evictions
+        return True
+        # Explanation:
+        # - L2 is written first so other workers see the value right away
+        # - pickle.HIGHEST_PROTOCOL = Fastest, most compact pickle format
+        # - tags = Labels like ['data:abc', 'user:42'] for delete_tag()
+        # - cost = Seconds the value took to compute (used by 'gds')
+
+    def add(self, key, value, timeout=None):
+        """Store a value only if the key is not already cached"""
+        now = time.time()
+        expires = self._expires(timeout)
+        blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if not self.l2.add(key, expires, blob, now):
+            return False
+        self._promote(key, expires, blob, now)
+        return True
+
+    def delete(self, key):
+        """Remove a key from both tiers"""
+        in_l1 = self.l1.delete(key)
+        in_l2 = self.l2.delete(key, invalidate=True)
+        if self.snapshot is not None:
+            self.snapshot.discard([key])
+        return in_l1 or in_l2
+
+    def has(self, key):
+        """Check whether a fresh entry exists in either tier"""
+        now = time.time()
+        return self.l1.get(key, now) is not None or self.l2.get(key, now) is not None
+
+    def clear(self):
+        """Remove every entry from both tiers"""
+        self.l1.clear()
+        self.l2.clear()
+        if self.snapshot is not None:
+            self.snapshot.clear()
+        return True
+        # Explanation:
+        # - Other workers drop their L1 copies within l1_timeout seconds
+
+    # Step 6: Targeted Invalidation
+    # What is this? Removing only the entries that depend on something
+    # Think of it like: "Throw away every folder with a red sticker"
+    def tag(self, key, *tags):
+        """Attach tags to an existing key"""
+        self.l2.tag(key, tags)
+
+    def delete_tag(self, *tags):
+        """
+        Remove every entry carrying any of the tags
+
+        Args:
+        - tags: Tags like 'data:abc' or 'user:42'
+
+        Returns:
+        - Number of entries removed
+        """
+        keys = self.l2.delete_tagged(tags)
+        for key in keys:
+            self.l1.delete(key)
+        if self.snapshot is not None:
+            self.snapshot.discard(keys)
+        return len(keys)
+        # Explanation:
+        # - Only the dependent entries are removed, the rest stay cached
+        # - Cost grows with the number of removed entries, not cache size
+
+    def delete_prefix(self, prefix):
+        """
+        Remove every entry whose key starts with prefix
+
+        Args:
+        - prefix: Key prefix like 'view//api/data-cached/'
+
+        Returns:
+        - Number of entries removed
+        """
+        keys = self.l2.delete_prefix(prefix)
+        for key in keys:
+            self.l1.delete(key)
+        if self.snapshot is not None:
+            self.snapshot.discard(keys)
+        return len(keys)
+        # Explanation:
+        # - Other workers drop their L1 copies within l1_timeout seconds
+
+
+# Step 7: Create a Memory-Bounded Single-Process Backend
+# What is this? A drop-in replacement for SimpleCache with a byte budget
+# Think of it like: "SimpleCache that knows how much memory it uses"
+class SizeBoundedCache(BaseCache):
+    """
+    In-process cache that enforces a byte budget on pickled values
+
+    Use it by setting app.config['CACHE_TYPE'] = 'cache_backends.SizeBoundedCache'
+
+    Args:
+    - max_bytes: Byte budget for this process
+    - policy: 'gds' (GreedyDual-Size, default) or 'lru'
+    - threshold: Optional maximum number of entries
+    - default_timeout: Default expiration time in seconds
+    - metrics: CacheMetrics collector (defaults to cache_metrics.metrics)
+    - snapshot_path: File for warm-start snapshots (None = off)
+    - snapshot_interval: Seconds between snapshots (0 = only on shutdown)
+    """
+
+    cost_aware = True
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, policy='gds', threshold=None,
+                 default_timeout=300, metrics=None, snapshot_path=None,
+                 snapshot_interval=0):
+        super().__init__(default_timeout=default_timeout)
+        self.store = make_l1_store(policy, threshold, max_bytes)
+        self.metrics = metrics or default_metrics
+        self.metrics.store = None
+        self.metrics.l1 = self.store
+        self.snapshot = None
+        if snapshot_path:
+            self.snapshot = CacheSnapshot(snapshot_path, self.store, snapshot_interval)
+        # Explanation:
+        # - store = The byte-bounded store ('gds' or 'lru')
+        # - metrics.store = None = Nothing shared, stats are per process
+        # - snapshot = Saves the hot set so a restarted worker starts warm
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        """Build the backend from the Flask config (called by Flask-Caching)"""
+        kwargs.update(
+            max_bytes=config.get('CACHE_MAX_BYTES') or 64 * 1024 * 1024,
+            policy=config.get('CACHE_EVICTION_POLICY', 'gds'),
+            threshold=config.get('CACHE_THRESHOLD'),
+            snapshot_path=_snapshot_path(app, config),
+            snapshot_interval=config.get('CACHE_SNAPSHOT_INTERVAL', 0),
+        )
+        return cls(*args, **kwargs)
+
+    def _expires(self, timeout):
+        timeout = self._normalize_timeout(timeout)
+        return time.time() + timeout if timeout > 0 else 0
+
+    def get(self, key):
+        """Look up a key"""
+        start = time.perf_counter_ns()
+        now = time.time()
+        event = L1_HIT
+        entry = self.store.get(key, now)
+        if entry is None and self.snapshot is not None:
+            entry = self.snapshot.take(key, now)
+            if entry is not None:
+                event = SNAPSHOT_HIT
+                self.store.set(key, entry[0], entry[0], entry[1])
+        if entry is None:
+            self.metrics.record(MISS, time.perf_counter_ns() - start)
+            return None
+        value = pickle.loads(entry[1])
+        self.metrics.record(event, time.perf_counter_ns() - start)
+        return value
+
+    def set(self, key, value, timeout=None, cost=1.0):
+        """Store a value (evicting others if the budget is exceeded)"""
+        expires = self._expires(timeout)
+        blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        self.store.set(key, expires, expires, blob, cost)
+        self.metrics.record(SET, 0)
+        return True
+        # Explanation:
+        # - len(blob) = The value's serialized size, counted in the budget
+
+    def add(self, key, value, timeout=None):
+        """Store a value only if the key is not already cached"""
+        if self.store.get(key, time.time()) is not None:
+            return False
+        return self.set(key, value, timeout)
+
+    def delete(self, key):
+        """Remove a key"""
+        if self.snapshot is not None:
+            self.snapshot.discard([key])
+        return self.store.delete(key)
+
+    def has(self, key):
+        """Check whether a fresh entry exists"""
+        return self.store.get(key, time.time()) is not None
+
+    def clear(self):
+        """Remove every entry"""
+        self.store.clear()
+        if self.snapshot is not None:
+            self.snapshot.clear()
+        return True
+
+
+# Step 8: Helper for Snapshot Paths
+def _snapshot_path(app, config):
+    """Resolve CACHE_SNAPSHOT_PATH (relative paths go in the instance folder)"""
+    path = config.get('CACHE_SNAPSHOT_PATH')
+    if path and not os.path.isabs(path):
+        path = os.path.join(app.instance_path, path)
+    return path
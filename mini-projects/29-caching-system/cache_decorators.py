@@ -0,0 +1,475 @@
+# Cache Decorators
+# This module adds decorators that work next to @cache.cached!
+
+# Step 1: Import the Tools We Need
+# What is this? We're importing Python tools and Flask's request object
+# Think of it like: "Get the building blocks for our decorators"
+import functools
+import logging
+import math
+import os
+import pickle
+import random
+import threading
+import time
+import uuid
+
+from flask import (copy_current_request_context, current_app, has_app_context,
+                   has_request_context, request)
+# Explanation:
+# - functools = Tools for writing decorators (wraps keeps the view's name)
+# - logging = Reports errors from background refreshes
+# - math, random = Used for probabilistic early refresh (XFetch)
+# - os = Used to read the process ID for the refresh lock owner
+# - pickle = Turns lock and result values into bytes for the shared store
+# - threading = Locks, events and background threads
+# - time = Module for time-related functions
+# - uuid = Creates a unique token for each computation ("flight")
+# - request = Object that contains request data (we use request.path)
+# - copy_current_request_context = Lets a background thread use the request
+
+logger = logging.getLogger(__name__)
+
+
+# Step 2: Create a Helper to Build Cache Keys
+# What is this? Turns a key prefix into the key for this request
+# Think of it like: "Write the same label @cache.cached would write"
+def make_view_key(key_prefix):
+    """
+    Build the cache key for the current request
+
+    Args:
+    - key_prefix: Prefix like 'view/%s' (%s is replaced with request.path)
+
+    Returns:
+    - The cache key string
+    """
+    if '%s' in key_prefix:
+        return key_prefix % request.path
+    return key_prefix
+    # Explanation:
+    # - 'view/%s' is the default key_prefix of @cache.cached
+    # - So /api/data-cached/abc becomes 'view//api/data-cached/abc'
+
+
+# Step 3: Create a Helper for Lock and Result Keys
+# What is this? Reads and writes coordination keys in the SHARED store only
+# Think of it like: "Notes on the office notice board, never copied to your desk"
+class _SharedKeys:
+    """
+    Lock and result keys kept only in the store every worker shares
+
+    With TieredCache they go straight to its SQLite L2, skipping the
+    worker's L1, the snapshots and the hit/miss metrics. Other backends
+    use the normal cache methods.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def _l2(self):
+        return getattr(self.cache.cache, 'l2', None)
+        # Explanation:
+        # - cache.cache = The backend; only TieredCache has an l2
+
+    def add(self, key, value, timeout):
+        """Store value only if key is missing, return True if stored"""
+        l2 = self._l2()
+        if l2 is None:
+            return self.cache.add(key, value, timeout=timeout)
+        now = time.time()
+        return l2.add(key, now + timeout, pickle.dumps(value), now)
+
+    def set(self, key, value, timeout):
+        l2 = self._l2()
+        if l2 is None:
+            return self.cache.set(key, value, timeout=timeout)
+        return l2.set(key, time.time() + timeout, pickle.dumps(value))
+
+    def get(self, key):
+        l2 = self._l2()
+        if l2 is None:
+            return self.cache.get(key)
+        entry = l2.get(key, time.time())
+        return None if entry is None else pickle.loads(entry[1])
+
+    def delete(self, key):
+        l2 = self._l2()
+        if l2 is None:
+            return self.cache.delete(key)
+        return l2.delete(key)
+    # Explanation:
+    # - Through the normal TieredCache.get(), a lock would be copied into
+    #   the worker's L1 for up to l1_timeout (5 s): the worker would keep
+    #   seeing a lock the leader had already released
+    # - l2.delete(key) = Not an invalidation, so snapshots stay valid
+
+
+# Step 4: Create a Call Record
+# What is this? One in-flight computation that other threads can wait on
+# Think of it like: "A ticket that says 'someone is already cooking this'"
+class _Call:
+    """One in-flight computation shared by every thread asking for the same key"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        # Explanation:
+        # - event = Waiting threads sleep on this until the result is ready
+        # - result = The value computed by the leader
+        # - error = The exception raised by the leader (if any)
+
+
+# Step 5: Create the Single-Flight Coalescer
+# What is this? Makes sure only ONE caller computes a missing value
+# Think of it like: "One person goes to the shop, everyone else waits"
+class SingleFlight:
+    """
+    Coalesces concurrent cache misses so each key is computed only once
+
+    Inside one process, threads wait on the leader thread's result.
+    Across worker processes, a lock stored in the shared cache picks one
+    leader, and the other processes wait for its published result.
+
+    Args:
+    - cache: The Flask-Caching Cache object (its backend holds the locks)
+    - lock_timeout: Seconds before an abandoned lock expires
+    - result_timeout: Seconds the published result stays available
+    - poll_interval: Seconds between checks while waiting on another process
+    """
+
+    def __init__(self, cache, lock_timeout=30, result_timeout=10, poll_interval=0.05):
+        self.cache = cache
+        self.shared = _SharedKeys(cache)
+        self.lock_timeout = lock_timeout
+        self.result_timeout = result_timeout
+        self.poll_interval = poll_interval
+        self._calls = {}
+        self._lock = threading.Lock()
+        # Explanation:
+        # - shared = Where the cross-process lock and result live (see Step 3)
+        # - _calls = key -> _Call for computations running in this process
+        # - _lock = Protects _calls when many threads arrive together
+
+    def do(self, key, fn):
+        """
+        Run fn() once for all concurrent callers asking for key
+
+        Args:
+        - key: Identifies the value being computed
+        - fn: Function (no arguments) that computes the value
+
+        Returns:
+        - The computed value (the same one for every caller)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        # Explanation:
+        # - The first thread for a key becomes the leader
+        # - Everyone else finds the leader's _Call and waits on it
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+            # Explanation:
+            # - Followers never run fn(), they just reuse the result
+            # - If the leader failed, followers see the same error
+
+        try:
+            call.result = self._do_across_processes(key, fn)
+        except Exception as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+        # Explanation:
+        # - finally = Always wake the followers, even after an error
+        # - The _Call is removed, so the next miss starts a new flight
+
+    def _do_across_processes(self, key, fn):
+        """Use a lock in the shared cache so one worker process computes"""
+        lock_key = 'singleflight/lock/' + key
+        result_key = 'singleflight/result/' + key
+        deadline = time.time() + self.lock_timeout
+        while True:
+            token = uuid.uuid4().hex
+            if self.shared.add(lock_key, token, timeout=self.lock_timeout):
+                try:
+                    result = fn()
+                    self.shared.set(result_key, (token, result), timeout=self.result_timeout)
+                    return result
+                finally:
+                    self.shared.delete(lock_key)
+            # Explanation:
+            # - cache.add() = Only succeeds if the key does not exist yet
+            # - So exactly one process gets the lock and runs fn()
+            # - token = Unique ID of this flight, stored in the lock
+            # - The result is published together with its token
+            # - lock_timeout = If the leader crashes, the lock expires
+
+            token = self.shared.get(lock_key)
+            while token is not None and time.time() < deadline:
+                time.sleep(self.poll_interval)
+                published = self.shared.get(result_key)
+                if published is not None and published[0] == token:
+                    return published[1]
+                if self.shared.get(lock_key) != token:
+                    break
+            else:
+                if token is not None:
+                    return fn()
+            # Explanation:
+            # - Other processes poll the shared cache for the result
+            # - Only a result with the SAME token counts, so an older
+            #   flight's result is never mistaken for this one
+            # - If the lock disappears without a result (leader failed),
+            #   we loop around and try to become the leader ourselves
+            # - If we wait past the deadline, compute it ourselves
+
+    def coalesce(self, key_prefix='view/%s', make_key=None):
+        """
+        Decorator that coalesces concurrent calls to a view or function
+
+        Put it below @cache.cached so it only runs on a cache miss:
+
+            @app.route('/api/data-cached/<key>')
+            @cache.cached(timeout=60)
+            @single_flight.coalesce()
+            def get_data_cached(key):
+                ...
+
+        Args:
+        - key_prefix: Same format as @cache.cached (%s = request.path)
+        - make_key: Optional function(*args, **kwargs) returning the key,
+          for functions that are not views
+
+        Returns:
+        - The decorator
+        """
+        def decorator(f):
+            @functools.wraps(f)
+            def wrapper(*args, **kwargs):
+                if has_app_context() and not current_app.config.get('CACHE_COALESCE', True):
+                    return f(*args, **kwargs)
+                if make_key is not None:
+                    key = make_key(*args, **kwargs)
+                else:
+                    key = make_view_key(key_prefix)
+                return self.do(key, lambda: f(*args, **kwargs))
+            return wrapper
+        return decorator
+        # Explanation:
+        # - functools.wraps = Keeps the view's name (Flask needs it)
+        # - CACHE_COALESCE = False switches coalescing off (for benchmarks)
+        # - Every call with the same key shares one computation
+
+
+# Step 6: Create the Cached Value Envelope
+# What is this? Wraps a cached value with its freshness information
+# Think of it like: "A label on the box with a 'best before' date"
+class CachedValue:
+    """
+    A cached value plus the data needed for stale-while-revalidate
+
+    Args:
+    - value: The cached result
+    - expires: Unix time when the value becomes stale
+    - delta: Seconds it took to compute the value
+    """
+
+    __slots__ = ('value', 'expires', 'delta')
+
+    def __init__(self, value, expires, delta):
+        self.value = value
+        self.expires = expires
+        self.delta = delta
+
+    def __getstate__(self):
+        return self.value, self.expires, self.delta
+
+    def __setstate__(self, state):
+        self.value, self.expires, self.delta = state
+        # Explanation:
+        # - __slots__ = Saves memory (no per-object __dict__)
+        # - __getstate__/__setstate__ = Let pickle store the three fields
+
+
+# Step 7: Create the Refresh-Ahead Cache Decorator
+# What is this? A @cache.cached that never puts a slow refresh on a user
+# Think of it like: "Keep serving yesterday's bread while today's bakes"
+class RefreshAhead:
+    """
+    Caching decorators with stale-while-revalidate and early refresh
+
+    - stale_ttl: After `timeout`, the old value is still served for this
+      many seconds while a background thread recomputes it
+    - beta: XFetch early refresh. Before the value expires, each request
+      refreshes it with a probability that grows as expiry approaches
+      (scaled by how long the value takes to compute). 0 turns it off,
+      1.0 is the usual setting, higher values refresh earlier
+
+    Args:
+    - cache: The Flask-Caching Cache object
+    - refresh_lock_timeout: Seconds before an abandoned refresh lock expires
+    """
+
+    def __init__(self, cache, refresh_lock_timeout=30):
+        self.cache = cache
+        self.shared = _SharedKeys(cache)
+        self.refresh_lock_timeout = refresh_lock_timeout
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        # Explanation:
+        # - _refreshing = Keys this process is refreshing right now
+        # - A lock in the shared cache (shared, Step 3) stops other
+        #   processes refreshing too
+
+    def cached(self, timeout=60, stale_ttl=0, beta=0.0, key_prefix='view/%s',
+               make_key=None, tags=None):
+        """
+        Decorator that caches a view or function with refresh-ahead
+
+            @app.route('/api/data-cached/<key>')
+            @refresh_ahead.cached(timeout=60, stale_ttl=30, beta=1.0)
+            def get_data_cached(key):
+                ...
+
+        Args:
+        - timeout: Seconds the value is fresh (0 = never goes stale)
+        - stale_ttl: Extra seconds a stale value may be served
+        - beta: XFetch early refresh factor (0 = off)
+        - key_prefix: Same format as @cache.cached (%s = request.path)
+        - make_key: Optional function(*args, **kwargs) returning the key
+        - tags: Tag templates like ['data:{key}'], filled in with the
+          view's arguments (needs a backend with tag support, e.g. TieredCache)
+
+        Returns:
+        - The decorator
+        """
+        def decorator(f):
+            @functools.wraps(f)
+            def wrapper(*args, **kwargs):
+                if make_key is not None:
+                    key = make_key(*args, **kwargs)
+                else:
+                    key = make_view_key(key_prefix)
+                entry_tags = [tag.format(**kwargs) for tag in tags] if tags else None
+                # Explanation:
+                # - Same key as @cache.cached, so existing invalidation works
+                # - 'data:{key}' with key='abc' becomes the tag 'data:abc'
+
+                entry = self.cache.get(key)
+                if isinstance(entry, CachedValue):
+                    now = time.time()
+                    if now >= entry.expires or _xfetch_due(entry, beta, now):
+                        self._refresh_in_background(
+                            key, f, args, kwargs, timeout, stale_ttl, entry_tags)
+                    return entry.value
+                # Explanation:
+                # - The backend keeps the entry for timeout + stale_ttl,
+                #   so if we find it, it is fresh OR inside the stale window
+                # - Stale (or due for early refresh) = serve now, refresh later
+                # - The user never waits for the recomputation!
+
+                return self._compute(key, f, args, kwargs, timeout, stale_ttl, entry_tags)
+                # Explanation:
+                # - True miss = We have nothing to serve, so compute now
+            return wrapper
+        return decorator
+
+    def _compute(self, key, f, args, kwargs, timeout, stale_ttl, tags=None):
+        """Run the function and store its result with freshness info"""
+        start = time.perf_counter()
+        value = f(*args, **kwargs)
+        delta = time.perf_counter() - start
+        expires = time.time() + timeout if timeout else math.inf
+        backend_timeout = timeout + stale_ttl if timeout else 0
+        entry = CachedValue(value, expires, delta)
+        extra = {}
+        if tags and hasattr(self.cache.cache, 'delete_tag'):
+            extra['tags'] = tags
+        if getattr(self.cache.cache, 'cost_aware', False):
+            extra['cost'] = delta
+        self.cache.set(key, entry, timeout=backend_timeout, **extra)
+        return value
+        # Explanation:
+        # - delta = How long the computation took (XFetch uses this)
+        # - expires = When the value becomes stale
+        # - backend_timeout = When the backend really deletes it
+        # - tags = Stored with the entry, so delete_tag() can find it
+        #   (only backends that support tags get them, e.g. TieredCache)
+        # - cost = delta, so a cost-aware cache keeps expensive values longer
+
+    def _refresh_in_background(self, key, f, args, kwargs, timeout, stale_ttl, tags=None):
+        """Start one background refresh per key across all processes"""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        lock_key = 'swr/refresh/' + key
+        if not self.shared.add(lock_key, os.getpid(), timeout=self.refresh_lock_timeout):
+            with self._lock:
+                self._refreshing.discard(key)
+            return
+        # Explanation:
+        # - _refreshing = Stops two threads in this process both refreshing
+        # - cache.add() = Stops two worker processes both refreshing
+
+        def refresh():
+            try:
+                self._compute(key, f, args, kwargs, timeout, stale_ttl, tags)
+            except Exception:
+                logger.exception('Background refresh failed for %s', key)
+            finally:
+                self.shared.delete(lock_key)
+                with self._lock:
+                    self._refreshing.discard(key)
+        # Explanation:
+        # - If the refresh fails, the stale value keeps being served
+        # - finally = Always release the locks so a later request can retry
+
+        if has_request_context():
+            refresh = copy_current_request_context(refresh)
+        elif has_app_context():
+            refresh = _with_app_context(current_app._get_current_object(), refresh)
+        threading.Thread(target=refresh, daemon=True).start()
+        # Explanation:
+        # - copy_current_request_context = The thread can use request,
+        #   jsonify, etc. just like the original view
+        # - daemon=True = The thread never blocks the server from exiting
+
+
+# Step 8: Helper Functions for Refresh-Ahead
+# What is this? Small helpers used by RefreshAhead
+def _xfetch_due(entry, beta, now):
+    """
+    XFetch: decide if a still-fresh value should be refreshed early
+
+    The chance grows as expiry gets closer and as the value gets more
+    expensive to compute, so hot keys are refreshed before they expire.
+    """
+    if not beta:
+        return False
+    return now - entry.delta * beta * math.log(1.0 - random.random()) >= entry.expires
+    # Explanation:
+    # - log(1 - random()) = A negative random number (usually small)
+    # - Subtracting it moves "now" forward by a random amount
+    # - If that random "future now" is past expiry, refresh early
+
+
+def _with_app_context(app, fn):
+    """Wrap fn so it runs inside the given app context"""
+    @functools.wraps(fn)
+    def wrapper():
+        with app.app_context():
+            return fn()
+    return wrapper
@@ -0,0 +1,349 @@
+# Cache Metrics
+# This module collects live cache statistics (hits, misses, latency)!
+
+# Step 1: Import the Tools We Need
+# What is this? We're importing Python tools for counting and timing
+# Think of it like: "Get a tally counter and a stopwatch"
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+# Explanation:
+# - functools = Tools for writing decorators
+# - json = Saves each worker's counters as text in the shared file
+# - os = Reads the process ID (one row per worker)
+# - sqlite3 = To recognise a failed save (the shared file is SQLite)
+# - threading = Background thread that saves counters regularly
+# - time = Module for time-related functions
+
+# Step 2: Define What We Count
+# What is this? Names for each kind of cache event
+# Think of it like: "Labels on each tally counter"
+L1_HIT, L2_HIT, MISS, SET, SNAPSHOT_HIT = range(5)
+EVENT_NAMES = ('l1_hits', 'l2_hits', 'misses', 'sets', 'snapshot_hits')
+# Explanation:
+# - L1_HIT = Found in this worker's memory
+# - L2_HIT = Found in the shared SQLite file
+# - SNAPSHOT_HIT = Found in the warm-start snapshot (after a restart)
+# - MISS = Not found anywhere (the view had to run)
+# - SET = A value was stored (many sets per entry = a key that churns)
+
+HISTOGRAM_BUCKETS = 40
+# Explanation:
+# - Latencies go into power-of-two buckets of nanoseconds
+# - Bucket i holds lookups that took less than 2**i nanoseconds
+# - 40 buckets cover everything up to ~9 minutes
+
+
+# Step 3: Create the Counters for One Scope
+# What is this? Counters and histograms for one endpoint or function
+# Think of it like: "One score sheet per player"
+class ScopeCounters:
+    """Counters and latency histograms for one endpoint, function or total"""
+
+    __slots__ = ('counts', 'latency')
+
+    def __init__(self):
+        self.counts = [0] * len(EVENT_NAMES)
+        self.latency = [[0] * HISTOGRAM_BUCKETS for _ in EVENT_NAMES]
+        # Explanation:
+        # - counts[event] = How many times the event happened
+        # - latency[event][bucket] = Latency histogram for that event
+        # - Plain lists of ints = The cheapest thing Python can increment
+        # - __slots__ = Faster attribute access, less memory
+
+    def clear(self):
+        """Set every counter back to zero"""
+        self.counts[:] = [0] * len(EVENT_NAMES)
+        for histogram in self.latency:
+            histogram[:] = [0] * HISTOGRAM_BUCKETS
+
+    def to_dict(self):
+        """Return the counters as plain data (for JSON)"""
+        return {
+            'counts': list(self.counts),
+            'latency': [list(histogram) for histogram in self.latency],
+        }
+
+
+class _ScopeLocal(threading.local):
+    """Per-thread holder of the scope record() counts towards"""
+
+    scope = None
+    # Explanation:
+    # - A class attribute = Every thread starts with scope = None
+    # - Reading a missing attribute of a plain threading.local raises
+    #   (and catches) an AttributeError - about 1 microsecond on EVERY
+    #   record() from a thread that was never inside @metrics.track
+
+
+# Step 4: Create the Metrics Collector
+# What is this? Records every lookup and shares totals across workers
+# Think of it like: "A scoreboard every worker writes its score to"
+class CacheMetrics:
+    """
+    Live cache statistics with per-scope counters and latency histograms
+
+    Recording a lookup is a few list increments (well under a
+    microsecond). Each worker saves its counters to the shared store
+    every `flush_interval` seconds, and collect() adds up all workers.
+
+    Args:
+    - flush_interval: Seconds between saving this worker's counters
+    - max_age: Workers that have not saved for this long are ignored
+    """
+
+    def __init__(self, flush_interval=5, max_age=60):
+        self.flush_interval = flush_interval
+        self.max_age = max_age
+        self.store = None
+        self.l1 = None
+        self.l2_evictions = 0
+        self.flush_errors = 0
+        self._local = _ScopeLocal()
+        self.total = ScopeCounters()
+        self.scopes = {}
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+        # Explanation:
+        # - store = Shared SQLite store (set by the cache backend)
+        # - l1 = This worker's L1 store (to read entries and bytes)
+        # - flush_errors = How many background saves failed
+        # - _local = Remembers which scope each thread is in
+        # - _thread = The flusher thread, started on the first record()
+        #   (a script that only imports the backends never starts it)
+        # - register_at_fork = gunicorn forks workers; each child starts
+        #   with fresh counters and its own flusher thread
+
+    def _after_fork(self):
+        """Reset counters and restart the flusher in a new worker"""
+        self._local = _ScopeLocal()
+        self.l2_evictions = 0
+        self.total.clear()
+        for counters in self.scopes.values():
+            counters.clear()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        # Explanation:
+        # - Counters are cleared in place, so @metrics.track decorators
+        #   keep pointing at the right objects
+        # - The parent's thread doesn't exist in the child: the child's
+        #   first record() starts its own
+
+    def _start_flusher(self):
+        """Start the background thread that saves counters (once)"""
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._flush_forever,
+                                                name='cache-metrics', daemon=True)
+                self._thread.start()
+
+    def _flush_forever(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except sqlite3.Error:
+                self.flush_errors += 1
+        # Explanation:
+        # - Runs forever in the background (daemon = never blocks exit)
+        # - A failed save (database locked?) is counted and retried next time
+        # - Any other error is a bug: it stops the thread with a traceback
+        #   instead of being hidden forever
+
+    # Step 5: Record Events (the Fast Path)
+    # What is this? Called by the cache backend on every lookup
+    def record(self, event, elapsed_ns):
+        """
+        Record one cache event
+
+        Args:
+        - event: L1_HIT, L2_HIT, SNAPSHOT_HIT, MISS or SET
+        - elapsed_ns: How long the lookup took, in nanoseconds
+        """
+        if self._thread is None:
+            self._start_flusher()
+        bucket = elapsed_ns.bit_length()
+        if bucket >= HISTOGRAM_BUCKETS:
+            bucket = HISTOGRAM_BUCKETS - 1
+        total = self.total
+        total.counts[event] += 1
+        total.latency[event][bucket] += 1
+        scope = self._local.scope
+        if scope is not None:
+            scope.counts[event] += 1
+            scope.latency[event][bucket] += 1
+        # Explanation:
+        # - The first event starts the flusher thread
+        # - bit_length() = Which power-of-two bucket (no searching needed!)
+        # - scope = The endpoint or function we are inside (if tracked)
+        # - Every event counts towards the total AND its scope
+        # - No locks: under heavy threading a count may very rarely be
+        #   lost, which is fine for statistics and keeps this fast
+
+    def track(self, name=None):
+        """
+        Decorator that attributes cache lookups to an endpoint or function
+
+        Put it above @cache.cached, @cache.memoize or @refresh_ahead.cached:
+
+            @app.route('/api/data-cached/<key>')
+            @metrics.track('get_data_cached')
+            @refresh_ahead.cached(timeout=60)
+            def get_data_cached(key):
+                ...
+
+        Args:
+        - name: Scope name (defaults to the function's name)
+
+        Returns:
+        - The decorator
+        """
+        def decorator(f):
+            scope_name = name or f.__name__
+            counters = self.scopes.setdefault(scope_name, ScopeCounters())
+
+            @functools.wraps(f)
+            def wrapper(*args, **kwargs):
+                local = self._local
+                previous = local.scope
+                local.scope = counters
+                try:
+                    return f(*args, **kwargs)
+                finally:
+                    local.scope = previous
+            return wrapper
+        return decorator
+        # Explanation:
+        # - local.scope = Tells record() which scope this thread is in
+        # - previous = Scopes can be nested (a memoized function called
+        #   from a cached view counts towards the function)
+
+    # Step 6: Share and Combine Counters Across Workers
+    # What is this? Saving this worker's counters and adding up everyone's
+    def snapshot(self):
+        """Return this worker's counters as plain data"""
+        l1 = self.l1
+        return {
+            'total': self.total.to_dict(),
+            'scopes': {name: c.to_dict() for name, c in list(self.scopes.items())},
+            'l1_entries': len(l1) if l1 is not None else 0,
+            'l1_bytes': l1.bytes if l1 is not None else 0,
+            'l1_evictions': l1.evictions if l1 is not None else 0,
+            'l1_evicted_bytes': l1.evicted_bytes if l1 is not None else 0,
+            'l2_evictions': self.l2_evictions,
+            'flush_errors': self.flush_errors,
+        }
+
+    def flush(self):
+        """Save this worker's counters to the shared store"""
+        if self.store is not None:
+            self.store.save_stats(os.getpid(), json.dumps(self.snapshot()))
+
+    def collect(self):
+        """
+        Add up the counters of every live worker
+
+        Returns:
+        - Dictionary with totals, per-scope stats and latency summaries
+        """
+        self.flush()
+        rows = [self.snapshot()]
+        if self.store is not None:
+            rows = [json.loads(payload) for payload
+                    in self.store.load_stats(time.time() - self.max_age)]
+        # Explanation:
+        # - flush() first, so our own numbers are up to date
+        # - Each row is one worker's snapshot
+
+        total = _merge([row['total'] for row in rows])
+        scope_names = sorted({name for row in rows for name in row['scopes']})
+        result = {
+            'workers': len(rows),
+            'total': _summarize(total),
+            'scopes': {
+                name: _summarize(_merge([row['scopes'][name] for row in rows
+                                         if name in row['scopes']]))
+                for name in scope_names
+            },
+            'l1_entries': sum(row['l1_entries'] for row in rows),
+            'l1_bytes': sum(row['l1_bytes'] for row in rows),
+            'evictions': sum(row['l1_evictions'] + row['l2_evictions'] for row in rows),
+            'l1_evicted_bytes': sum(row.get('l1_evicted_bytes', 0) for row in rows),
+            'flush_errors': sum(row.get('flush_errors', 0) for row in rows),
+        }
+        if self.store is not None:
+            result['l2_entries'], result['l2_bytes'] = self.store.size()
+        return result
+        # Explanation:
+        # - l1_* = Summed over all workers (each has its own L1)
+        # - l2_* = The shared file (counted once)
+        # - flush_errors = Failed background saves (a worker whose saves keep
+        #   failing shows up here, or not at all in 'workers')
+
+
+# Step 7: Helper Functions for Combining Counters
+def _merge(dicts):
+    """Add several counter dictionaries together"""
+    merged = ScopeCounters().to_dict()
+    for d in dicts:
+        merged['counts'] = [a + b for a, b in zip(merged['counts'], d['counts'])]
+        merged['latency'] = [[a + b for a, b in zip(mine, theirs)]
+                             for mine, theirs in zip(merged['latency'], d['latency'])]
+    return merged
+
+
+def _percentile(histogram, fraction):
+    """Estimate a percentile (in microseconds) from a histogram"""
+    total = sum(histogram)
+    if not total:
+        return None
+    running = 0
+    for bucket, count in enumerate(histogram):
+        running += count
+        if running >= fraction * total:
+            return (2 ** bucket) / 1000
+    return None
+    # Explanation:
+    # - Returns the upper edge of the bucket holding the percentile
+    # - So the answer is accurate to within a factor of two
+
+
+def _summarize(counters):
+    """Turn raw counters into a readable summary"""
+    counts = dict(zip(EVENT_NAMES, counters['counts']))
+    hits = counts['l1_hits'] + counts['l2_hits'] + counts['snapshot_hits']
+    lookups = hits + counts['misses']
+    summary = dict(counts)
+    summary['hits'] = hits
+    summary['hit_ratio'] = hits / lookups if lookups else None
+    latency = counters['latency']
+    histograms = {
+        'hit': [a + b + c for a, b, c in zip(latency[L1_HIT], latency[L2_HIT],
+                                             latency[SNAPSHOT_HIT])],
+        'miss': latency[MISS],
+    }
+    for kind, histogram in histograms.items():
+        summary[kind + '_latency_us'] = {
+            'p50': _percentile(histogram, 0.50),
+            'p99': _percentile(histogram, 0.99),
+            'histogram': {f'<{(2 ** b) / 1000:g}': n
+                          for b, n in enumerate(histogram) if n},
+        }
+    return summary
+    # Explanation:
+    # - hit_ratio = hits / lookups (higher is better!)
+    # - sets much larger than entries = keys that churn
+    # - histogram keys are upper bounds in microseconds
+
+
+# Step 8: Create the Shared Metrics Object
+# What is this? One collector per worker process
+metrics = CacheMetrics()
+# Explanation:
+# - TieredCache records into this object
+# - Views use @metrics.track(...) to get per-endpoint numbers
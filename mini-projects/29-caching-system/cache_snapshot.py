@@ -0,0 +1,228 @@
+# Cache Snapshots
+# This module saves the hot part of the cache to a file for warm starts!
+
+# Step 1: Import the Tools We Need
+# What is this? We're importing Python tools for files and memory maps
+# Think of it like: "Get a camera to photograph the cache"
+import atexit
+import mmap
+import os
+import struct
+import threading
+import time
+# Explanation:
+# - atexit = Runs a function when the worker shuts down
+# - mmap = Memory-maps a file (the OS loads pages only when touched)
+# - os = Files, process IDs and atomic renames
+# - struct = Packs numbers into bytes (and back)
+# - threading = Background thread that saves at an interval
+# - time = Module for time-related functions
+
+# Step 2: Define the File Format
+# What is this? How a snapshot file is laid out
+# Think of it like: "A table of contents followed by the pages"
+MAGIC = b'CSNAP2'
+HEADER = struct.Struct('<6sIq')
+RECORD = struct.Struct('<IId')
+# Explanation:
+# - HEADER = MAGIC (to recognise the file) + number of entries + the shared
+#   store's generation when it was saved (0 without a shared store)
+# - RECORD = key length + value length + expiry time, followed by the
+#   key bytes (UTF-8) and the pickled value bytes
+# - '<' = Little-endian, no padding (same layout on every machine)
+
+
+# Step 3: Create the Snapshot Manager
+# What is this? Saves a store's hot entries and serves them after a restart
+# Think of it like: "Photograph the desk drawer before leaving, and put
+#                    the folders back the next morning"
+class CacheSnapshot:
+    """
+    Persistent snapshot of an in-process store's hot entries
+
+    The snapshot is written on shutdown and, optionally, every `interval`
+    seconds. A new worker memory-maps the file the first time it misses
+    and only unpickles the entries it is actually asked for.
+
+    Args:
+    - path: Location of the snapshot file
+    - store: The in-process store to photograph (LRUStore, GreedyDualSizeStore)
+    - interval: Seconds between saves (0 = only save on shutdown)
+    - max_entries: Maximum entries to save (None = the whole store)
+    - shared: The shared SQLiteStore behind the store (TieredCache's L2), or None
+    """
+
+    def __init__(self, path, store, interval=0, max_entries=None, shared=None):
+        self.path = path
+        self.store = store
+        self.interval = interval
+        self.max_entries = max_entries
+        self.shared = shared
+        self.generation = 0
+        self.loaded = 0
+        self._index = None
+        self._mmap = None
+        self._lock = threading.Lock()
+        atexit.register(self.save)
+        if interval:
+            self._start_saver()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+        # Explanation:
+        # - _index = key -> (offset, length, expires); None = not read yet
+        # - _mmap = The memory-mapped snapshot file
+        # - loaded = How many entries were served from the snapshot
+        # - shared = Other workers delete through it; its generation tells
+        #   us whether they did since the snapshot was saved
+        # - atexit.register(self.save) = Save the hot set on shutdown
+
+    def _after_fork(self):
+        """Give each new worker its own lock and saver thread"""
+        self._lock = threading.Lock()
+        if self.interval:
+            self._start_saver()
+
+    def _start_saver(self):
+        thread = threading.Thread(target=self._save_forever, daemon=True)
+        thread.start()
+
+    def _save_forever(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.save()
+            except OSError:
+                pass
+        # Explanation:
+        # - A failed save (e.g. disk full) is simply retried next time
+
+    # Step 4: Save the Hot Set
+    # What is this? Writing the most valuable entries to the file
+    def save(self):
+        """
+        Write the store's hot entries to the snapshot file
+
+        Returns:
+        - Number of entries written
+        """
+        items = self.store.hot_items(self.max_entries)
+        items.extend(self._leftover_items({key for key, _, _ in items}))
+        if self.max_entries:
+            items = items[:self.max_entries]
+        generation = 0
+        if self.shared is not None:
+            generation, items = self.shared.current_items(items)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, len(items), generation))
+            for key, expires, blob in items:
+                key_bytes = key.encode('utf-8')
+                f.write(RECORD.pack(len(key_bytes), len(blob), expires))
+                f.write(key_bytes)
+                f.write(blob)
+        os.replace(temp_path, self.path)
+        return len(items)
+        # Explanation:
+        # - hot_items() = Entries in order of importance (hottest first)
+        # - Leftovers = Entries from the previous snapshot that nobody
+        #   asked for yet, so a quick restart does not lose them
+        # - current_items() = Only values that are still the ones in L2,
+        #   saved together with L2's generation
+        # - We write to a temporary file, then os.replace() it into place
+        # - os.replace() is atomic: readers see the old OR the new file,
+        #   never a half-written one (even if several workers save at once)
+
+    def _leftover_items(self, skip):
+        """Return previous-snapshot entries that were never taken"""
+        now = time.time()
+        with self._lock:
+            if self._index is None:
+                self._load()
+            index = list(self._index.items())
+        return [(key, expires, self._mmap[offset:offset + length])
+                for key, (offset, length, expires) in index
+                if key not in skip and (not expires or expires > now)]
+
+    # Step 5: Load the Snapshot Lazily
+    # What is this? Reading only the table of contents, not the values
+    def _load(self):
+        """Memory-map the snapshot file and index its records"""
+        self._index = {}
+        try:
+            with open(self.path, 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return
+        # Explanation:
+        # - No file (first deploy) or an empty file = Empty index
+        # - The mmap stays valid after the file is closed or replaced
+
+        data = self._mmap
+        try:
+            magic, count, self.generation = HEADER.unpack_from(data, 0)
+            if magic != MAGIC:
+                return
+            offset = HEADER.size
+            for _ in range(count):
+                key_length, value_length, expires = RECORD.unpack_from(data, offset)
+                offset += RECORD.size
+                key = data[offset:offset + key_length].decode('utf-8')
+                offset += key_length
+                self._index[key] = (offset, value_length, expires)
+                offset += value_length
+        except (struct.error, UnicodeDecodeError):
+            return
+        # Explanation:
+        # - We read each record's header and key, then jump over the value
+        # - Values are NOT copied or unpickled here - only when asked for
+        # - A damaged file simply gives a shorter (or empty) index
+
+    def take(self, key, now):
+        """
+        Return (expires, blob) for a snapshot entry, or None
+
+        Each entry is handed out once; after that it lives in the cache.
+        """
+        with self._lock:
+            if self._index is None:
+                self._load()
+            item = self._index.pop(key, None)
+        if item is None:
+            return None
+        offset, length, expires = item
+        if expires and expires <= now:
+            return None
+        blob = self._mmap[offset:offset + length]
+        if self.shared is not None and not self.shared.restore(key, expires, blob, now,
+                                                               self.generation):
+            if self.shared.generation() != self.generation:
+                self.clear()
+            return None
+        self.loaded += 1
+        return expires, blob
+        # Explanation:
+        # - The first call loads the index (lazy: a worker that never
+        #   misses never reads the file at all)
+        # - Expired entries are skipped
+        # - Slicing the mmap copies just this value's bytes
+        # - restore() = Copies the entry back into L2, but only if no worker
+        #   deleted anything since the snapshot was saved
+        # - Someone did? Then any entry may be stale: forget the whole snapshot
+
+    def discard(self, keys):
+        """Forget snapshot entries that were deleted or invalidated"""
+        with self._lock:
+            if self._index is None:
+                self._load()
+            for key in keys:
+                self._index.pop(key, None)
+        # Explanation:
+        # - Load first: otherwise the next miss would read the deleted
+        #   entry from the file as if nothing happened
+
+    def clear(self):
+        """Forget every snapshot entry"""
+        with self._lock:
+            self._index = {}
@@ -1,8 +1,12 @@
 # Flask-Caching Example
 # Demonstrates caching with Flask-Caching
 
-from flask import Flask, render_template_string
+from flask import Flask, render_template_string, request
 from flask_caching import Cache
+from functools import wraps
+import math
+import random
+import threading
 import time
 
 app = Flask(__name__)
@@ -14,6 +18,57 @@ app.config['CACHE_DEFAULT_TIMEOUT'] = 300  # 5 minutes
 # Create cache
 cache = Cache(app)
 
+# Stale-while-revalidate caching
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+def _compute(key, f, args, kwargs, timeout, stale_ttl):
+    """Run the view and cache (value, expires, compute time)"""
+    start = time.perf_counter()
+    value = f(*args, **kwargs)
+    delta = time.perf_counter() - start
+    cache.set(key, (value, time.time() + timeout, delta), timeout=timeout + stale_ttl)
+    return value
+
+def _refresh_in_background(key, f, args, kwargs, timeout, stale_ttl):
+    """Recompute a value in a background thread (once per key)"""
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def refresh():
+        try:
+            with app.test_request_context(key[len('swr/'):]):
+                _compute(key, f, args, kwargs, timeout, stale_ttl)
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    threading.Thread(target=refresh, daemon=True).start()
+
+def cached_swr(timeout=300, stale_ttl=0, beta=0.0):
+    """Cache a route, serving stale values while they are refreshed
+
+    - stale_ttl: seconds an expired value is still served (refresh runs in background)
+    - beta: XFetch early refresh (0 = off, 1.0 = usual); hot keys refresh before expiring
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            key = f'swr/{request.path}'
+            entry = cache.get(key)
+            if entry is not None:
+                value, expires, delta = entry
+                now = time.time()
+                early = beta and now - delta * beta * math.log(1.0 - random.random()) >= expires
+                if now >= expires or early:
+                    _refresh_in_background(key, f, args, kwargs, timeout, stale_ttl)
+                return value  # Fresh or stale - the user never waits
+            return _compute(key, f, args, kwargs, timeout, stale_ttl)
+        return wrapper
+    return decorator
+
 # Expensive function (simulated)
 @cache.memoize(timeout=300)
 def expensive_calculation(n):
@@ -33,7 +88,7 @@ def home():
     '''
 
 @app.route('/slow')
-@cache.cached(timeout=300)
+@cached_swr(timeout=300, stale_ttl=60, beta=1.0)
 def slow_route():
     """This route is cached - first call slow, next calls fast"""
     result = expensive_calculation(1000000)
@@ -41,6 +96,7 @@ def slow_route():
     <h2>Slow Route (Cached)</h2>
     <p>Result: {result}</p>
     <p>First call takes 2 seconds, next calls are instant!</p>
+    <p>After 5 minutes, the old page is served while it refreshes in the background.</p>
     <a href="/">Back</a>
     '''
 
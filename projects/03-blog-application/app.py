@@ -5,6 +5,7 @@ from flask import Flask, render_template, request, redirect, url_for
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 import os
+from streaming_export import export_response, iter_query
 
 # Create Flask app
 app = Flask(__name__)
@@ -126,6 +127,19 @@ def delete_post(post_id):
     # Redirect to home page
     return redirect(url_for('index'))
 
+# Export all posts - streamed as NDJSON (default) or CSV
+# Resume an interrupted download with ?after=<last post id received>
+@app.route('/export')
+def export_posts():
+    """Stream every post without loading the table into memory"""
+    export_format = request.args.get('format', 'ndjson')
+    after = request.args.get('after', type=int)
+    columns = [Post.id, Post.title, Post.content, Post.author, Post.date_created, Post.date_updated]
+    rows = iter_query(Post.query, Post.id, after=after, columns=columns)
+    # A resumed CSV has no header line, so it can be appended to the first part
+    return export_response(rows, [column.key for column in columns],
+                           export_format, 'posts', header=after is None)
+
 # Run the application
 if __name__ == '__main__':
     # Create database tables if they don't exist
@@ -7,6 +7,12 @@ from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
 from functools import wraps
 import os
+import sys
+
+# streaming_export.py lives in 03-blog-application; one copy serves both blogs
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             '..', '03-blog-application'))
+from streaming_export import export_response, iter_query
 
 # Create Flask app
 app = Flask(__name__)
@@ -242,6 +248,19 @@ def delete_post(post_id):
     flash('Post deleted successfully!', 'success')
     return redirect(url_for('index'))
 
+# Export all posts - streamed as NDJSON (default) or CSV
+# Resume an interrupted download with ?after=<last post id received>
+@app.route('/export')
+def export_posts():
+    """Stream every post without loading the table into memory"""
+    export_format = request.args.get('format', 'ndjson')
+    after = request.args.get('after', type=int)
+    columns = [Post.id, Post.title, Post.content, Post.author, Post.date_created, Post.date_updated]
+    rows = iter_query(Post.query, Post.id, after=after, columns=columns)
+    # A resumed CSV has no header line, so it can be appended to the first part
+    return export_response(rows, [column.key for column in columns],
+                           export_format, 'posts', header=after is None)
+
 # Run the application
 if __name__ == '__main__':
     # Create database tables if they don't exist